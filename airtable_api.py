@@ -33,6 +33,8 @@ from apify_requester import process_linkedin_profiles_with_resume, load_linkedin
 import os
 from data_cleaner import LinkedInDataProcessor
 from trait_extractor import LinkedInTraitExtractor
+from batch_backend import LocalBatchBackend, OpenAIBatchBackend
+from extraction_telemetry import ExtractionTelemetry
 from airtable_updater import AirtableTraitUpdater
 from pyairtable import Api
 
@@ -57,6 +59,8 @@ extraction_jobs: Dict[str, Dict[str, Any]] = {}
 apify_jobs: Dict[str, Dict[str, Any]] = {}
 data_cleaner_jobs: Dict[str, Dict[str, Any]] = {}
 trait_extractor_jobs: Dict[str, Dict[str, Any]] = {}
+# Live telemetry of running trait jobs; finished jobs are read back from their telemetry file
+trait_extractor_telemetry: Dict[str, ExtractionTelemetry] = {}
 airtable_updater_jobs: Dict[str, Dict[str, Any]] = {}
 
 # Global state for tracking cancellation requests
@@ -207,6 +211,10 @@ class DataCleanerConfig(BaseModel):
         default="cleaned-profile-data/S25Top100cleaned_linkedin_data.json",
         description="Path to save the cleaned profile data"
     )
+    cleaning_schema: str = Field(
+        default="standard",
+        description="Cleaning schema to apply: 'standard', 'lean' (titles and dates only) or 'rich' (adds languages, awards, certifications, publications)"
+    )
 
 class DataCleanerRequest(BaseModel):
     """Request model for starting a data cleaning job."""
@@ -245,8 +253,68 @@ class TraitExtractorConfig(BaseModel):
         description="Force re-extraction of all profiles even if already processed"
     )
     delay_between_calls: float = Field(
-        default=1.0,
-        description="Delay between OpenAI API calls in seconds"
+        default=0.0,
+        description="Extra delay between OpenAI API calls in seconds (pacing against the OpenAI RPM/TPM limits is handled by the shared rate governor)"
+    )
+    extraction_mode: str = Field(
+        default="sequential",
+        description="'sequential' (one profile at a time with delay_between_calls), 'concurrent' (async OpenAI client, up to max_concurrency requests in flight, counting split section requests and escalations), 'packed' (pack_size profiles per request, sharing one system prompt), 'batch' (one batch job, cheaper but results can take up to 24h) 'sections' (update output_file in place, re-asking only the prompt sections whose version changed since each record was extracted) or 'reparse' (rebuild output_file from the archived raw responses with the current parsing code, no API calls)"
+    )
+    split_sections: bool = Field(
+        default=False,
+        description="Extract each profile with four concurrent smaller requests (education, career, companies/accelerators, brand/international) merged into one record, instead of one request for the whole record. Lower latency per profile, more prompt tokens"
+    )
+    dedupe_profiles: bool = Field(
+        default=False,
+        description="Find near-duplicate profiles (MinHash/LSH over the cleaned text, scripts/profile_dedup.py) before extracting, extract one per cluster and copy its traits to the rest"
+    )
+    max_concurrency: int = Field(
+        default=8,
+        description="Maximum in-flight OpenAI requests in 'concurrent' mode. The limit is per request, so with split_sections one profile can take several slots"
+    )
+    pack_size: int = Field(
+        default=4,
+        description="Profiles sent per request in 'packed' mode. Profiles whose packed result fails validation are retried with single-profile calls"
+    )
+    batch_backend: str = Field(
+        default="openai",
+        description="Batch endpoint for 'batch' mode: 'openai' (OpenAI Batch API) or 'local' (offline file-based stand-in, for testing)"
+    )
+    batch_poll_interval: float = Field(
+        default=30.0,
+        description="Seconds between batch status checks in 'batch' mode"
+    )
+    use_structured_output: bool = Field(
+        default=True,
+        description="Constrain OpenAI responses to the traits JSON schema (strict structured outputs), so responses always parse"
+    )
+    use_rule_engine: bool = Field(
+        default=True,
+        description="Compute age, tenure and role-count traits locally instead of asking the model, and skip the model for profiles with no free text"
+    )
+    entity_matching: str = Field(
+        default="hints",
+        description="Local notable company / accelerator matcher: 'off', 'hints' (matched names are added to each profile for the model) or 'replace' (those fields come from the matcher and are dropped from the prompt)"
+    )
+    escalation_model: Optional[str] = Field(
+        default=None,
+        description="Stronger (and pricier) model, e.g. 'gpt-4o', that re-extracts results gpt-4o-mini returned with Low confidence, schema violations or not at all. Off by default: every profile runs on gpt-4o-mini only"
+    )
+    openai_base_url: Optional[str] = Field(
+        default=None,
+        description="OpenAI-compatible API base URL, e.g. a local mock server (scripts/mock_openai_server.py) for load tests. None for OpenAI"
+    )
+    telemetry_dir: str = Field(
+        default="trait-telemetry",
+        description="Directory for per-job call telemetry (<job_id>.jsonl: tokens, latency, retries and model of every OpenAI call)"
+    )
+    use_response_cache: bool = Field(
+        default=True,
+        description="Reuse cached OpenAI responses for profiles whose data, system prompt and model settings are unchanged (also applies with force_reextraction)"
+    )
+    use_response_archive: bool = Field(
+        default=True,
+        description="Keep every raw OpenAI response behind the results, gzip-compressed in TRAIT_RESPONSE_ARCHIVE_DIR (llm-response-archive/), so extraction_mode 'reparse' can rebuild results without API calls"
     )
 
 class TraitExtractorRequest(BaseModel):
@@ -266,6 +334,7 @@ class TraitExtractorStatus(BaseModel):
     progress: Dict[str, Any] = Field(default_factory=dict)
     results: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    telemetry: Optional[Dict[str, Any]] = None
 
 class AirtableUpdaterConfig(BaseModel):
     """Configuration for Airtable update jobs."""
@@ -278,8 +347,24 @@ class AirtableUpdaterConfig(BaseModel):
         description="Path to the URL mapping JSON file"
     )
     delay_between_updates: float = Field(
-        default=0.5,
-        description="Delay between Airtable API calls in seconds"
+        default=0.0,
+        description="Extra delay after each Airtable update request in seconds, per worker (pacing against Airtable's 5 req/s per-base limit is handled by the shared per-base rate governor)"
+    )
+    max_workers: int = Field(
+        default=4,
+        description="Airtable update requests in flight at once. All updater jobs on a base share one 5 req/s budget"
+    )
+    force_restart: bool = Field(
+        default=False,
+        description="Ignore the checkpoint of records written by earlier runs to this base and table (<traits_file>_<base_id>_<table_id>_airtable_progress.json) and update every record"
+    )
+    batch_size: int = Field(
+        default=10,
+        description="Records per Airtable update request (1-10). A rejected batch is split in half until the bad record is found"
+    )
+    diff_updates: bool = Field(
+        default=True,
+        description="Read the records' current AI_* values first and write only the fields that changed, skipping unchanged records (fewer writes, no needless Airtable automation triggers)"
     )
     base_id: str = Field(
         default="appCicrQbZaRq1Tvo",
@@ -933,7 +1018,7 @@ async def run_data_cleaner_job(job_id: str, config: DataCleanerConfig):
         })
         
         # Initialize data processor
-        processor = LinkedInDataProcessor()
+        processor = LinkedInDataProcessor(schema=config.cleaning_schema)
         
         # Update progress
         update_data_cleaner_job_progress(job_id, {
@@ -970,7 +1055,9 @@ async def run_data_cleaner_job(job_id: str, config: DataCleanerConfig):
             "results": {
                 "total_profiles": len(cleaned_profiles),
                 "input_file": config.input_file,
-                "output_file": config.output_file
+                "output_file": config.output_file,
+                "cleaning_schema": config.cleaning_schema,
+                "caption_parse_report": processor.get_caption_parse_report()
             }
         })
         
@@ -994,8 +1081,24 @@ async def run_trait_extractor_job(job_id: str, config: TraitExtractorConfig):
             "timestamp": datetime.now().isoformat()
         })
         
+        # Every OpenAI call of this job is recorded, for the status endpoint's rolling aggregates
+        telemetry = ExtractionTelemetry(os.path.join(config.telemetry_dir, f"{job_id}.jsonl"))
+        trait_extractor_telemetry[job_id] = telemetry
+        trait_extractor_jobs[job_id]["telemetry_file"] = telemetry.path
+
         # Initialize trait extractor
-        extractor = LinkedInTraitExtractor()
+        extractor = LinkedInTraitExtractor(
+            use_response_cache=config.use_response_cache,
+            use_structured_output=config.use_structured_output,
+            use_rule_engine=config.use_rule_engine,
+            entity_matching=config.entity_matching,
+            escalation_model=config.escalation_model,
+            telemetry=telemetry,
+            split_sections=config.split_sections,
+            base_url=config.openai_base_url,
+            use_response_archive=config.use_response_archive,
+            dedupe_profiles=config.dedupe_profiles
+        )
         
         # Update progress
         update_trait_extractor_job_progress(job_id, {
@@ -1016,16 +1119,75 @@ async def run_trait_extractor_job(job_id: str, config: TraitExtractorConfig):
         
         # Extract traits with progress tracking in thread pool
         loop = asyncio.get_event_loop()
-        results = await loop.run_in_executor(
-            None,
-            extractor.extract_traits_from_profiles,
-            profiles,
-            config.delay_between_calls,
-            config.max_profiles,
-            config.force_reextraction,
-            None,  # progress_file - let the method auto-generate it
-            config.output_file
-        )
+        if config.extraction_mode == "concurrent":
+            # Runs its own event loop in the worker thread so file saves don't block the API
+            results = await loop.run_in_executor(
+                None,
+                extractor.extract_traits_from_profiles_concurrent,
+                profiles,
+                config.max_concurrency,
+                config.max_profiles,
+                config.force_reextraction,
+                None,  # progress_file - let the method auto-generate it
+                config.output_file
+            )
+        elif config.extraction_mode == "packed":
+            results = await loop.run_in_executor(
+                None,
+                extractor.extract_traits_from_profiles_packed,
+                profiles,
+                config.pack_size,
+                config.max_profiles,
+                config.force_reextraction,
+                None,  # progress_file - let the method auto-generate it
+                config.output_file
+            )
+        elif config.extraction_mode == "batch":
+            if config.batch_backend == "local":
+                batch_backend = LocalBatchBackend()
+            elif config.batch_backend == "openai":
+                batch_backend = OpenAIBatchBackend(extractor.client)
+            else:
+                raise Exception(f"Unknown batch_backend '{config.batch_backend}'")
+            results = await loop.run_in_executor(
+                None,
+                extractor.extract_traits_from_profiles_batch,
+                profiles,
+                config.max_profiles,
+                config.force_reextraction,
+                None,  # progress_file - let the method auto-generate it
+                config.output_file,
+                batch_backend,
+                config.batch_poll_interval
+            )
+        elif config.extraction_mode == "sequential":
+            results = await loop.run_in_executor(
+                None,
+                extractor.extract_traits_from_profiles,
+                profiles,
+                config.delay_between_calls,
+                config.max_profiles,
+                config.force_reextraction,
+                None,  # progress_file - let the method auto-generate it
+                config.output_file
+            )
+        elif config.extraction_mode == "reparse":
+            results = await loop.run_in_executor(
+                None,
+                extractor.reparse_results,
+                profiles,
+                config.output_file
+            )
+        elif config.extraction_mode == "sections":
+            results = await loop.run_in_executor(
+                None,
+                extractor.reextract_changed_sections,
+                profiles,
+                config.output_file,
+                config.max_profiles
+            )
+        else:
+            raise Exception(f"Unknown extraction_mode '{config.extraction_mode}'")
         
         # Update job with results
         trait_extractor_jobs[job_id].update({
@@ -1037,7 +1199,21 @@ async def run_trait_extractor_job(job_id: str, config: TraitExtractorConfig):
                 "input_file": config.input_file,
                 "output_file": config.output_file,
                 "max_profiles": config.max_profiles,
-                "force_reextraction": config.force_reextraction
+                "force_reextraction": config.force_reextraction,
+                "extraction_mode": config.extraction_mode,
+                "rate_governor": extractor.rate_governor.get_stats(),
+                "escalation_rate_governor": extractor.get_rate_governor(extractor.escalation_model).get_stats() if extractor.escalation_model else None,
+                "response_cache": extractor.response_cache.get_stats() if extractor.response_cache else None,
+                "token_usage": extractor.usage_stats,
+                "response_stats": extractor.response_stats,
+                "packing": extractor.packing_stats if config.extraction_mode == "packed" else None,
+                "sections": extractor.section_stats if config.extraction_mode == "sections" else None,
+                "split_sections": config.split_sections,
+                "reparse": extractor.reparse_stats if config.extraction_mode == "reparse" else None,
+                "dedup": extractor.get_dedup_report() if config.dedupe_profiles else None,
+                "cascade": extractor.cascade_stats if extractor.escalation_model else None,
+                "model_tiers": extractor.get_tier_report(),
+                "telemetry_file": telemetry.path
             }
         })
         
@@ -1048,6 +1224,8 @@ async def run_trait_extractor_job(job_id: str, config: TraitExtractorConfig):
             "completed_at": datetime.now(),
             "error": str(e)
         })
+    finally:
+        trait_extractor_telemetry.pop(job_id, None)
 
 async def run_airtable_updater_job(job_id: str, config: AirtableUpdaterConfig):
     """Background task to run Airtable update job."""
@@ -1098,7 +1276,12 @@ async def run_airtable_updater_job(job_id: str, config: AirtableUpdaterConfig):
         await loop.run_in_executor(
             None,
             updater.process_trait_extractions,
-            config.delay_between_updates
+            config.delay_between_updates,
+            config.batch_size,
+            config.diff_updates,
+            config.max_workers,
+            updater.get_checkpoint_file(config.traits_file),
+            config.force_restart
         )
         
         # Update job with results
@@ -1110,6 +1293,17 @@ async def run_airtable_updater_job(job_id: str, config: AirtableUpdaterConfig):
                 "successful_updates": updater.update_results['successful_updates'],
                 "failed_updates": updater.update_results['failed_updates'],
                 "missing_mappings": updater.update_results['missing_mappings'],
+                "requests": updater.update_results['requests'],
+                "attempted_updates": updater.update_results['attempted'],
+                "write_seconds": updater.update_results['write_seconds'],
+                "records_per_second": updater.update_results['records_per_second'],
+                "changed_records": updater.update_results['changed'],
+                "unchanged_records": updater.update_results['unchanged'],
+                "skipped_fields": updater.update_results['skipped_fields'],
+                "fetch_requests": updater.update_results['fetch_requests'],
+                "rate_governor": updater.rate_governor.get_stats(),
+                "already_written": updater.update_results['already_written'],
+                "checkpoint_file": updater.checkpoint_file,
                 "traits_file": config.traits_file,
                 "url_mapping_file": config.url_mapping_file
             }
@@ -1784,7 +1978,10 @@ async def get_trait_extractor_job_status(job_id: str):
         )
     
     job_data = trait_extractor_jobs[job_id]
-    return TraitExtractorStatus(**job_data)
+    telemetry = trait_extractor_telemetry.get(job_id)
+    if telemetry is None and job_data.get("telemetry_file") and os.path.exists(job_data["telemetry_file"]):
+        telemetry = ExtractionTelemetry.load(job_data["telemetry_file"])
+    return TraitExtractorStatus(**job_data, telemetry=telemetry.get_summary() if telemetry else None)
 
 @app.get("/traits/results/{job_id}")
 async def get_trait_extractor_job_results(job_id: str):
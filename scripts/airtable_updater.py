@@ -12,7 +12,10 @@ Usage:
 
 import os
 import json
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 from pyairtable import Api
 from dotenv import load_dotenv
@@ -20,14 +23,63 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from rate_governor import AirtableRateGovernor, get_airtable_governor
+from response_cache import canonical_json, hash_text
+
 # Load environment variables
 load_dotenv()
 
+
+class GovernedRetry(Retry):
+    """
+    urllib3 Retry whose retries also go through an Airtable rate governor.
+
+    A 429 is reported to the governor, which pauses every request to the base and slows
+    down, instead of this request alone sleeping and retrying on its own schedule.
+    """
+
+    def __init__(self, *args, governor: Optional[AirtableRateGovernor] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.governor = governor
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.governor = self.governor
+        return retry
+
+    def sleep(self, response=None):
+        if self.governor is None:
+            super().sleep(response)
+            return
+        if response is not None and response.status == 429:
+            wait = self.governor.record_rate_limited(response.headers.get('Retry-After'))
+            print(f"  ⏳ Airtable rate limit hit, pausing requests to this base for {wait:.0f}s", flush=True)
+        else:
+            super().sleep(response)
+        self.governor.acquire()
+
+
 class AirtableTraitUpdater:
     """Update Airtable records with extracted LinkedIn traits."""
+
+    # Most records Airtable accepts in one update request
+    MAX_BATCH_SIZE = 10
+    # Record ids per RECORD_ID() formula when fetching current values (Airtable returns up to 100 records per page)
+    FETCH_BATCH_SIZE = 100
     
-    def __init__(self, base_id: str = 'appCicrQbZaRq1Tvo', table_id: str = 'tblIJ47Fniuu9EJat', request_timeout_seconds: float = 30.0):
-        """Initialize the Airtable connection."""
+    def __init__(
+        self,
+        base_id: str = 'appCicrQbZaRq1Tvo',
+        table_id: str = 'tblIJ47Fniuu9EJat',
+        request_timeout_seconds: float = 30.0,
+        rate_governor: Optional[AirtableRateGovernor] = None
+    ):
+        """
+        Initialize the Airtable connection.
+
+        Every request, retries included, waits for the base's rate governor. By default that is
+        the process-wide one for base_id, so concurrent updaters on a base share its 5 req/s.
+        """
         self.api_key = os.getenv('AIRTABLE_API_KEY')
         if not self.api_key:
             raise ValueError("AIRTABLE_API_KEY environment variable not set")
@@ -36,17 +88,19 @@ class AirtableTraitUpdater:
         self.base_id = base_id
         self.table_id = table_id
         self.table = self.api.table(self.base_id, self.table_id)
+        self.rate_governor = rate_governor or get_airtable_governor(base_id)
 
         # Network robustness: set default request timeout and retries for all Airtable calls
         # Avoids indefinite hangs if a request stalls
         self._request_timeout_seconds = request_timeout_seconds
         try:
             session = self.api.session
-            retries = Retry(
+            retries = GovernedRetry(
                 total=5,
                 backoff_factor=0.8,
                 status_forcelist=[429, 500, 502, 503, 504],
-                allowed_methods=["HEAD", "GET", "PUT", "POST", "PATCH", "DELETE", "OPTIONS"]
+                allowed_methods=["HEAD", "GET", "PUT", "POST", "PATCH", "DELETE", "OPTIONS"],
+                governor=self.rate_governor
             )
             adapter = HTTPAdapter(max_retries=retries)
             session.mount("https://", adapter)
@@ -56,7 +110,11 @@ class AirtableTraitUpdater:
 
             def request_with_timeout(method, url, **kwargs):
                 kwargs.setdefault("timeout", self._request_timeout_seconds)
-                return original_request(method, url, **kwargs)
+                self.rate_governor.acquire()
+                response = original_request(method, url, **kwargs)
+                if response.status_code < 400:
+                    self.rate_governor.record_success()
+                return response
 
             session.request = request_with_timeout  # type: ignore[attr-defined]
             self.api.session = session
@@ -64,13 +122,27 @@ class AirtableTraitUpdater:
             # If session tweaking fails for any reason, continue without it
             pass
         
-        # Data storage
+        # Data storage. update_results is shared by the update workers, behind results_lock.
+        self.results_lock = threading.Lock()
+        # Record ID -> hash of the fields last written to it, persisted to checkpoint_file as writes succeed
+        self.checkpoint: Dict[str, str] = {}
+        self.checkpoint_file: Optional[str] = None
         self.url_mapping: Dict[str, str] = {}
         self.trait_data: List[Dict[str, Any]] = []
         self.update_results = {
             'successful_updates': 0,
             'failed_updates': 0,
             'missing_mappings': 0,
+            'requests': 0,
+            'attempted': 0,
+            'seconds': 0.0,
+            'write_seconds': 0.0,
+            'records_per_second': 0.0,
+            'fetch_requests': 0,
+            'changed': 0,
+            'unchanged': 0,
+            'skipped_fields': 0,
+            'already_written': 0,
             'errors': []
         }
     
@@ -229,47 +301,14 @@ class AirtableTraitUpdater:
         
         return formatted_data
     
-    def update_airtable_record(self, record_id: str, formatted_data: Dict[str, Any]) -> bool:
+    def collect_updates(self) -> List[Dict[str, Any]]:
         """
-        Update a single Airtable record with trait data.
-        
-        Args:
-            record_id: Airtable record ID
-            formatted_data: Formatted trait data for Airtable
-            
+        Map and format every trait record, counting the ones that can't be sent.
+
         Returns:
-            True if successful, False if failed
+            One {'id', 'fields', 'name'} update per record with data to write, in trait file order
         """
-        try:
-            # Perform update; the Session has a default timeout and retries configured
-            self.table.update(record_id, formatted_data)
-            return True
-        except requests.exceptions.Timeout:
-            error_msg = f"Timeout updating record {record_id} after {self._request_timeout_seconds}s"
-            print(f"  ❌ {error_msg}", flush=True)
-            self.update_results['errors'].append(error_msg)
-            return False
-        except requests.exceptions.RequestException as e:
-            error_msg = f"Network error updating record {record_id}: {e}"
-            print(f"  ❌ {error_msg}", flush=True)
-            self.update_results['errors'].append(error_msg)
-            return False
-        except Exception as e:
-            error_msg = f"Failed to update record {record_id}: {e}"
-            print(f"  ❌ {error_msg}", flush=True)
-            self.update_results['errors'].append(error_msg)
-            return False
-    
-    def process_trait_extractions(self, delay_between_updates: float = 0.5):
-        """
-        Process all trait extractions and update Airtable.
-        
-        Args:
-            delay_between_updates: Delay in seconds between Airtable updates
-        """
-        print(f"\nProcessing {len(self.trait_data)} trait extractions...")
-        print("-" * 60)
-        
+        updates = []
         for i, traits in enumerate(self.trait_data):
             linkedin_url = traits.get('linkedin_url')
             full_name = traits.get('full_name', 'Unknown')
@@ -294,19 +333,299 @@ class AirtableTraitUpdater:
             if not formatted_data:
                 print(f"  ⚠️  No valid data to update")
                 continue
-            
-            print(f"  📝 Updating record {record_id} with {len(formatted_data)} fields...", flush=True)
-            
-            # Update Airtable record
-            if self.update_airtable_record(record_id, formatted_data):
-                print(f"  ✓ Successfully updated", flush=True)
-                self.update_results['successful_updates'] += 1
+
+            updates.append({
+                'id': record_id,
+                'fields': formatted_data,
+                'name': full_name,
+                'hash': hash_text(canonical_json(formatted_data))[:16]
+            })
+        return updates
+
+    def get_checkpoint_file(self, traits_file: str) -> str:
+        """Checkpoint file for this base and table that sits next to the traits file."""
+        return traits_file.replace('.json', f'_{self.base_id}_{self.table_id}_airtable_progress.json')
+
+    def load_checkpoint(self, checkpoint_file: str, force_restart: bool = False):
+        """
+        Use `checkpoint_file` for this run, starting from its records unless force_restart.
+
+        A checkpoint written for another base or table is ignored (and replaced as this run writes),
+        since its records say nothing about what this table holds.
+        """
+        self.checkpoint_file = checkpoint_file
+        self.checkpoint = {}
+        if force_restart:
+            if os.path.exists(checkpoint_file):
+                os.remove(checkpoint_file)
+                print(f"🗑️ Cleared Airtable checkpoint {checkpoint_file} (force restart)", flush=True)
+            return
+        try:
+            if os.path.exists(checkpoint_file):
+                with open(checkpoint_file, 'r', encoding='utf-8') as f:
+                    checkpoint_data = json.load(f)
+                target = (checkpoint_data.get('base_id'), checkpoint_data.get('table_id'))
+                if target != (self.base_id, self.table_id):
+                    print(f"⚠️  Checkpoint {checkpoint_file} is for base {target[0]} / table {target[1]}, "
+                          f"not {self.base_id} / {self.table_id}; updating every record", flush=True)
+                    return
+                self.checkpoint = checkpoint_data.get('written_records', {})
+                print(f"🔄 RESUMING: {len(self.checkpoint)} records already written according to {checkpoint_file}", flush=True)
+        except Exception as e:
+            print(f"Error loading checkpoint: {e}")
+
+    def save_checkpoint(self):
+        """Write the checkpoint atomically, so a crash mid-write leaves the previous one. Call with results_lock held."""
+        if not self.checkpoint_file:
+            return
+        try:
+            directory = os.path.dirname(self.checkpoint_file) or '.'
+            os.makedirs(directory, exist_ok=True)
+            checkpoint_data = {
+                'base_id': self.base_id,
+                'table_id': self.table_id,
+                'written_records': self.checkpoint,
+                'last_updated': time.strftime('%Y-%m-%d %H:%M:%S')
+            }
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(checkpoint_data, f, indent=2)
+            os.replace(temp_path, self.checkpoint_file)
+        except Exception as e:
+            print(f"Error saving checkpoint: {e}")
+
+    def mark_written(self, updates: List[Dict[str, Any]]):
+        """Record that Airtable now holds these updates' fields."""
+        if not self.checkpoint_file or not updates:
+            return
+        with self.results_lock:
+            for update in updates:
+                self.checkpoint[update['id']] = update['hash']
+            self.save_checkpoint()
+
+    def drop_written(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop updates the checkpoint says were already written with the same fields."""
+        remaining = [update for update in updates if self.checkpoint.get(update['id']) != update['hash']]
+        self.update_results['already_written'] += len(updates) - len(remaining)
+        return remaining
+
+    def fetch_current_fields(
+        self, record_ids: List[str], field_names: List[str], delay_between_requests: float = 0.0
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Current values of `field_names` for `record_ids`, FETCH_BATCH_SIZE records per request.
+
+        Returns:
+            Record ID -> fields. Airtable leaves out empty fields and unchecked checkboxes.
+        """
+        unique_ids = list(dict.fromkeys(record_ids))
+        current = {}
+        for start in range(0, len(unique_ids), self.FETCH_BATCH_SIZE):
+            if start:
+                time.sleep(delay_between_requests)
+            chunk = unique_ids[start:start + self.FETCH_BATCH_SIZE]
+            formula = "OR(" + ",".join(f"RECORD_ID()='{record_id}'" for record_id in chunk) + ")"
+            self.update_results['fetch_requests'] += 1
+            for record in self.table.all(formula=formula, fields=field_names):
+                current[record['id']] = record.get('fields', {})
+        return current
+
+    @staticmethod
+    def values_equal(current: Any, new: Any) -> bool:
+        """Whether an Airtable cell already holds the value we would write."""
+        # Airtable omits empty fields and unchecked checkboxes
+        if current is None:
+            return new is False or new == ''
+        if isinstance(current, bool) or isinstance(new, bool):
+            return current is new
+        if isinstance(current, (int, float)) and isinstance(new, (int, float)):
+            return float(current) == float(new)
+        return str(current).strip() == str(new).strip()
+
+    def drop_unchanged(self, updates: List[Dict[str, Any]], delay_between_requests: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Reduce each update to the fields whose Airtable values differ, and drop updates with none.
+
+        If the current values can't be fetched, every update is sent in full.
+        """
+        field_names = sorted({name for update in updates for name in update['fields']})
+        try:
+            current = self.fetch_current_fields([update['id'] for update in updates], field_names, delay_between_requests)
+        except Exception as e:
+            print(f"  ⚠️  Could not fetch current Airtable values ({e}), sending all fields", flush=True)
+            return updates
+
+        changed_updates = []
+        unchanged_updates = []
+        for update in updates:
+            # Records that weren't returned are sent in full, and fail or succeed as before
+            if update['id'] not in current:
+                self.update_results['changed'] += 1
+                changed_updates.append(update)
+                continue
+            record_fields = current[update['id']]
+            changed = {
+                name: value for name, value in update['fields'].items()
+                if not self.values_equal(record_fields.get(name), value)
+            }
+            self.update_results['skipped_fields'] += len(update['fields']) - len(changed)
+            if changed:
+                self.update_results['changed'] += 1
+                changed_updates.append({**update, 'fields': changed})
             else:
-                self.update_results['failed_updates'] += 1
-            
-            # Rate limiting
-            if i < len(self.trait_data) - 1:
+                self.update_results['unchanged'] += 1
+                unchanged_updates.append(update)
+        print(f"  🔍 {self.update_results['changed']} records changed, {self.update_results['unchanged']} unchanged, "
+              f"{self.update_results['skipped_fields']} unchanged fields left out", flush=True)
+        self.mark_written(unchanged_updates)
+        return changed_updates
+
+    def merge_duplicate_updates(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        One update per Airtable record, for trait records that map to the same record.
+
+        Batches run in parallel, so two updates to one record could land in either order. The
+        merged update holds what writing them one after another in trait file order would
+        leave: every field, with later records' values winning.
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        for update in updates:
+            if update['id'] in merged:
+                fields = {**merged.pop(update['id'])['fields'], **update['fields']}
+                update = {**update, 'fields': fields, 'hash': hash_text(canonical_json(fields))[:16]}
+            merged[update['id']] = update
+        if len(merged) < len(updates):
+            print(f"\n🔗 Merged {len(updates) - len(merged)} updates to Airtable records that several trait records map to", flush=True)
+        return list(merged.values())
+
+    def make_batches(self, updates: List[Dict[str, Any]], batch_size: int) -> List[List[Dict[str, Any]]]:
+        """Group updates (one per record, see merge_duplicate_updates) into batches of up to batch_size."""
+        batches = []
+        batch = []
+        for update in updates:
+            if len(batch) >= batch_size:
+                batches.append(batch)
+                batch = []
+            batch.append(update)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    @staticmethod
+    def is_record_error(error: Exception) -> bool:
+        """Whether Airtable rejected the request's content (4xx other than 429), rather than failing to answer."""
+        response = getattr(error, 'response', None)
+        status = getattr(response, 'status_code', None)
+        return isinstance(error, requests.exceptions.HTTPError) and status is not None and 400 <= status < 500 and status != 429
+
+    def record_failure(self, updates: List[Dict[str, Any]], error: Exception):
+        """Count a failed write of `updates` and keep its error message."""
+        if isinstance(error, requests.exceptions.Timeout):
+            reason = f"Timeout after {self._request_timeout_seconds}s"
+        elif isinstance(error, requests.exceptions.RequestException) and not isinstance(error, requests.exceptions.HTTPError):
+            reason = f"Network error: {error}"
+        else:
+            reason = str(error)
+        record_ids = ', '.join(update['id'] for update in updates)
+        error_msg = f"Failed to update record{'s' if len(updates) > 1 else ''} {record_ids}: {reason}"
+        print(f"  ❌ {error_msg}", flush=True)
+        with self.results_lock:
+            self.update_results['errors'].append(error_msg)
+            self.update_results['failed_updates'] += len(updates)
+
+    def update_airtable_batch(self, updates: List[Dict[str, Any]]):
+        """
+        Write up to MAX_BATCH_SIZE updates in one request.
+
+        If Airtable rejects the batch because of its content, the batch is split in half and
+        each half retried, down to single records, so one bad record only fails itself.
+        Timeouts and network or server errors (after the session's retries) fail the whole batch.
+        """
+        with self.results_lock:
+            self.update_results['requests'] += 1
+        try:
+            # The Session has a default timeout and retries configured
+            self.table.batch_update([{'id': update['id'], 'fields': update['fields']} for update in updates])
+        except Exception as e:
+            if len(updates) > 1 and self.is_record_error(e):
+                middle = len(updates) // 2
+                print(f"  ⚠️  Batch of {len(updates)} rejected ({e}), retrying in halves", flush=True)
+                self.update_airtable_batch(updates[:middle])
+                self.update_airtable_batch(updates[middle:])
+            else:
+                self.record_failure(updates, e)
+            return
+        with self.results_lock:
+            self.update_results['successful_updates'] += len(updates)
+        self.mark_written(updates)
+        print(f"  ✓ Updated {len(updates)} record{'s' if len(updates) > 1 else ''}: "
+              f"{', '.join(update['name'] for update in updates)}", flush=True)
+
+    def process_trait_extractions(
+        self,
+        delay_between_updates: float = 0.0,
+        batch_size: int = MAX_BATCH_SIZE,
+        diff_updates: bool = True,
+        max_workers: int = 4,
+        checkpoint_file: Optional[str] = None,
+        force_restart: bool = False
+    ):
+        """
+        Process all trait extractions and update Airtable.
+        
+        Args:
+            delay_between_updates: Extra delay in seconds after each update request, per worker. Pacing
+                against Airtable's per-base limit is handled by the rate governor, so this is usually 0.
+            batch_size: Records per update request, up to MAX_BATCH_SIZE. 1 updates one record per request.
+            diff_updates: Fetch the records' current AI_* values first and send only the fields that changed,
+                skipping records with no changes
+            max_workers: Update requests in flight at once. The governor keeps them under the base's limit
+                together with any other updater on the same base.
+            checkpoint_file: File recording each record written and a hash of its fields. A rerun skips
+                records written with the same fields and redoes failed, unwritten or changed ones.
+                None runs without a checkpoint.
+            force_restart: Clear checkpoint_file and update every record
+        """
+        if not 1 <= batch_size <= self.MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {self.MAX_BATCH_SIZE}, got {batch_size}")
+
+        print(f"\nProcessing {len(self.trait_data)} trait extractions...")
+        print("-" * 60)
+        
+        if checkpoint_file:
+            self.load_checkpoint(checkpoint_file, force_restart)
+
+        start = time.perf_counter()
+        updates = self.merge_duplicate_updates(self.collect_updates())
+        if self.checkpoint:
+            updates = self.drop_written(updates)
+            print(f"\n⏭️  Skipping {self.update_results['already_written']} records already written in an earlier run", flush=True)
+        if diff_updates and updates:
+            print(f"\n🔍 Comparing {len(updates)} records with their current Airtable values...", flush=True)
+            updates = self.drop_unchanged(updates, delay_between_updates)
+        batches = self.make_batches(updates, batch_size)
+        print(f"\n📝 Updating {len(updates)} records in {len(batches)} requests of up to {batch_size}, "
+              f"{max_workers} at a time...", flush=True)
+
+        def update_batch(batch: List[Dict[str, Any]]):
+            self.update_airtable_batch(batch)
+            if delay_between_updates > 0:
                 time.sleep(delay_between_updates)
+
+        self.update_results['attempted'] += len(updates)
+        successful_before = self.update_results['successful_updates']
+        write_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            # list() re-raises anything a worker didn't handle
+            list(executor.map(update_batch, batches))
+
+        # Throughput counts records actually written, over the time spent writing them
+        write_seconds = time.perf_counter() - write_start
+        self.update_results['seconds'] += round(time.perf_counter() - start, 2)
+        self.update_results['write_seconds'] += round(write_seconds, 2)
+        if write_seconds > 0:
+            written = self.update_results['successful_updates'] - successful_before
+            self.update_results['records_per_second'] = round(written / write_seconds, 2)
     
     def print_summary(self):
         """Print update summary."""
@@ -314,12 +633,23 @@ class AirtableTraitUpdater:
         print("AIRTABLE UPDATE SUMMARY")
         print("="*60)
         print(f"Total trait records processed: {len(self.trait_data)}")
+        print(f"Records sent this run: {self.update_results['attempted']}")
         print(f"Successful updates: {self.update_results['successful_updates']}")
         print(f"Failed updates: {self.update_results['failed_updates']}")
         print(f"Missing URL mappings: {self.update_results['missing_mappings']}")
+        if self.checkpoint_file:
+            print(f"Already written (checkpoint): {self.update_results['already_written']}, checkpoint: {self.checkpoint_file}")
+        print(f"Unchanged records skipped: {self.update_results['unchanged']}, "
+              f"changed: {self.update_results['changed']}, unchanged fields left out: {self.update_results['skipped_fields']}")
+        print(f"Requests: {self.update_results['requests']} updates + {self.update_results['fetch_requests']} reads, "
+              f"{self.update_results['records_per_second']} records written/sec")
+        governor_stats = self.rate_governor.get_stats()
+        print(f"Rate governor: {governor_stats['rate_limited']} rate limits hit, {governor_stats['seconds_waited']}s spent waiting for budget, "
+              f"now {governor_stats['requests_per_second']} req/s")
         
-        if self.update_results['successful_updates'] > 0:
-            success_rate = (self.update_results['successful_updates'] / len(self.trait_data)) * 100
+        if self.update_results['attempted'] > 0:
+            # Of the records this run tried to write; checkpointed and unchanged ones were never attempted
+            success_rate = (self.update_results['successful_updates'] / self.update_results['attempted']) * 100
             print(f"Success rate: {success_rate:.1f}%")
         
         if self.update_results['errors']:
@@ -339,6 +669,12 @@ def main():
     parser.add_argument('--traits-file', default='final-trait-extractions/S25Top100_comprehensive_traits.json', help='Path to traits JSON (e.g., S25All_comprehensive_traits.json)')
     parser.add_argument('--url-mapping-file', default='airtable-extractions/S25Top100airtable_url_mapping.json', help='Path to URL mapping JSON (e.g., S25Allairtable_url_mapping.json)')
     parser.add_argument('--timeout-seconds', type=float, default=30.0, help='Per-request network timeout')
+    parser.add_argument('--checkpoint-file', help='Checkpoint of written records (default: <traits-file>_<base>_<table>_airtable_progress.json)')
+    parser.add_argument('--no-checkpoint', action='store_true', help='Run without a checkpoint')
+    parser.add_argument('--force-restart', action='store_true', help='Clear the checkpoint and update every record')
+    parser.add_argument('--workers', type=int, default=4, help='Update requests in flight at once (paced to the base limit)')
+    parser.add_argument('--no-diff', action='store_true', help='Send every field of every record, without comparing with current values')
+    parser.add_argument('--batch-size', type=int, default=AirtableTraitUpdater.MAX_BATCH_SIZE, help='Records per update request (1-10)')
     
     args = parser.parse_args()
     
@@ -347,7 +683,14 @@ def main():
         
         updater = AirtableTraitUpdater(base_id=args.base_id, table_id=args.table_id, request_timeout_seconds=args.timeout_seconds)
         updater.load_data(traits_file=args.traits_file, url_mapping_file=args.url_mapping_file)
-        updater.process_trait_extractions()
+        checkpoint_file = None if args.no_checkpoint else (args.checkpoint_file or updater.get_checkpoint_file(args.traits_file))
+        updater.process_trait_extractions(
+            batch_size=args.batch_size,
+            diff_updates=not args.no_diff,
+            max_workers=args.workers,
+            checkpoint_file=checkpoint_file,
+            force_restart=args.force_restart
+        )
         updater.print_summary()
         
         print("\n✅ Airtable update process complete!")
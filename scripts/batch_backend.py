@@ -0,0 +1,206 @@
+'''
+Backends for batch trait extraction.
+
+A batch backend takes a JSONL file of chat-completions requests (one per profile, keyed by
+custom_id), runs them asynchronously and hands back one result line per request in the
+OpenAI Batch API output format:
+
+    {"custom_id": "...", "response": {"status_code": 200, "body": {...chat completion...}}, "error": null}
+
+OpenAIBatchBackend talks to the real Batch API. LocalBatchBackend is a file-based stand-in
+that answers requests with a local responder function, so batch mode can be run end to end
+offline (no API key, no cost).
+'''
+
+import json
+import os
+import shutil
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+# Batch statuses after which nothing more will happen
+TERMINAL_STATUSES = {'completed', 'failed', 'expired', 'cancelled'}
+
+
+class OpenAIBatchBackend:
+    """Submits request files to the OpenAI Batch API."""
+
+    def __init__(self, client, completion_window: str = '24h'):
+        """
+        Args:
+            client: OpenAI client to upload files and create batches with
+            completion_window: Batch completion window accepted by the API
+        """
+        self.client = client
+        self.completion_window = completion_window
+
+    def submit(self, batch_file: str) -> str:
+        """Upload the JSONL request file and start a batch. Returns the batch id."""
+        with open(batch_file, 'rb') as f:
+            uploaded = self.client.files.create(file=f, purpose='batch')
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint='/v1/chat/completions',
+            completion_window=self.completion_window
+        )
+        return batch.id
+
+    def get_status(self, batch_id: str) -> Dict[str, Any]:
+        """Current status and request counts of a batch."""
+        batch = self.client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        return {
+            'status': batch.status,
+            'total': getattr(counts, 'total', 0) if counts else 0,
+            'completed': getattr(counts, 'completed', 0) if counts else 0,
+            'failed': getattr(counts, 'failed', 0) if counts else 0
+        }
+
+    def fetch_results(self, batch_id: str) -> List[Dict[str, Any]]:
+        """All output and error lines of a finished batch."""
+        batch = self.client.batches.retrieve(batch_id)
+        results = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            text = self.client.files.content(file_id).text
+            results.extend(json.loads(line) for line in text.splitlines() if line.strip())
+        return results
+
+
+def _unknown_value(schema: Dict[str, Any]) -> Any:
+    """The model's "unsure" value for a schema: "-1" for strings, -1 for numbers, empty otherwise."""
+    schema_types = schema.get('type', 'string')
+    schema_type = schema_types[0] if isinstance(schema_types, list) else schema_types
+    if schema_type == 'object':
+        return {key: _unknown_value(value) for key, value in schema.get('properties', {}).items()}
+    return {'string': '-1', 'number': -1, 'integer': -1, 'boolean': False, 'array': [], 'null': None}.get(schema_type)
+
+
+def placeholder_responder(request_body: Dict[str, Any]) -> str:
+    """
+    Default LocalBatchBackend responder: answers with a traits object that only carries the
+    profile's name and URL and marks everything else as unknown ("-1"), like the model does
+    when it's unsure. If the request has a json_schema response_format, the answer conforms to it.
+    """
+    profile = {}
+    for message in request_body.get('messages', []):
+        if message.get('role') == 'user':
+            try:
+                profile = json.loads(message.get('content') or '{}')
+            except json.JSONDecodeError:
+                profile = {}
+
+    schema = (request_body.get('response_format') or {}).get('json_schema', {}).get('schema')
+    answer = _unknown_value(schema) if schema else {}
+    answer.update({
+        'full_name': profile.get('fullName', 'Unknown'),
+        'linkedin_url': profile.get('linkedinUrl', 'not found'),
+        'confidence_score': 'Low'
+    })
+    return json.dumps(answer)
+
+
+class LocalBatchBackend:
+    """
+    File-based stand-in for the Batch API.
+
+    Each batch lives in `batch_dir` as <batch_id>_input.jsonl, <batch_id>_status.json and,
+    once processed, <batch_id>_output.jsonl. Requests are answered by `responder`, which
+    gets the chat-completions request body and returns the message content (or raises to
+    produce an error line). Processing happens on the first status poll after
+    `processing_delay` seconds, so the submit/poll/ingest flow behaves like the real thing.
+    """
+
+    def __init__(
+        self,
+        batch_dir: str = 'batch-jobs',
+        responder: Optional[Callable[[Dict[str, Any]], str]] = None,
+        processing_delay: float = 0.0
+    ):
+        self.batch_dir = batch_dir
+        self.responder = responder or placeholder_responder
+        self.processing_delay = processing_delay
+
+    def _path(self, batch_id: str, suffix: str) -> str:
+        return os.path.join(self.batch_dir, f"{batch_id}_{suffix}")
+
+    def _write_status(self, batch_id: str, status: Dict[str, Any]):
+        with open(self._path(batch_id, 'status.json'), 'w', encoding='utf-8') as f:
+            json.dump(status, f, indent=2)
+
+    def submit(self, batch_file: str) -> str:
+        """Copy the request file into the batch directory and queue it. Returns the batch id."""
+        os.makedirs(self.batch_dir, exist_ok=True)
+        batch_id = f"local_batch_{uuid.uuid4().hex[:12]}"
+        shutil.copyfile(batch_file, self._path(batch_id, 'input.jsonl'))
+        self._write_status(batch_id, {
+            'status': 'in_progress',
+            'created_at': time.time(),
+            'total': 0,
+            'completed': 0,
+            'failed': 0
+        })
+        return batch_id
+
+    def _process(self, batch_id: str, status: Dict[str, Any]):
+        """Answer every request in the input file and write the output file."""
+        completed = failed = 0
+        with open(self._path(batch_id, 'input.jsonl'), 'r', encoding='utf-8') as source, \
+                open(self._path(batch_id, 'output.jsonl'), 'w', encoding='utf-8') as output:
+            for line in source:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                try:
+                    content = self.responder(request['body'])
+                    # ~4 characters per token, like the mock server
+                    prompt_tokens = len(json.dumps(request['body'].get('messages', []))) // 4
+                    completion_tokens = max(1, len(content) // 4)
+                    result = {
+                        'id': f"batch_req_{uuid.uuid4().hex[:12]}",
+                        'custom_id': request['custom_id'],
+                        'response': {
+                            'status_code': 200,
+                            'body': {
+                                'model': request['body'].get('model'),
+                                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}}],
+                                'usage': {
+                                    'prompt_tokens': prompt_tokens,
+                                    'completion_tokens': completion_tokens,
+                                    'total_tokens': prompt_tokens + completion_tokens
+                                }
+                            }
+                        },
+                        'error': None
+                    }
+                    completed += 1
+                except Exception as e:
+                    result = {
+                        'id': f"batch_req_{uuid.uuid4().hex[:12]}",
+                        'custom_id': request['custom_id'],
+                        'response': None,
+                        'error': {'code': 'responder_error', 'message': str(e)}
+                    }
+                    failed += 1
+                output.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+        status.update({'status': 'completed', 'total': completed + failed, 'completed': completed, 'failed': failed})
+        self._write_status(batch_id, status)
+
+    def get_status(self, batch_id: str) -> Dict[str, Any]:
+        """Current status of a batch, processing it if it's due."""
+        with open(self._path(batch_id, 'status.json'), 'r', encoding='utf-8') as f:
+            status = json.load(f)
+        if status['status'] == 'in_progress' and time.time() - status['created_at'] >= self.processing_delay:
+            self._process(batch_id, status)
+        return {key: status[key] for key in ('status', 'total', 'completed', 'failed')}
+
+    def fetch_results(self, batch_id: str) -> List[Dict[str, Any]]:
+        """All result lines of a processed batch."""
+        output_path = self._path(batch_id, 'output.jsonl')
+        if not os.path.exists(output_path):
+            return []
+        with open(output_path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,165 @@
+'''
+Benchmark for the data cleaning stage (step 3).
+
+Two modes:
+ - Scaling run (default): cleans seeded synthetic cohorts from profile_generator.py at each
+   size and reports profiles/sec, peak RSS and output bytes for LinkedInDataProcessor.
+   Each size runs in its own subprocess so peak RSS isn't carried over between sizes.
+ - --compare: times the compiled cleaning schema (process_single_profile) against the
+   original hand-written walk (process_single_profile_handwritten) and checks that both
+   produce identical output.
+
+Usage:
+    python cleaner_benchmark.py --sizes 100 1000 10000 100000 --seed 42
+    python cleaner_benchmark.py --compare --input apify-profile-data/S25Top100linkedin_profile_data.json --repeat 5
+'''
+
+import argparse
+import copy
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+from data_cleaner import LinkedInDataProcessor
+from profile_generator import generate_profiles
+
+
+def time_cleaning(clean_fn, profiles: List[Dict[str, Any]], repeat: int) -> float:
+    """Best-of-`repeat` wall time in seconds to clean every profile once."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for profile in profiles:
+            clean_fn(profile)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare_compiled_and_handwritten(profiles: List[Dict[str, Any]], repeat: int = 5) -> Dict[str, Any]:
+    """Check both paths agree, then time them on the same profiles."""
+    processor = LinkedInDataProcessor(schema='standard')
+
+    compiled_output = [processor.process_single_profile(copy.deepcopy(p)) for p in profiles]
+    handwritten_output = [processor.process_single_profile_handwritten(copy.deepcopy(p)) for p in profiles]
+    if compiled_output != handwritten_output:
+        raise AssertionError("Compiled cleaning schema output differs from the hand-written walk")
+
+    # Interleave the runs so neither path benefits from running on a warmer machine
+    handwritten_seconds = compiled_seconds = float('inf')
+    for _ in range(repeat):
+        handwritten_seconds = min(handwritten_seconds, time_cleaning(processor.process_single_profile_handwritten, profiles, 1))
+        compiled_seconds = min(compiled_seconds, time_cleaning(processor.process_single_profile, profiles, 1))
+
+    return {
+        'profiles': len(profiles),
+        'handwritten_profiles_per_sec': round(len(profiles) / handwritten_seconds, 1),
+        'compiled_profiles_per_sec': round(len(profiles) / compiled_seconds, 1),
+        'speedup': round(handwritten_seconds / compiled_seconds, 3)
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in KB on Linux and bytes on macOS
+        return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+    except ImportError:
+        # Windows: psutil exposes the peak working set
+        import psutil
+        memory = psutil.Process().memory_info()
+        return round(getattr(memory, 'peak_wset', memory.rss) / (1024 * 1024), 1)
+
+
+def json_size_bytes(data: Any) -> int:
+    """UTF-8 size of `data` as the pipeline saves it, without building the whole string."""
+    encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+    return sum(len(chunk.encode('utf-8')) for chunk in encoder.iterencode(data))
+
+
+def run_single_size(size: int, seed: int, schema: str) -> Dict[str, Any]:
+    """Generate a cohort of `size` profiles, clean it once and measure the run."""
+    profiles = generate_profiles(size, seed)
+    input_bytes = json_size_bytes(profiles)
+
+    processor = LinkedInDataProcessor(schema=schema)
+    start = time.perf_counter()
+    cleaned = processor.process_profiles(profiles)
+    elapsed = time.perf_counter() - start
+
+    # Same serialisation the cleaner job uses when saving
+    output_bytes = json_size_bytes(cleaned)
+    report = processor.get_caption_parse_report()
+
+    return {
+        'size': size,
+        'schema': schema,
+        'seconds': round(elapsed, 3),
+        'profiles_per_sec': round(size / elapsed, 1) if elapsed > 0 else 0,
+        'peak_rss_mb': peak_rss_mb(),
+        'input_bytes': input_bytes,
+        'output_bytes': output_bytes,
+        'output_ratio': round(output_bytes / input_bytes, 3) if input_bytes else 0,
+        'experience_parse_rate': report['experiences']['parse_rate']
+    }
+
+
+def run_scaling_benchmark(sizes: List[int], seed: int = 42, schema: str = 'standard') -> List[Dict[str, Any]]:
+    """Run run_single_size for every size, each in a fresh interpreter."""
+    results = []
+    for size in sizes:
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--worker-size', str(size), '--seed', str(seed), '--schema', schema],
+            capture_output=True, text=True, check=True
+        )
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+        print(f"  {size} profiles done", flush=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the LinkedIn profile cleaner')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000], help='Cohort sizes for the scaling run')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for the synthetic profile generator')
+    parser.add_argument('--schema', default='standard', help='Cleaning schema to benchmark')
+    parser.add_argument('--compare', action='store_true', help='Compare the compiled schema with the hand-written walk')
+    parser.add_argument('--input', help='Raw Apify profile JSON for --compare (defaults to synthetic profiles)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions for --compare (best run is reported)')
+    parser.add_argument('--worker-size', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker_size:
+        print(json.dumps(run_single_size(args.worker_size, args.seed, args.schema)))
+        return
+
+    if args.compare:
+        if args.input:
+            with open(args.input, 'r', encoding='utf-8') as f:
+                profiles = json.load(f)
+        else:
+            profiles = generate_profiles(2000, args.seed)
+
+        results = compare_compiled_and_handwritten(profiles, repeat=args.repeat)
+
+        print("\n=== CLEANER BENCHMARK: compiled schema vs hand-written walk ===")
+        print(f"Profiles: {results['profiles']}")
+        print(f"Hand-written: {results['handwritten_profiles_per_sec']} profiles/sec")
+        print(f"Compiled:     {results['compiled_profiles_per_sec']} profiles/sec")
+        print(f"Speedup:      {results['speedup']}x")
+        return
+
+    print(f"Running cleaner benchmark (schema={args.schema}, seed={args.seed})...")
+    results = run_scaling_benchmark(args.sizes, args.seed, args.schema)
+
+    print("\n=== CLEANER BENCHMARK ===")
+    print(f"{'profiles':>10} {'profiles/sec':>14} {'peak RSS MB':>12} {'output bytes':>14} {'out/in':>8} {'exp dates %':>12}")
+    for r in results:
+        print(f"{r['size']:>10} {r['profiles_per_sec']:>14} {r['peak_rss_mb']:>12} {r['output_bytes']:>14} {r['output_ratio']:>8} {r['experience_parse_rate']:>12}")
+
+
+if __name__ == "__main__":
+    main()
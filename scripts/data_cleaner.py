@@ -6,7 +6,175 @@ Step 3:
 
 import json
 import re
-from typing import Dict, List, Any
+from datetime import date
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+# "Jan 2019", "January 2019" or just "2019"
+_DATE_POINT = r'(?:([A-Za-z]{3,9})\.?\s+)?((?:19|20)\d{2})'
+# start - end, where end can be a date or "Present"
+_DATE_RANGE_RE = re.compile(
+    _DATE_POINT + r'\s*[-\u2013\u2014]\s*(?:(present|current|now)|' + _DATE_POINT + r')',
+    re.IGNORECASE
+)
+_SINGLE_DATE_RE = re.compile(r'^\s*' + _DATE_POINT + r'\s*(?:[\u00b7|]|$)', re.IGNORECASE)
+_YEARS_RE = re.compile(r'(\d+)\s*(?:yrs?|years?)\b', re.IGNORECASE)
+_MONTHS_RE = re.compile(r'(\d+)\s*(?:mos?|months?)\b', re.IGNORECASE)
+_LESS_THAN_YEAR_RE = re.compile(r'less than a year', re.IGNORECASE)
+
+
+def _month_number(name: Optional[str]) -> Optional[int]:
+    if not name:
+        return None
+    return MONTHS.get(name[:3].lower())
+
+
+def _parse_duration(text: str) -> Optional[int]:
+    """Read a LinkedIn duration such as "5 yrs 3 mos" into a number of months."""
+    years = _YEARS_RE.search(text)
+    months = _MONTHS_RE.search(text)
+    if years or months:
+        return (int(years.group(1)) * 12 if years else 0) + (int(months.group(1)) if months else 0)
+    if _LESS_THAN_YEAR_RE.search(text):
+        return 0
+    return None
+
+
+@lru_cache(maxsize=65536)
+def _parse_caption_cached(text: str) -> Optional[Tuple]:
+    # Captions repeat a lot across a cohort ("2016 - 2020", "Jan 2020 - Present"), so
+    # results are memoized as immutable tuples and turned into fresh dicts by the caller.
+    start_year = start_month = end_year = end_month = None
+    is_current = False
+
+    date_range = _DATE_RANGE_RE.search(text)
+    if date_range:
+        start_month = _month_number(date_range.group(1))
+        start_year = int(date_range.group(2))
+        if date_range.group(3):
+            is_current = True
+        else:
+            end_month = _month_number(date_range.group(4))
+            end_year = int(date_range.group(5))
+    else:
+        # A single date ("Jun 2020 · 1 mo") means the role started and ended in that period
+        single = _SINGLE_DATE_RE.search(text)
+        if single:
+            start_month = end_month = _month_number(single.group(1))
+            start_year = end_year = int(single.group(2))
+
+    duration_months = _parse_duration(text)
+
+    if start_year is None and duration_months is None:
+        return None
+
+    # Fall back to computing the duration when LinkedIn didn't state one.
+    # LinkedIn counts both the start and end month, so Jan-Mar is 3 months.
+    if duration_months is None and start_year is not None:
+        if is_current:
+            today = date.today()
+            end_y, end_m = today.year, today.month
+        else:
+            end_y, end_m = end_year, end_month
+        if start_month and end_m:
+            duration_months = max(0, (end_y - start_year) * 12 + (end_m - start_month) + 1)
+        elif end_y is not None:
+            duration_months = max(0, (end_y - start_year) * 12)
+
+    return (start_year, start_month, end_year, end_month, duration_months, is_current)
+
+
+def parse_date_caption(text: Any) -> Optional[Dict[str, Any]]:
+    """
+    Parse a LinkedIn caption like "Jan 2019 - Present · 5 yrs 3 mos" into structured dates.
+
+    Returns a dict with start_year/start_month, end_year/end_month (None when current or unknown),
+    duration_months and is_current, or None if the text has no recognisable dates or duration.
+    """
+    if not isinstance(text, str) or not text.strip():
+        return None
+    parsed = _parse_caption_cached(text.strip())
+    if parsed is None:
+        return None
+    start_year, start_month, end_year, end_month, duration_months, is_current = parsed
+    return {
+        'start_year': start_year,
+        'start_month': start_month,
+        'end_year': end_year,
+        'end_month': end_month,
+        'duration_months': duration_months,
+        'is_current': is_current
+    }
+
+
+# Declarative cleaning schemas.
+# Each section lists (key, transform) steps in output order. Field transforms read item[key]:
+#   keep          copy the value as-is (only if present)
+#   keep_or_empty copy the value, defaulting to '' when missing
+#   text          clean_text_content(value)
+#   skill_titles  list of skill titles
+#   item_titles   list of cleaned 'title' values, for simple list sections like honorsAndAwards
+#   experiences / educations  run the compiled experience/education section over each item
+# Item transforms look at the whole item and may add `key` to the output:
+#   dates         structured dates parsed from the caption (see parse_date_caption)
+#   descriptions  joined textComponent descriptions (from subComponents, or the role itself)
+#   roles         breakdown roles, built with the compiled 'role' section
+CLEANING_SCHEMAS: Dict[str, Dict[str, List[Tuple[str, str]]]] = {
+    # What the cleaner has always produced
+    'standard': {
+        'profile': [
+            ('fullName', 'text'), ('headline', 'text'), ('linkedinUrl', 'keep'), ('about', 'text'),
+            ('experiences', 'experiences'), ('educations', 'educations'), ('skills', 'skill_titles'),
+            ('jobTitle', 'keep'), ('companyName', 'keep'), ('companyIndustry', 'keep'), ('currentJobDuration', 'keep')
+        ],
+        'experience': [
+            ('title', 'text'), ('subtitle', 'text'), ('caption', 'keep'), ('metadata', 'keep'),
+            ('dates', 'dates'), ('description', 'descriptions'), ('roles', 'roles')
+        ],
+        'role': [
+            ('title', 'text'), ('caption', 'keep_or_empty'), ('metadata', 'keep_or_empty'),
+            ('dates', 'dates'), ('description', 'descriptions')
+        ],
+        'education': [
+            ('title', 'text'), ('subtitle', 'text'), ('caption', 'text'), ('dates', 'dates')
+        ]
+    },
+    # Titles and dates only - much shorter prompts for cohorts where descriptions add little
+    'lean': {
+        'profile': [
+            ('fullName', 'text'), ('headline', 'text'), ('linkedinUrl', 'keep'),
+            ('experiences', 'experiences'), ('educations', 'educations'),
+            ('jobTitle', 'keep'), ('companyName', 'keep')
+        ],
+        'experience': [
+            ('title', 'text'), ('subtitle', 'text'), ('caption', 'keep'), ('dates', 'dates'), ('roles', 'roles')
+        ],
+        'role': [
+            ('title', 'text'), ('caption', 'keep_or_empty'), ('dates', 'dates')
+        ],
+        'education': [
+            ('title', 'text'), ('subtitle', 'text'), ('caption', 'text'), ('dates', 'dates')
+        ]
+    }
+}
+
+# Standard profile plus some of the optional sections listed in fields_to_remove
+CLEANING_SCHEMAS['rich'] = {
+    **CLEANING_SCHEMAS['standard'],
+    'profile': CLEANING_SCHEMAS['standard']['profile'] + [
+        ('languages', 'item_titles'), ('honorsAndAwards', 'item_titles'),
+        ('licenseAndCertificates', 'item_titles'), ('publications', 'item_titles')
+    ]
+}
+
+FIELD_TRANSFORMS = {'keep', 'keep_or_empty', 'text', 'skill_titles', 'item_titles', 'experiences', 'educations'}
+ITEM_TRANSFORMS = {'dates', 'descriptions', 'roles'}
+
 
 class LinkedInDataProcessor:
     """
@@ -14,9 +182,14 @@ class LinkedInDataProcessor:
     the data for trait extraction via OpenAI API.
     """
     
-    def __init__(self):
+    def __init__(self, schema: Any = 'standard'):
+        """
+        Args:
+            schema: Name of a schema in CLEANING_SCHEMAS ('standard', 'lean', 'rich') or a schema dict
+        """
         # Fields to completely remove
         # Just aint used anymore -- > just a list of other stuff that cna be included if wanted
+        # (the 'rich' cleaning schema pulls a few of these back in)
         self.fields_to_remove = {
             
             'profilePic', 'profilePicHighQuality', 'profilePicAllDimensions',
@@ -26,10 +199,8 @@ class LinkedInDataProcessor:
             'publicIdentifier', 'openConnection', 'urn', 
             'licenseAndCertificates', 'honorsAndAwards', 'patents',
             'courses', 'testScores', 'organizations', 'volunteerCauses',
-            'verifications', 'promos', 'highlights', 'publications'
-            'companyName', 
-    'companyIndustry',
-    'currentJobDuration'
+            'verifications', 'promos', 'highlights', 'publications',
+            'companyName', 'companyIndustry', 'currentJobDuration'
         }
         
         # Media/link patterns to remove from text fields
@@ -40,6 +211,55 @@ class LinkedInDataProcessor:
             r'"type":\s*"mediaComponent"[^}]*}',  # Media components
             r'"thumbnail":\s*"[^"]*"',  # Thumbnails
         ]
+
+        # Caption parse counters, per kind of item, for the parse-rate report
+        self.caption_stats = {
+            kind: {'attempted': 0, 'parsed': 0}
+            for kind in ('experiences', 'roles', 'educations')
+        }
+        self.unparsed_captions: List[str] = []
+
+        # Compile the schema once into one specialised function per section
+        if isinstance(schema, str):
+            if schema not in CLEANING_SCHEMAS:
+                raise ValueError(f"Unknown cleaning schema '{schema}'. Choose from: {', '.join(CLEANING_SCHEMAS)}")
+            self.schema_name = schema
+            schema = CLEANING_SCHEMAS[schema]
+        else:
+            self.schema_name = 'custom'
+        self.schema = schema
+        self._extractors = self.compile_schema(schema)
+    
+    def parse_item_dates(self, kind: str, *captions: Any) -> Optional[Dict[str, Any]]:
+        """Parse the first caption that yields dates and record the attempt under `kind`."""
+        candidates = [c for c in captions if isinstance(c, str) and c.strip()]
+        if not candidates:
+            return None
+
+        self.caption_stats[kind]['attempted'] += 1
+        for caption in candidates:
+            dates = parse_date_caption(caption)
+            if dates:
+                self.caption_stats[kind]['parsed'] += 1
+                return dates
+
+        # Keep a small sample of failures so new caption formats are easy to spot
+        if len(self.unparsed_captions) < 20 and candidates[0] not in self.unparsed_captions:
+            self.unparsed_captions.append(candidates[0])
+        return None
+
+    def get_caption_parse_report(self) -> Dict[str, Any]:
+        """Summarise how many experience/role/education captions were parsed into dates."""
+        report: Dict[str, Any] = {}
+        for kind, stats in self.caption_stats.items():
+            attempted = stats['attempted']
+            report[kind] = {
+                'attempted': attempted,
+                'parsed': stats['parsed'],
+                'parse_rate': round(stats['parsed'] / attempted * 100, 1) if attempted else 0
+            }
+        report['unparsed_samples'] = list(self.unparsed_captions)
+        return report
     
     def clean_text_content(self, text: str) -> str:
         """Remove URLs and media links from text content."""
@@ -57,6 +277,106 @@ class LinkedInDataProcessor:
         cleaned = re.sub(r'\s+', ' ', cleaned).strip()
         return cleaned
     
+    def compile_schema(self, schema: Dict[str, List[Tuple[str, str]]]) -> Dict[str, Any]:
+        """
+        Compile a cleaning schema into one extraction function per section.
+
+        Each section becomes straight-line Python (one `if key in item` per field) so that
+        the per-profile cost is the same as a hand-written walk, without interpreting the
+        schema for every item.
+        """
+        for section in ('profile', 'experience', 'role', 'education'):
+            if section not in schema:
+                raise ValueError(f"Cleaning schema is missing the '{section}' section")
+            for key, transform in schema[section]:
+                if transform not in FIELD_TRANSFORMS and transform not in ITEM_TRANSFORMS:
+                    raise ValueError(f"Unknown transform '{transform}' for '{section}.{key}'")
+
+        extractors: Dict[str, Any] = {}
+        namespace = {
+            'clean': self._compile_text_cleaner(),
+            'extractors': extractors,
+            'parse_dates': self.parse_item_dates,
+            'fill_span_from_roles': self._fill_span_from_roles
+        }
+
+        clean = namespace['clean']
+
+        def text_descriptions(description_items):
+            return [clean(d['text']) for d in description_items
+                    if isinstance(d, dict) and d.get('type') == 'textComponent' and d.get('text')]
+
+        namespace['text_descriptions'] = text_descriptions
+
+        # Which counter in caption_stats each section's dates are reported under
+        dates_kind = {'experience': 'experiences', 'role': 'roles', 'education': 'educations'}
+
+        for section in ('role', 'experience', 'education', 'profile'):
+            lines = [f"def extract_{section}(item):", "    out = {}"]
+            for key, transform in schema[section]:
+                k = repr(key)
+                if transform == 'keep':
+                    lines.append(f"    if {k} in item: out[{k}] = item[{k}]")
+                elif transform == 'keep_or_empty':
+                    lines.append(f"    out[{k}] = item.get({k}, '')")
+                elif transform == 'text':
+                    lines.append(f"    if {k} in item: out[{k}] = clean(item[{k}])")
+                elif transform == 'skill_titles':
+                    lines.append(f"    if {k} in item: out[{k}] = [s['title'] for s in item[{k}] if 'title' in s]")
+                elif transform == 'item_titles':
+                    lines.append(f"    if {k} in item: out[{k}] = [clean(s['title']) for s in item[{k}] if isinstance(s, dict) and 'title' in s]")
+                elif transform in ('experiences', 'educations'):
+                    sub = 'experience' if transform == 'experiences' else 'education'
+                    lines.append(f"    if {k} in item:")
+                    lines.append(f"        sub = extractors[{sub!r}]")
+                    lines.append(f"        out[{k}] = [c for c in (sub(x) for x in item[{k}]) if c]")
+                elif transform == 'dates':
+                    if section == 'experience':
+                        # Breakdown experiences keep the company total in the caption or subtitle
+                        lines.append("    if item.get('breakdown'):")
+                        lines.append("        dates = parse_dates('experiences', item.get('caption'), item.get('subtitle'))")
+                        lines.append("    else:")
+                        lines.append("        dates = parse_dates('experiences', item.get('caption'))")
+                    else:
+                        lines.append(f"    dates = parse_dates({dates_kind[section]!r}, item.get('caption'))")
+                    lines.append(f"    if dates: out[{k}] = dates")
+                elif transform == 'descriptions':
+                    if section == 'experience':
+                        # All role descriptions rolled up into one company-level description
+                        lines.append("    if 'subComponents' in item:")
+                        lines.append("        texts = [t for sub in item['subComponents'] if 'description' in sub for t in text_descriptions(sub['description'])]")
+                    else:
+                        lines.append("    if 'description' in item:")
+                        lines.append("        texts = text_descriptions(item['description'])")
+                    lines.append(f"        if texts: out[{k}] = ' '.join(texts)")
+                elif transform == 'roles':
+                    lines.append("    if item.get('breakdown') and 'subComponents' in item:")
+                    lines.append("        out['breakdown'] = True")
+                    lines.append("        role = extractors['role']")
+                    lines.append(f"        out[{k}] = [role(sub) for sub in item['subComponents'] if 'title' in sub]")
+                    if any(t == 'dates' for _, t in schema['experience']):
+                        lines.append("        fill_span_from_roles(out)")
+            lines.append("    return out")
+
+            exec(compile("\n".join(lines), f"<cleaning schema: {section}>", "exec"), namespace)
+            extractors[section] = namespace[f"extract_{section}"]
+
+        return extractors
+
+    def _compile_text_cleaner(self):
+        """clean_text_content with the media patterns compiled up front instead of per call."""
+        media_regexes = [re.compile(pattern, re.IGNORECASE) for pattern in self.media_patterns]
+        whitespace = re.compile(r'\s+')
+
+        def clean(text):
+            if not isinstance(text, str):
+                return text
+            for regex in media_regexes:
+                text = regex.sub('', text)
+            return whitespace.sub(' ', text).strip()
+
+        return clean
+
     def process_experience_item(self, experience: Dict[str, Any]) -> Dict[str, Any]:
         """Clean and process a single experience item."""
         cleaned = {}
@@ -70,6 +390,15 @@ class LinkedInDataProcessor:
             cleaned['caption'] = experience['caption']
         if 'metadata' in experience:
             cleaned['metadata'] = experience['metadata']
+
+        # Structured dates from the caption, e.g. "Jan 2019 - Present · 5 yrs 3 mos".
+        # Breakdown experiences keep the company total in the caption or subtitle ("Full-time · 5 yrs")
+        if experience.get('breakdown'):
+            dates = self.parse_item_dates('experiences', experience.get('caption'), experience.get('subtitle'))
+        else:
+            dates = self.parse_item_dates('experiences', experience.get('caption'))
+        if dates:
+            cleaned['dates'] = dates
         
         # Process subComponents to extract descriptions while removing media
         # sub componensts in the expereince section are each particular expereince
@@ -118,6 +447,9 @@ class LinkedInDataProcessor:
                         'caption': sub.get('caption', ''),
                         'metadata': sub.get('metadata', '')
                     }
+                    role_dates = self.parse_item_dates('roles', sub.get('caption'))
+                    if role_dates:
+                        role['dates'] = role_dates
                     if 'description' in sub:
                         descriptions = []
                         
@@ -133,9 +465,35 @@ class LinkedInDataProcessor:
                             role['description'] = ' '.join(descriptions)
                     roles.append(role)
             cleaned['roles'] = roles
+            self._fill_span_from_roles(cleaned)
         
         return cleaned
     
+    def _fill_span_from_roles(self, cleaned: Dict[str, Any]):
+        """Give a breakdown experience the start/end span covered by its roles."""
+        role_dates = [role['dates'] for role in cleaned.get('roles', []) if role.get('dates', {}).get('start_year')]
+        if not role_dates:
+            return
+
+        earliest = min(role_dates, key=lambda d: (d['start_year'], d['start_month'] or 0))
+        is_current = any(d['is_current'] for d in role_dates)
+        latest = None if is_current else max(role_dates, key=lambda d: (d['end_year'] or 0, d['end_month'] or 0))
+
+        # Prefer the company total LinkedIn states over summing the roles
+        if cleaned.get('dates'):
+            duration_months = cleaned['dates']['duration_months']
+        else:
+            duration_months = sum(d['duration_months'] or 0 for d in role_dates)
+
+        cleaned['dates'] = {
+            'start_year': earliest['start_year'],
+            'start_month': earliest['start_month'],
+            'end_year': latest['end_year'] if latest else None,
+            'end_month': latest['end_month'] if latest else None,
+            'duration_months': duration_months,
+            'is_current': is_current
+        }
+
     def process_education_item(self, education: Dict[str, Any]) -> Dict[str, Any]:
         """Clean and process a single education item.
         
@@ -151,14 +509,25 @@ class LinkedInDataProcessor:
             if field in education:
                 cleaned[field] = self.clean_text_content(education[field])
 
+        # Education captions are usually just the years attended, e.g. "2012 - 2016"
+        dates = self.parse_item_dates('educations', education.get('caption'))
+        if dates:
+            cleaned['dates'] = dates
+
 
         return cleaned
     
     def process_single_profile(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Process a single LinkedIn profile using the compiled cleaning schema."""
+        return self._extractors['profile'](profile)
+
+    def process_single_profile_handwritten(self, profile: Dict[str, Any]) -> Dict[str, Any]:
         """Process a single LinkedIn profile.
         
         Gathers all meaningful data. 
 
+        The original hand-written walk of the 'standard' schema. Kept as the reference
+        that cleaner_benchmark.py checks the compiled path against.
         """
         cleaned_profile = {}
         
@@ -237,5 +606,12 @@ def main():
         print(f"Processed {len(cleaned_profiles)} profiles")
         print("Cleaned data saved to:", filename)
 
+        report = processor.get_caption_parse_report()
+        for kind in ('experiences', 'roles', 'educations'):
+            stats = report[kind]
+            print(f"Parsed {kind} dates: {stats['parsed']}/{stats['attempted']} ({stats['parse_rate']}%)")
+        if report['unparsed_samples']:
+            print("Unparsed caption samples:", report['unparsed_samples'][:5])
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,155 @@
+'''
+Benchmark for local entity matching (entity_matcher.py).
+
+Cleans a seeded synthetic cohort from profile_generator.py in chunks and tags every profile
+with the compiled Aho-Corasick matcher, timing only the matching. A naive matcher that runs
+one regex per name over the same text is timed on the first --baseline profiles, and both
+must tag those profiles identically. Agreement is reported per kind of entity, so the
+accelerator path (aliases like YC, case-sensitive and company-scope-only names) is checked
+on its own rather than hidden among notable companies.
+
+Usage:
+    python entity_benchmark.py --count 100000 --seed 42
+    python entity_benchmark.py --input cleaned-profile-data/S25Top100cleaned_linkedin_data.json
+'''
+
+import argparse
+import json
+import re
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, List
+
+from data_cleaner import LinkedInDataProcessor
+from entity_matcher import (
+    ACCELERATORS, CASE_SENSITIVE_ALIASES, COMPANY_SCOPE_ONLY, NOTABLE_COMPANIES, EntityMatcher, tokenize
+)
+from profile_generator import iter_profiles
+
+
+class RegexEntityMatcher(EntityMatcher):
+    """One word-bounded regex per name: the straightforward approach the automaton replaces."""
+
+    def __init__(self):
+        self.patterns = []
+        for kind, entities in (('notable_companies', NOTABLE_COMPANIES), ('accelerators', ACCELERATORS)):
+            for canonical, aliases in entities.items():
+                for surface in [canonical] + aliases:
+                    body = r'\s*'.join(re.escape(token) for token in tokenize(surface))
+                    flags = 0 if surface in CASE_SENSITIVE_ALIASES else re.IGNORECASE
+                    scope_only = surface in COMPANY_SCOPE_ONLY
+                    self.patterns.append((re.compile(rf'(?<!\w){body}(?!\w)', flags), canonical, kind, scope_only))
+
+    def find(self, text: str, company_scope: bool = False):
+        matches = []
+        for regex, canonical, kind, scope_only in self.patterns:
+            if scope_only and not company_scope:
+                continue
+            if regex.search(text):
+                matches.append((canonical, kind))
+        return matches
+
+
+def cleaned_chunks(count: int, seed: int, chunk_size: int = 5000) -> Iterable[List[Dict[str, Any]]]:
+    """Synthetic profiles, cleaned, in chunks so 100k profiles never sit in memory at once."""
+    processor = LinkedInDataProcessor()
+    raw = iter_profiles(count, seed)
+    while True:
+        chunk = [processor.process_single_profile(profile) for profile in islice(raw, chunk_size)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_benchmark(chunks: Iterable[List[Dict[str, Any]]], baseline_profiles: int) -> Dict[str, Any]:
+    build_start = time.perf_counter()
+    matcher = EntityMatcher()
+    build_seconds = time.perf_counter() - build_start
+    baseline = RegexEntityMatcher()
+
+    profiles = matched_profiles = companies = accelerators = 0
+    match_seconds = baseline_seconds = baseline_compared = 0.0
+    automaton_seconds_on_baseline = 0.0
+    # Per kind: baseline profiles either matcher tagged with that kind, and how many of them differ
+    agreement = {kind: {'tagged_profiles': 0, 'disagreements': 0} for kind in ('notable_companies', 'accelerators')}
+
+    for chunk in chunks:
+        start = time.perf_counter()
+        tags = [matcher.tag_profile(profile) for profile in chunk]
+        match_seconds += time.perf_counter() - start
+
+        for profile_tags in tags:
+            profiles += 1
+            companies += len(profile_tags['notable_companies'])
+            accelerators += len(profile_tags['accelerators'])
+            matched_profiles += bool(profile_tags['notable_companies'] or profile_tags['accelerators'])
+
+        remaining = baseline_profiles - int(baseline_compared)
+        if remaining > 0:
+            sample = chunk[:remaining]
+            start = time.perf_counter()
+            baseline_tags = [baseline.tag_profile(profile) for profile in sample]
+            baseline_seconds += time.perf_counter() - start
+            start = time.perf_counter()
+            for profile in sample:
+                matcher.tag_profile(profile)
+            automaton_seconds_on_baseline += time.perf_counter() - start
+            for automaton_tags, regex_tags in zip(tags, baseline_tags):
+                for kind, counts in agreement.items():
+                    expected, found = sorted(regex_tags.get(kind, [])), sorted(automaton_tags.get(kind, []))
+                    counts['tagged_profiles'] += bool(expected or found)
+                    counts['disagreements'] += expected != found
+            baseline_compared += len(sample)
+
+    return {
+        'profiles': profiles,
+        'build_ms': round(build_seconds * 1000, 2),
+        'automaton_states': len(matcher.goto),
+        'match_seconds': round(match_seconds, 3),
+        'profiles_per_sec': round(profiles / match_seconds, 1) if match_seconds else 0,
+        'profiles_with_matches': matched_profiles,
+        'notable_companies_tagged': companies,
+        'accelerators_tagged': accelerators,
+        'baseline_profiles': int(baseline_compared),
+        'baseline_profiles_per_sec': round(baseline_compared / baseline_seconds, 1) if baseline_seconds else 0,
+        'speedup_vs_regex': round(baseline_seconds / automaton_seconds_on_baseline, 2) if automaton_seconds_on_baseline else 0,
+        'baseline_disagreements': sum(counts['disagreements'] for counts in agreement.values()),
+        'baseline_agreement': agreement
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark local notable company / accelerator matching')
+    parser.add_argument('--input', help='Cleaned profiles JSON. Defaults to synthetic profiles.')
+    parser.add_argument('--count', type=int, default=100000, help='Synthetic profiles to generate when no --input')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for synthetic profiles')
+    parser.add_argument('--baseline', type=int, default=2000, help='Profiles to also run through the per-name regex matcher')
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            chunks = [json.load(f)]
+    else:
+        chunks = cleaned_chunks(args.count, args.seed)
+
+    results = run_benchmark(chunks, args.baseline)
+
+    print("\n=== ENTITY MATCHER BENCHMARK ===")
+    print(f"Profiles: {results['profiles']} ({results['profiles_with_matches']} with matches)")
+    print(f"Automaton: {results['automaton_states']} states, built in {results['build_ms']}ms")
+    print(f"Matching: {results['match_seconds']}s, {results['profiles_per_sec']} profiles/sec")
+    print(f"Tagged: {results['notable_companies_tagged']} notable companies, {results['accelerators_tagged']} accelerators")
+    print(f"Per-name regex baseline: {results['baseline_profiles_per_sec']} profiles/sec on {results['baseline_profiles']} profiles, "
+          f"automaton is {results['speedup_vs_regex']}x faster, {results['baseline_disagreements']} disagreements")
+    for kind, counts in results['baseline_agreement'].items():
+        print(f"  {kind}: {counts['tagged_profiles']} profiles tagged, {counts['disagreements']} disagreements")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print("Saved to:", args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+'''
+Local matching of notable companies and accelerator programs in cleaned profiles.
+
+The lists the system prompt gives the model (NOTABLE COMPANIES / ACCELERATOR PROGRAMS) plus
+the old faang/unicorn/accelerator sets are compiled once into an Aho-Corasick automaton
+over word tokens, so every pattern is found in a single left-to-right pass over a profile's
+text and matches always fall on word boundaries ("Meta" never matches "metadata").
+
+ - Aliases map to one canonical name (YC -> Y Combinator, Facebook -> Meta, a16z -> Andreessen Horowitz)
+ - Case-sensitive aliases (YC, EF) only match when written that way
+ - Names that are also everyday words ("Remote", "Block", "First Round", "Social Capital")
+   only count inside company names, never in free text
+
+EntityMatcher.tag_profile() returns the canonical names found; tag_cohort() runs a whole
+cohort through the same compiled matcher.
+'''
+
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Canonical name -> aliases (the canonical name itself always matches)
+NOTABLE_COMPANIES: Dict[str, List[str]] = {
+    'Meta': ['Facebook', 'Meta Platforms'], 'Google': ['Alphabet', 'Google DeepMind'], 'Apple': [], 'Amazon': ['AWS', 'Amazon Web Services'],
+    'Microsoft': [], 'Tesla': [], 'Stripe': [], 'Figma': [], 'Notion': [], 'OpenAI': [], 'Anthropic': [],
+    'Netflix': [], 'Nvidia': [], 'Intel': [], 'AMD': [], 'Oracle': [], 'IBM': [], 'Salesforce': [], 'Adobe': [],
+    'Uber': [], 'Lyft': [], 'Snap': ['Snapchat'], 'Twitter': ['X Corp'], 'Spotify': [], 'Airbnb': [],
+    'Shopify': [], 'Block': ['Square'], 'PayPal': [], 'Dropbox': [], 'Slack': [], 'Cloudflare': [], 'Zoom': [],
+    'Palantir': [], 'Snowflake': [], 'Atlassian': [], 'Twilio': [], 'Coinbase': [], 'Reddit': [], 'SpaceX': [],
+    'ByteDance': [], 'TikTok': [], 'Discord': [], 'Databricks': [], 'Canva': [], 'Instacart': [], 'Klarna': [],
+    'Revolut': [], 'N26': [], 'Checkout.com': [], 'GitLab': [], 'Nubank': [], 'Celonis': [], 'Getir': [],
+    'Gorillas': [], 'Rappi': [], 'Flink': [], 'Miro': [], 'ClickUp': [], 'Postman': [], 'Loom': [], 'DeepL': [],
+    'Lemonade': [], 'Brex': [], 'Robinhood': [], 'Remote': [], 'Deel': [], 'Rippling': [], 'Scale AI': [],
+    'Samsara': [], 'Perplexity': [], 'Hugging Face': [], 'Character AI': ['Character.AI'], 'Cohere': [],
+    'Runway': [], 'Adept AI': [], 'Grok': [], 'DeepMind': [], 'Quora': [], 'Linear': [], 'Glovo': [], 'Bunq': [],
+    'Zeco': [], 'Tink': [], 'Mollie': [], 'Bitpanda': [], 'Wefox': [], 'Ledger': [], 'Vinted': [], 'Tado': [],
+    'Back Market': [], 'Oviva': [], 'Sennder': [], 'Sorare': [], 'Tier Mobility': [], 'Voi': [], 'Sknups': [],
+    'TrueLayer': [], 'Habito': [], 'Gousto': [], 'Factorial': [], 'Railway': [], 'Jobandtalent': [],
+    'Paysend': [], 'Ormatek': [], 'Frichti': []
+}
+
+ACCELERATORS: Dict[str, List[str]] = {
+    'Y Combinator': ['YC'], 'Techstars': [], 'Antler': [], 'Entrepreneur First': ['EF'], 'On Deck': [],
+    'Sequoia Scout': [], 'Greylock': [], 'Andreessen Horowitz': ['a16z'], 'Onstage': [], 'General Catalyst': [],
+    'Accel': [], 'Founders Fund': [], 'First Round': ['First Round Capital'], 'Index Ventures': [],
+    'Bessemer Venture Partners': [], 'Lightspeed': [], 'Neo': [], 'South Park Commons': [],
+    'Initialized Capital': [], 'Craft Ventures': [], 'Social Capital': [], '8VC': [], 'Atomic': [],
+    'Village Global': [], 'Pear VC': [], 'UpWest Labs': [], 'Fifty Years': [], 'Nascent': [],
+    'Prelude Ventures': [], 'Acrew Capital': [], 'Homebrew': [], 'Shrug Capital': [], 'Founders Inc': ['F.inc'],
+    'Signal Fire': ['SignalFire'], 'Boost VC': [], 'Founder Collective': [], 'Seedcamp': [], 'Station F': [],
+    'Backed VC': [], 'LocalGlobe': [], 'Kindred Capital': [], 'Crane Venture Partners': [],
+    'Balderton Capital': [], 'Hoxton Ventures': [], 'Point Nine': [], 'Speedinvest': [], 'Pentech': [],
+    'Tech Nation': [], 'Startup Wise Guys': [], 'European Innovation Council': [], 'Rockstart': [],
+    'Founders Factory': [], 'La Famille': [], 'Startupbootcamp': [], 'Bethnal Green Ventures': [],
+    'Future Positive Capital': [], 'Alchemist Accelerator': [], 'StartupYard': [], 'Berkeley SkyDeck': [],
+    'MassChallenge': []
+}
+
+# Only matched when written exactly like this
+CASE_SENSITIVE_ALIASES = {'YC', 'EF', 'AMD', 'IBM', 'AWS'}
+
+# Names (or aliases) that are also everyday words or phrases: only trusted inside company names
+COMPANY_SCOPE_ONLY = {
+    'Apple', 'Amazon', 'Notion', 'Oracle', 'Snap', 'Block', 'Square', 'Slack', 'Zoom', 'Discord', 'Flink',
+    'Loom', 'Lemonade', 'Remote', 'Perplexity', 'Runway', 'Linear', 'Ledger', 'Factorial', 'Railway', 'Voi',
+    'Grok', 'Meta', 'Intel', 'Accel', 'Lightspeed', 'Neo', 'Atomic', 'Fifty Years', 'Nascent', 'Homebrew',
+    'First Round', 'Social Capital', 'Onstage', 'Antler', 'Cohere', 'Samsara', 'Gorillas', 'Miro', 'Tink'
+}
+
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# A pattern: (canonical name, kind, case-sensitive surface form or None, company scope only)
+Pattern = Tuple[str, str, Optional[str], bool]
+
+
+def tokenize(text: str) -> List[str]:
+    """Word and punctuation tokens; 'Checkout.com' -> ['Checkout', '.', 'com']."""
+    return TOKEN_RE.findall(text)
+
+
+class EntityMatcher:
+    """Aho-Corasick automaton over lowercased word tokens."""
+
+    def __init__(self, entity_lists: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        """
+        Args:
+            entity_lists: {kind: {canonical name: [aliases]}}. Defaults to notable companies and accelerators.
+        """
+        entity_lists = entity_lists or {'notable_companies': NOTABLE_COMPANIES, 'accelerators': ACCELERATORS}
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[Tuple[int, Pattern]]] = [[]]
+
+        for kind, entities in entity_lists.items():
+            for canonical, aliases in entities.items():
+                for surface in [canonical] + aliases:
+                    self._add_pattern(surface, (
+                        canonical,
+                        kind,
+                        surface if surface in CASE_SENSITIVE_ALIASES else None,
+                        surface in COMPANY_SCOPE_ONLY
+                    ))
+        self._build_failure_links()
+
+    def _add_pattern(self, surface: str, pattern: Pattern):
+        tokens = [token.lower() for token in tokenize(surface)]
+        state = 0
+        for token in tokens:
+            next_state = self.goto[state].get(token)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+                self.goto[state][token] = next_state
+            state = next_state
+        self.outputs[state].append((len(tokens), pattern))
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(token, 0)
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+
+    def find(self, text: str, company_scope: bool = False) -> List[Tuple[str, str]]:
+        """
+        All (canonical name, kind) matches in `text`, in order of appearance.
+
+        Args:
+            text: Text to scan
+            company_scope: True when `text` is a company name, which allows the everyday-word names
+        """
+        tokens = tokenize(text)
+        matches = []
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        state = 0
+        for index, token in enumerate(tokens):
+            token = token.lower()
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for length, (canonical, kind, case_sensitive, scope_only) in outputs[state]:
+                if scope_only and not company_scope:
+                    continue
+                if case_sensitive and ' '.join(tokens[index - length + 1:index + 1]) != case_sensitive:
+                    continue
+                matches.append((canonical, kind))
+        return matches
+
+    def tag_profile(self, profile: Dict[str, Any]) -> Dict[str, List[str]]:
+        """
+        Canonical notable companies and accelerators mentioned in a cleaned profile.
+
+        Company names (experience subtitles/titles) are matched with company scope; the
+        headline, about section, role titles and descriptions are matched as free text.
+        """
+        found: Dict[str, List[str]] = {'notable_companies': [], 'accelerators': []}
+        seen = set()
+
+        def add(matches):
+            for canonical, kind in matches:
+                if (canonical, kind) not in seen:
+                    seen.add((canonical, kind))
+                    found.setdefault(kind, []).append(canonical)
+
+        for experience in profile.get('experiences', []):
+            roles = experience.get('roles')
+            company = experience.get('title', '') if roles else (experience.get('subtitle') or '').split(' · ')[0]
+            add(self.find(company, company_scope=True))
+            for item in roles or [experience]:
+                add(self.find(item.get('title') or ''))
+                add(self.find(item.get('description') or ''))
+        add(self.find(profile.get('headline') or ''))
+        add(self.find(profile.get('about') or ''))
+        for education in profile.get('educations', []):
+            add(self.find(education.get('title') or '', company_scope=True))
+        return found
+
+    def tag_cohort(self, profiles: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, List[str]]]:
+        """tag_profile() for every profile, keyed by linkedinUrl."""
+        return {profile.get('linkedinUrl', '').strip(): self.tag_profile(profile) for profile in profiles}
+
+
+_default_matcher: Optional[EntityMatcher] = None
+
+
+def get_default_matcher() -> EntityMatcher:
+    """Matcher over the built-in lists, compiled on first use."""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = EntityMatcher()
+    return _default_matcher
+
+
+# Trait record section each matched kind is stored in
+ENTITY_FIELD_SECTIONS = {'notable_companies': 'company_background', 'accelerators': 'accelerator_and_programs'}
+
+
+def merge_entity_matches(record: Dict[str, Any], matches: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Overwrite a trait record's notable_companies and accelerators with the matched names."""
+    for name, section in ENTITY_FIELD_SECTIONS.items():
+        record.setdefault(section, {})[name] = list(matches.get(name, []))
+    return record
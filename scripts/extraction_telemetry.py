@@ -0,0 +1,183 @@
+'''
+Per-call telemetry for trait extraction.
+
+ExtractionTelemetry records one event per chat completion (model, cascade tier, prompt /
+completion / cached tokens, latency, retries, status) and one per profile finished, and
+appends each event as a line to a JSONL file, so a job's telemetry survives the process.
+get_summary() turns the events into rolling aggregates: p50/p95 latency over the most
+recent calls, tokens and estimated cost per profile, and profiles per minute overall and
+over the last few minutes.
+
+The recorder is thread-safe: extraction runs in a worker thread while the API's status
+endpoint reads summaries from the event loop.
+'''
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from model_pricing import estimate_cost, unpriced_models
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of `values` (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+class ExtractionTelemetry:
+    """Records extraction calls and profiles, optionally to a JSONL file."""
+
+    def __init__(self, path: Optional[str] = None, window: int = 200, rate_window_seconds: float = 300.0):
+        """
+        Args:
+            path: JSONL file to append events to. None keeps them in memory only.
+            window: Number of most recent calls the latency percentiles are computed over
+            rate_window_seconds: Period the recent profiles-per-minute rate is computed over
+        """
+        self.path = path
+        self.rate_window_seconds = rate_window_seconds
+        self.lock = threading.Lock()
+        self.recent_latencies: Deque[float] = deque(maxlen=window)
+        self.recent_profiles: Deque[float] = deque()
+        self.started_at: Optional[float] = None
+        self.last_event_at: Optional[float] = None
+        self.totals = {
+            'calls': 0, 'batch_calls': 0, 'errors': 0, 'retries': 0, 'profiles': 0,
+            'prompt_tokens': 0, 'completion_tokens': 0, 'cached_tokens': 0,
+            'latency_seconds': 0.0, 'estimated_cost_usd': 0.0
+        }
+        self.by_model: Dict[str, Dict[str, Any]] = {}
+        if path:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    def _write(self, event: Dict[str, Any]):
+        if self.path:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(event) + '\n')
+
+    def _apply(self, event: Dict[str, Any]):
+        """Fold one event into the aggregates (caller holds the lock)."""
+        if self.started_at is None:
+            self.started_at = event['ts']
+        self.last_event_at = event['ts']
+
+        if event['event'] == 'profile':
+            self.totals['profiles'] += 1
+            self.recent_profiles.append(event['ts'])
+            while self.recent_profiles and self.recent_profiles[0] < event['ts'] - self.rate_window_seconds:
+                self.recent_profiles.popleft()
+            return
+
+        batch = event.get('batch', False)
+        cost = estimate_cost(event['model'], event['prompt_tokens'], event['completion_tokens'], event['cached_tokens'], batch)
+        self.totals['calls'] += 1
+        self.totals['batch_calls'] += batch
+        self.totals['errors'] += event['status'] != 'ok'
+        self.totals['retries'] += event['retries']
+        for key in ('prompt_tokens', 'completion_tokens', 'cached_tokens'):
+            self.totals[key] += event[key]
+        self.totals['latency_seconds'] += event['latency_seconds']
+        self.totals['estimated_cost_usd'] += cost
+        # Batch results have no latency of their own
+        if event['status'] == 'ok' and not batch:
+            self.recent_latencies.append(event['latency_seconds'])
+
+        model_stats = self.by_model.setdefault(event['model'], {
+            'tier': event.get('tier'), 'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'estimated_cost_usd': 0.0
+        })
+        model_stats['calls'] += 1
+        model_stats['prompt_tokens'] += event['prompt_tokens']
+        model_stats['completion_tokens'] += event['completion_tokens']
+        model_stats['estimated_cost_usd'] += cost
+
+    def record_call(
+        self,
+        model: str,
+        latency_seconds: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached_tokens: int = 0,
+        retries: int = 0,
+        tier: Optional[str] = None,
+        status: str = 'ok',
+        batch: bool = False
+    ):
+        """Record one chat completion ('ok') or a call that raised ('error'). Batch results are costed at the batch discount."""
+        event = {
+            'ts': time.time(), 'event': 'call', 'model': model, 'tier': tier, 'status': status,
+            'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens, 'cached_tokens': cached_tokens,
+            'latency_seconds': round(latency_seconds, 4), 'retries': retries, 'batch': batch
+        }
+        with self.lock:
+            self._apply(event)
+            self._write(event)
+
+    def record_profile(self, profile_url: str):
+        """Record a profile whose traits were extracted (from the API, the cache or rules)."""
+        event = {'ts': time.time(), 'event': 'profile', 'profile': profile_url}
+        with self.lock:
+            self._apply(event)
+            self._write(event)
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Rolling aggregates for status reporting."""
+        with self.lock:
+            totals = dict(self.totals)
+            latencies = list(self.recent_latencies)
+            recent_profiles = len(self.recent_profiles)
+            by_model = {model: dict(stats) for model, stats in self.by_model.items()}
+            started_at, last_event_at = self.started_at, self.last_event_at
+
+        # Rates run up to the latest event, so a finished job's numbers stay put
+        elapsed_minutes = (last_event_at - started_at) / 60 if started_at else 0
+        profiles = totals['profiles']
+        total_tokens = totals['prompt_tokens'] + totals['completion_tokens']
+        for stats in by_model.values():
+            stats['estimated_cost_usd'] = round(stats['estimated_cost_usd'], 4)
+
+        return {
+            'calls': totals['calls'],
+            'errors': totals['errors'],
+            'retries': totals['retries'],
+            'profiles': profiles,
+            'latency_p50_seconds': round(percentile(latencies, 0.50), 3),
+            'latency_p95_seconds': round(percentile(latencies, 0.95), 3),
+            'avg_latency_seconds': round(totals['latency_seconds'] / (totals['calls'] - totals['batch_calls']), 3)
+            if totals['calls'] > totals['batch_calls'] else 0,
+            'batch_calls': totals['batch_calls'],
+            'prompt_tokens': totals['prompt_tokens'],
+            'completion_tokens': totals['completion_tokens'],
+            'cached_tokens': totals['cached_tokens'],
+            'tokens_per_profile': round(total_tokens / profiles, 1) if profiles else 0,
+            'estimated_cost_usd': round(totals['estimated_cost_usd'], 4),
+            # Costed at zero, so estimated_cost_usd leaves them out
+            'unpriced_models': unpriced_models(by_model),
+            'cost_per_profile_usd': round(totals['estimated_cost_usd'] / profiles, 5) if profiles else 0,
+            'profiles_per_min': round(profiles / elapsed_minutes, 2) if elapsed_minutes else 0,
+            'recent_profiles_per_min': round(recent_profiles / (min(elapsed_minutes * 60, self.rate_window_seconds) / 60), 2)
+            if elapsed_minutes else 0,
+            'by_model': by_model
+        }
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> 'ExtractionTelemetry':
+        """Rebuild a recorder from a job's JSONL file, e.g. for a finished job's status. New events append to it."""
+        telemetry = cls(path, **kwargs)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line cut off by a crash mid-write
+                        continue
+                    telemetry._apply(event)
+        return telemetry
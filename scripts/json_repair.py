@@ -0,0 +1,247 @@
+'''
+Tolerant JSON parsing for LLM responses.
+
+repair_json() first tries plain json.loads, then applies the cheapest fix that makes the
+response parse, recording each one:
+
+ - stripped_fences:        ```json ... ``` markdown fences (closed or not)
+ - stripped_prose_prefix:  "Here is the JSON: {...}"
+ - stripped_prose_suffix:  "{...} Let me know if you need anything else"
+ - removed_trailing_commas: {"a": [1, 2,],}
+ - closed_truncated:       output cut off at max_tokens; unfinished strings are closed, a
+                           dangling key or comma is dropped and open objects/arrays are closed
+
+Anything else (e.g. unquoted keys in an otherwise complete object) raises JSONRepairError,
+a json.JSONDecodeError, so the caller can fall back to re-requesting.
+
+Run this module directly to check the parser against REPAIR_CORPUS.
+'''
+
+import json
+import re
+import sys
+from typing import Any, List, Optional, Tuple
+
+FENCE_RE = re.compile(r'```(?:json|JSON)?\s*(.*?)(?:```|$)', re.DOTALL)
+
+# How far back from the end to look for a cut point when closing a truncated response
+MAX_TRUNCATION_ATTEMPTS = 200
+
+
+class JSONRepairError(json.JSONDecodeError):
+    """Raised when a response can't be repaired into valid JSON."""
+
+
+def _decode_prefix(text: str) -> Tuple[Any, str]:
+    """Parse the first JSON value in `text`, returning it and whatever follows it."""
+    value, end = json.JSONDecoder().raw_decode(text)
+    return value, text[end:]
+
+
+def remove_trailing_commas(text: str) -> str:
+    """Drop commas that directly precede a closing } or ], ignoring string contents."""
+    out = []
+    in_string = escaped = False
+    length = len(text)
+    for index, char in enumerate(text):
+        if in_string:
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char == ',':
+            next_index = index + 1
+            while next_index < length and text[next_index] in ' \t\r\n':
+                next_index += 1
+            if next_index < length and text[next_index] in '}]':
+                continue
+        out.append(char)
+    return ''.join(out)
+
+
+def _scan_structure(text: str) -> Tuple[List[Tuple[int, str]], str, bool, bool]:
+    """
+    Walk `text` outside of strings.
+
+    Returns:
+        (cut points, open-container stack at the end, ends inside a string, ends after an escape)
+        Cut points are (position, stack there) just before each comma and just after each
+        opening bracket, i.e. places where the text can be cut and closed.
+    """
+    stack = []
+    cut_points = []
+    in_string = escaped = False
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append(char)
+            cut_points.append((index + 1, ''.join(stack)))
+        elif char in '}]':
+            if stack:
+                stack.pop()
+        elif char == ',':
+            cut_points.append((index, ''.join(stack)))
+    return cut_points, ''.join(stack), in_string, escaped
+
+
+def _closers(stack: str) -> str:
+    return ''.join('}' if opener == '{' else ']' for opener in reversed(stack))
+
+
+def close_truncated(text: str) -> Optional[Any]:
+    """
+    Parse a response that was cut off mid-value, keeping as much as possible.
+
+    Returns:
+        The parsed value, or None if `text` isn't truncated JSON (every container is closed)
+        or no cut point makes it parse
+    """
+    cut_points, stack, in_string, escaped = _scan_structure(text)
+    if not stack:
+        return None
+
+    # First keep everything, closing an unfinished string value
+    if in_string:
+        candidate = text[:-1] if escaped else text
+        try:
+            return json.loads(candidate + '"' + _closers(stack))
+        except json.JSONDecodeError:
+            pass
+    else:
+        try:
+            return json.loads(remove_trailing_commas(text.rstrip() + _closers(stack)))
+        except json.JSONDecodeError:
+            pass
+
+    # Otherwise drop the unfinished member: cut back to the last comma or opening bracket
+    for position, stack_there in reversed(cut_points[-MAX_TRUNCATION_ATTEMPTS:]):
+        try:
+            return json.loads(text[:position] + _closers(stack_there))
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def repair_json(text: str) -> Tuple[Any, List[str]]:
+    """
+    Parse an LLM response as JSON, repairing it if needed.
+
+    Returns:
+        (parsed value, list of repairs applied; empty if the text was valid JSON)
+
+    Raises:
+        JSONRepairError: if no repair makes the text parse
+    """
+    text = (text or '').strip()
+    try:
+        return json.loads(text), []
+    except json.JSONDecodeError:
+        pass
+
+    repairs = []
+    fence = FENCE_RE.search(text)
+    if fence:
+        text = fence.group(1).strip()
+        repairs.append('stripped_fences')
+
+    starts = [index for index in (text.find('{'), text.find('[')) if index != -1]
+    if not starts:
+        raise JSONRepairError('No JSON object found in response', text, 0)
+    start = min(starts)
+    if start > 0:
+        text = text[start:]
+        repairs.append('stripped_prose_prefix')
+
+    for candidate, repair in ((text, None), (remove_trailing_commas(text), 'removed_trailing_commas')):
+        if repair and candidate == text:
+            continue
+        try:
+            value, rest = _decode_prefix(candidate)
+        except json.JSONDecodeError:
+            continue
+        if repair:
+            repairs.append(repair)
+        if rest.strip():
+            repairs.append('stripped_prose_suffix')
+        return value, repairs
+
+    value = close_truncated(text)
+    if value is None:
+        raise JSONRepairError('Response is not valid JSON and could not be repaired', text, 0)
+    repairs.append('closed_truncated')
+    return value, repairs
+
+
+# (name, response text, expected value or None if it must be rejected)
+REPAIR_CORPUS: List[Tuple[str, str, Any]] = [
+    ('valid', '{"full_name": "Ada", "age": 30}', {'full_name': 'Ada', 'age': 30}),
+    ('json_fence', '```json\n{"full_name": "Ada"}\n```', {'full_name': 'Ada'}),
+    ('bare_fence', '```\n{"full_name": "Ada"}\n```', {'full_name': 'Ada'}),
+    ('unclosed_fence', '```json\n{"full_name": "Ada"}', {'full_name': 'Ada'}),
+    ('prose_prefix', 'Here is the extracted JSON:\n{"full_name": "Ada"}', {'full_name': 'Ada'}),
+    ('prose_suffix', '{"full_name": "Ada"}\n\nLet me know if you need anything else!', {'full_name': 'Ada'}),
+    ('prose_both', 'Sure! {"full_name": "Ada"} Hope this helps.', {'full_name': 'Ada'}),
+    ('fence_in_prose', 'Result:\n```json\n{"a": 1}\n```\nDone.', {'a': 1}),
+    ('trailing_comma_object', '{"a": 1, "b": 2,}', {'a': 1, 'b': 2}),
+    ('trailing_comma_array', '{"a": [1, 2, ], "b": {"c": 3,},}', {'a': [1, 2], 'b': {'c': 3}}),
+    ('comma_inside_string_kept', '{"a": "x,}", "b": [1,],}', {'a': 'x,}', 'b': [1]}),
+    ('prompt_style_trailing_comma', '{"research_and_academic": {"academic_roles": ["Researcher"],}}',
+     {'research_and_academic': {'academic_roles': ['Researcher']}}),
+    ('truncated_in_string', '{"full_name": "Ada", "career_summary": "CEO at Nova for 3 yrs; VP at',
+     {'full_name': 'Ada', 'career_summary': 'CEO at Nova for 3 yrs; VP at'}),
+    ('truncated_after_key', '{"full_name": "Ada", "estimated_age":', {'full_name': 'Ada'}),
+    ('truncated_mid_key', '{"full_name": "Ada", "estim', {'full_name': 'Ada'}),
+    ('truncated_after_comma', '{"a": 1, "b": [1, 2],', {'a': 1, 'b': [1, 2]}),
+    ('truncated_in_array', '{"a": {"list": ["x", "y", "z', {'a': {'list': ['x', 'y', 'z']}}),
+    ('truncated_in_number', '{"a": 1, "b": 2.', {'a': 1}),
+    ('truncated_in_literal', '{"a": 1, "b": tr', {'a': 1}),
+    ('truncated_after_escape', '{"a": "line\\', {'a': 'line'}),
+    ('truncated_nested', '{"education_stages": {"undergraduate": "Oxford - BA", "masters": null}, "career_insights": {"job_hopper": false, "total_',
+     {'education_stages': {'undergraduate': 'Oxford - BA', 'masters': None}, 'career_insights': {'job_hopper': False}}),
+    ('truncated_packed_array', '{"profiles": [{"full_name": "Ada"}, {"full_name": "Bo', {'profiles': [{'full_name': 'Ada'}, {'full_name': 'Bo'}]}),
+    ('fenced_truncated', '```json\n{"a": [1, 2', {'a': [1, 2]}),
+    ('empty', '', None),
+    ('prose_only', 'I cannot help with that request.', None),
+    ('unquoted_keys', '{full_name: "Ada"}', None),
+    ('complete_but_broken', '{"a": 1 "b": 2}', None),
+]
+
+
+def run_corpus() -> List[str]:
+    """Check repair_json against REPAIR_CORPUS. Returns a description of each mismatch."""
+    failures = []
+    for name, text, expected in REPAIR_CORPUS:
+        try:
+            value, _ = repair_json(text)
+        except JSONRepairError:
+            if expected is not None:
+                failures.append(f"{name}: rejected, expected {expected!r}")
+            continue
+        if expected is None:
+            failures.append(f"{name}: repaired to {value!r}, expected rejection")
+        elif value != expected:
+            failures.append(f"{name}: got {value!r}, expected {expected!r}")
+    return failures
+
+
+if __name__ == "__main__":
+    mismatches = run_corpus()
+    for mismatch in mismatches:
+        print(f"✗ {mismatch}")
+    print(f"{len(REPAIR_CORPUS) - len(mismatches)}/{len(REPAIR_CORPUS)} corpus cases passed")
+    sys.exit(1 if mismatches else 0)
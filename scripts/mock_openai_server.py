@@ -0,0 +1,381 @@
+'''
+Local stand-in for the OpenAI chat-completions endpoint, for load-testing the trait stage.
+
+MockOpenAIServer answers POST /v1/chat/completions like the real API: a chat completion
+body with usage, and x-ratelimit-* headers. Each response is built from the request:
+
+ - Latency comes from a configurable distribution (fixed, uniform, normal or lognormal)
+   plus an optional time per output token. That way smaller responses come back sooner,
+   as they do from the real model.
+ - Some requests fail on purpose: 429s with a Retry-After header, 500s, and 200s whose
+   content is malformed (markdown fences, surrounding prose, trailing commas or truncation).
+ - Canned answers come from the profile in the user message. They follow the request's
+   json_schema response_format, and packed requests get one record per profile.
+
+Point an extractor at it with LinkedInTraitExtractor(base_url=server.base_url). Any API
+key works. Then concurrency, retries, the rate governor and the response cache can be
+measured offline at no cost. GET /stats returns what the server has served.
+
+Usage:
+    python mock_openai_server.py --port 8090 --latency lognormal --latency-mean 2.0 --rate-limit-rate 0.05
+    python mock_openai_server.py --load-test 200 --concurrency 16 --latency-mean 0.5
+'''
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+from batch_backend import _unknown_value
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'normal', 'lognormal')
+MALFORMATIONS = ('fences', 'prose', 'trailing_comma', 'truncated')
+
+# Reported to clients in x-ratelimit-* headers
+MOCK_RPM_LIMIT = 10000
+MOCK_TPM_LIMIT = 10000000
+
+
+def _profile_answer(profile: Dict[str, Any], schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """A plausible trait record for `profile`, conforming to `schema` when there is one."""
+    answer = _unknown_value(schema) if schema else {}
+    properties = (schema or {}).get('properties')
+
+    def put(section: str, name: str, value: Any):
+        if isinstance(answer.get(section), dict) and (properties is None or name in properties[section]['properties']):
+            answer[section][name] = value
+
+    experiences = profile.get('experiences') or []
+    educations = profile.get('educations') or []
+    headline = profile.get('headline') or ''
+    hints = profile.get('entityHints') or {}
+    if educations:
+        put('education_stages', 'undergraduate', educations[0].get('title'))
+    put('career_insights', 'total_experience_count', len(experiences))
+    put('career_insights', 'career_summary', headline or '-1')
+    put('company_background', 'notable_companies', list(hints.get('notable_companies', [])))
+    put('accelerator_and_programs', 'accelerators', list(hints.get('accelerators', [])))
+    put('personal_brand', 'headline_keywords', [word for word in headline.replace('|', ' ').split() if len(word) > 3][:5])
+
+    answer.update({
+        'full_name': profile.get('fullName', 'Unknown'),
+        'linkedin_url': profile.get('linkedinUrl', 'not found'),
+        'confidence_score': 'Medium'
+    })
+    if properties is not None:
+        answer = {key: value for key, value in answer.items() if key in properties}
+    return answer
+
+
+def profile_responder(request_body: Dict[str, Any]) -> str:
+    """
+    Default responder: a trait record built from the profile in the user message.
+
+    Single-profile requests get one record. Packed requests (a JSON array of profiles)
+    get {"profiles": [...]}.
+    """
+    profiles: Any = {}
+    for message in request_body.get('messages', []):
+        if message.get('role') == 'user':
+            try:
+                profiles = json.loads(message.get('content') or '{}')
+            except json.JSONDecodeError:
+                profiles = {}
+
+    schema = (request_body.get('response_format') or {}).get('json_schema', {}).get('schema')
+    if isinstance(profiles, list):
+        item_schema = schema['properties']['profiles']['items'] if schema else None
+        return json.dumps({'profiles': [_profile_answer(profile, item_schema) for profile in profiles]})
+    return json.dumps(_profile_answer(profiles if isinstance(profiles, dict) else {}, schema))
+
+
+def malform(content: str, kind: str) -> str:
+    """`content` broken the way model output sometimes is."""
+    if kind == 'fences':
+        return f"```json\n{content}\n```"
+    if kind == 'prose':
+        return f"Here are the extracted traits:\n{content}\nLet me know if you need anything else."
+    if kind == 'trailing_comma':
+        return content[:-1] + ',}' if content.endswith('}') else content
+    return content[:max(1, int(len(content) * 0.7))]
+
+
+class MockOpenAIServer:
+    """Threaded HTTP server answering chat completions with simulated latency and failures."""
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: str = 'fixed',
+        latency_mean: float = 0.2,
+        latency_jitter: float = 0.5,
+        seconds_per_output_token: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        server_error_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        responder: Optional[Callable[[Dict[str, Any]], str]] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free one (see base_url)
+            latency: Latency distribution: 'fixed', 'uniform', 'normal' or 'lognormal'
+            latency_mean: Mean response latency in seconds
+            latency_jitter: Spread relative to the mean ('uniform': +/- this fraction,
+                'normal': standard deviation as a fraction of the mean, 'lognormal': sigma)
+            seconds_per_output_token: Extra latency per completion token (~4 characters each)
+            rate_limit_rate: Fraction of requests answered with a 429
+            retry_after: Retry-After seconds sent with 429s
+            server_error_rate: Fraction of requests answered with a 500
+            malformed_rate: Fraction of successful responses with malformed JSON content
+            responder: Function from request body to message content. Defaults to profile_responder.
+            seed: Seed for latency and failure injection
+        """
+        if latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency must be one of {LATENCY_DISTRIBUTIONS}, got {latency!r}")
+        self.latency = latency
+        self.latency_mean = latency_mean
+        self.latency_jitter = latency_jitter
+        self.seconds_per_output_token = seconds_per_output_token
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.server_error_rate = server_error_rate
+        self.malformed_rate = malformed_rate
+        self.responder = responder or profile_responder
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'completions': 0, 'rate_limited': 0, 'server_errors': 0, 'malformed': 0,
+                      'prompt_tokens': 0, 'completion_tokens': 0}
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """OpenAI base_url for clients of this server."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> 'MockOpenAIServer':
+        """Serve in a background thread."""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self) -> 'MockOpenAIServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.stats)
+
+    def sample_latency(self) -> float:
+        """Seconds to wait before answering, drawn from the latency distribution."""
+        mean, jitter = self.latency_mean, self.latency_jitter
+        with self.lock:
+            if self.latency == 'uniform':
+                return self.random.uniform(mean * (1 - jitter), mean * (1 + jitter))
+            if self.latency == 'normal':
+                return max(0.0, self.random.gauss(mean, mean * jitter))
+            if self.latency == 'lognormal':
+                # mu chosen so the distribution's mean is latency_mean
+                return self.random.lognormvariate(math.log(mean) - jitter ** 2 / 2, jitter) if mean > 0 else 0.0
+            return mean
+
+    def draw_outcome(self) -> str:
+        """'rate_limited', 'server_error', 'malformed' or 'ok' for the next request."""
+        with self.lock:
+            draw = self.random.random()
+            malformed = self.random.random() < self.malformed_rate
+            kind = self.random.choice(MALFORMATIONS)
+        if draw < self.rate_limit_rate:
+            return 'rate_limited'
+        if draw < self.rate_limit_rate + self.server_error_rate:
+            return 'server_error'
+        return f'malformed:{kind}' if malformed else 'ok'
+
+    def count(self, **increments: int):
+        with self.lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+
+    def rate_limit_headers(self) -> Dict[str, str]:
+        return {
+            'x-ratelimit-limit-requests': str(MOCK_RPM_LIMIT),
+            'x-ratelimit-remaining-requests': str(MOCK_RPM_LIMIT - 1),
+            'x-ratelimit-limit-tokens': str(MOCK_TPM_LIMIT),
+            'x-ratelimit-remaining-tokens': str(MOCK_TPM_LIMIT - 1)
+        }
+
+    def complete(self, body: Dict[str, Any]):
+        """(status code, headers, response body) for one chat-completions request."""
+        self.count(requests=1)
+        outcome = self.draw_outcome()
+        latency = self.sample_latency()
+
+        if outcome == 'rate_limited':
+            self.count(rate_limited=1)
+            headers = {**self.rate_limit_headers(), 'retry-after': str(self.retry_after), 'x-ratelimit-remaining-requests': '0'}
+            return 429, headers, {'error': {'message': 'Rate limit reached (mock)', 'type': 'requests', 'code': 'rate_limit_exceeded'}}
+        if outcome == 'server_error':
+            time.sleep(latency)
+            self.count(server_errors=1)
+            return 500, {}, {'error': {'message': 'The server had an error (mock)', 'type': 'server_error', 'code': None}}
+
+        content = self.responder(body)
+        finish_reason = 'stop'
+        if outcome.startswith('malformed:'):
+            kind = outcome.split(':', 1)[1]
+            content = malform(content, kind)
+            finish_reason = 'length' if kind == 'truncated' else 'stop'
+            self.count(malformed=1)
+
+        prompt_tokens = len(json.dumps(body.get('messages', []))) // 4
+        completion_tokens = max(1, len(content) // 4)
+        time.sleep(latency + completion_tokens * self.seconds_per_output_token)
+        self.count(completions=1, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        return 200, self.rate_limit_headers(), {
+            'id': f"chatcmpl-mock-{uuid.uuid4().hex[:12]}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'gpt-4o-mini'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content, 'refusal': None},
+                'finish_reason': finish_reason
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens,
+                'prompt_tokens_details': {'cached_tokens': 0}
+            }
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def send_json(self, status: int, headers: Dict[str, str], payload: Dict[str, Any]):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                if self.path.rstrip('/') != '/v1/chat/completions':
+                    self.send_json(404, {}, {'error': {'message': f'Unknown path {self.path}'}})
+                    return
+                try:
+                    body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                except json.JSONDecodeError:
+                    self.send_json(400, {}, {'error': {'message': 'Request body is not JSON'}})
+                    return
+                self.send_json(*server.complete(body))
+
+            def do_GET(self):
+                if self.path.rstrip('/') == '/stats':
+                    self.send_json(200, {}, server.get_stats())
+                else:
+                    self.send_json(404, {}, {'error': {'message': f'Unknown path {self.path}'}})
+
+            def log_message(self, format, *args):
+                # Thousands of requests per load test; the stats endpoint has the totals
+                pass
+
+        return Handler
+
+
+def run_load_test(server: MockOpenAIServer, profile_count: int, concurrency: int, seed: int = 42) -> Dict[str, Any]:
+    """Extract synthetic profiles concurrently against `server` and return the telemetry summary."""
+    from data_cleaner import LinkedInDataProcessor
+    from profile_generator import generate_profiles
+    from trait_extractor import LinkedInTraitExtractor
+
+    processor = LinkedInDataProcessor()
+    profiles = [processor.process_single_profile(profile) for profile in generate_profiles(profile_count, seed)]
+    extractor = LinkedInTraitExtractor(api_key='mock', base_url=server.base_url, use_response_cache=False, escalation_model=None)
+    start = time.perf_counter()
+    results = extractor.extract_traits_from_profiles_concurrent(profiles, max_concurrency=concurrency)
+    return {
+        'profiles': len(profiles),
+        'extracted': len(results),
+        'seconds': round(time.perf_counter() - start, 2),
+        'telemetry': extractor.telemetry.get_summary(),
+        'response_stats': extractor.response_stats
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mock OpenAI chat-completions server for offline load tests')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency', choices=LATENCY_DISTRIBUTIONS, default='lognormal', help='Latency distribution')
+    parser.add_argument('--latency-mean', type=float, default=1.0, help='Mean latency in seconds')
+    parser.add_argument('--latency-jitter', type=float, default=0.5, help='Latency spread (see MockOpenAIServer)')
+    parser.add_argument('--seconds-per-output-token', type=float, default=0.0, help='Extra latency per completion token')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--server-error-rate', type=float, default=0.0, help='Fraction of requests answered with 500')
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help='Fraction of responses with malformed JSON')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for latency and failure injection')
+    parser.add_argument('--load-test', type=int, default=0, metavar='N',
+                        help='Instead of serving, extract N synthetic profiles against the server and print the results')
+    parser.add_argument('--concurrency', type=int, default=8, help='max_concurrency for --load-test')
+    args = parser.parse_args()
+
+    server = MockOpenAIServer(
+        host=args.host,
+        port=0 if args.load_test else args.port,
+        latency=args.latency,
+        latency_mean=args.latency_mean,
+        latency_jitter=args.latency_jitter,
+        seconds_per_output_token=args.seconds_per_output_token,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        server_error_rate=args.server_error_rate,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed
+    )
+
+    if args.load_test:
+        with server:
+            results = run_load_test(server, args.load_test, args.concurrency)
+            results['server'] = server.get_stats()
+        print("\n=== MOCK LOAD TEST ===")
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"🧪 Mock OpenAI server on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"Served: {server.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+'''
+OpenAI model prices, for estimating what extraction runs cost.
+
+Prices are USD per 1M tokens (standard tier, as listed on openai.com/api/pricing). Cached
+input tokens are billed at the cached rate instead of the input rate. Batch API requests
+cost half. Unknown models are costed at zero; unpriced_models() lists them so cost reports
+can say their totals are incomplete.
+'''
+
+from typing import Dict, Iterable, List, Optional
+
+MODEL_PRICING: Dict[str, Dict[str, float]] = {
+    'gpt-4o-mini': {'input': 0.15, 'cached_input': 0.075, 'output': 0.60},
+    'gpt-4o': {'input': 2.50, 'cached_input': 1.25, 'output': 10.00},
+    'gpt-4.1': {'input': 2.00, 'cached_input': 0.50, 'output': 8.00},
+    'gpt-4.1-mini': {'input': 0.40, 'cached_input': 0.10, 'output': 1.60},
+    'gpt-4.1-nano': {'input': 0.10, 'cached_input': 0.025, 'output': 0.40},
+    'o4-mini': {'input': 1.10, 'cached_input': 0.275, 'output': 4.40}
+}
+
+BATCH_DISCOUNT = 0.5
+
+
+def get_pricing(model: str) -> Optional[Dict[str, float]]:
+    """Prices for `model`, also matching dated snapshots like 'gpt-4o-2024-08-06'."""
+    if model in MODEL_PRICING:
+        return MODEL_PRICING[model]
+    # Longest name first so 'gpt-4o-mini-2024-07-18' doesn't match 'gpt-4o'
+    for name in sorted(MODEL_PRICING, key=len, reverse=True):
+        if model.startswith(name + '-'):
+            return MODEL_PRICING[name]
+    return None
+
+
+def unpriced_models(models: Iterable[str]) -> List[str]:
+    """The models in `models` with no known price, whose cost estimate_cost() counts as zero."""
+    return sorted({model for model in models if get_pricing(model) is None})
+
+
+def estimate_cost(
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    cached_tokens: int = 0,
+    batch: bool = False
+) -> float:
+    """
+    Estimated USD cost of the given token usage.
+
+    Args:
+        model: Model name
+        prompt_tokens: Input tokens, including cached ones (as reported in usage.prompt_tokens)
+        completion_tokens: Output tokens
+        cached_tokens: Input tokens served from the prompt cache
+        batch: Whether the requests went through the Batch API
+    """
+    pricing = get_pricing(model)
+    if pricing is None:
+        return 0.0
+    cost = (
+        (prompt_tokens - cached_tokens) * pricing['input']
+        + cached_tokens * pricing['cached_input']
+        + completion_tokens * pricing['output']
+    ) / 1_000_000
+    return cost * BATCH_DISCOUNT if batch else cost
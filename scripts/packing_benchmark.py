@@ -0,0 +1,117 @@
+'''
+Benchmark for packed trait extraction (several profiles per OpenAI request).
+
+For each pack size K it extracts the same profiles with extract_traits_from_profile_pack and
+reports prompt/completion tokens per profile, wall latency per profile and how many profiles
+fell back to single calls. The response cache is disabled so every K pays for its own calls.
+
+--estimate skips the API entirely and reports the estimated prompt tokens per profile
+(~4 characters per token), which shows how much of each request is the system prompt.
+
+Usage:
+    python packing_benchmark.py --input cleaned-profile-data/S25Top100cleaned_linkedin_data.json --profiles 16
+    python packing_benchmark.py --count 16 --estimate
+'''
+
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List
+
+from data_cleaner import LinkedInDataProcessor
+from profile_generator import generate_profiles
+from trait_extractor import LinkedInTraitExtractor
+
+
+def estimate_pack(extractor: LinkedInTraitExtractor, profiles: List[Dict[str, Any]], pack_size: int) -> Dict[str, Any]:
+    """Estimated prompt tokens per profile at this pack size, without calling the API."""
+    prompt_tokens = 0
+    requests = 0
+    for start in range(0, len(profiles), pack_size):
+        pack = profiles[start:start + pack_size]
+        kwargs = extractor.build_packed_request_kwargs(pack) if len(pack) > 1 else extractor.build_request_kwargs(pack[0])
+        prompt_tokens += extractor.rate_governor.estimate_tokens(kwargs) - kwargs['max_tokens']
+        requests += 1
+    return {
+        'pack_size': pack_size,
+        'requests': requests,
+        'est_prompt_tokens_per_profile': round(prompt_tokens / len(profiles), 1)
+    }
+
+
+def benchmark_pack(profiles: List[Dict[str, Any]], pack_size: int) -> Dict[str, Any]:
+    """Extract every profile at this pack size and report tokens and latency per profile."""
+    extractor = LinkedInTraitExtractor(use_response_cache=False)
+    extracted = 0
+    start_time = time.perf_counter()
+    for start in range(0, len(profiles), pack_size):
+        results = extractor.extract_traits_from_profile_pack(profiles[start:start + pack_size])
+        extracted += sum(1 for traits in results.values() if traits)
+    seconds = time.perf_counter() - start_time
+
+    usage = extractor.usage_stats
+    return {
+        'pack_size': pack_size,
+        'profiles': len(profiles),
+        'extracted': extracted,
+        'requests': usage['requests'],
+        'fallbacks': extractor.packing_stats['fallbacks'],
+        'prompt_tokens_per_profile': round(usage['prompt_tokens'] / len(profiles), 1),
+        'completion_tokens_per_profile': round(usage['completion_tokens'] / len(profiles), 1),
+        'total_tokens_per_profile': round((usage['prompt_tokens'] + usage['completion_tokens']) / len(profiles), 1),
+        'seconds_per_profile': round(seconds / len(profiles), 3)
+    }
+
+
+def load_profiles(args) -> List[Dict[str, Any]]:
+    """Cleaned profiles from --input, or freshly cleaned synthetic ones."""
+    if args.input:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            profiles = json.load(f)
+    else:
+        processor = LinkedInDataProcessor()
+        profiles = [processor.process_single_profile(profile) for profile in generate_profiles(args.count, args.seed)]
+    profiles = [profile for profile in profiles if profile.get('linkedinUrl', '').strip()]
+    return profiles[:args.profiles] if args.profiles else profiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark packed trait extraction for K profiles per request')
+    parser.add_argument('--input', help='Cleaned profiles JSON. Defaults to synthetic profiles.')
+    parser.add_argument('--count', type=int, default=16, help='Synthetic profiles to generate when no --input')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for synthetic profiles')
+    parser.add_argument('--profiles', type=int, default=16, help='Profiles to extract per pack size (0 for all)')
+    parser.add_argument('--pack-sizes', type=int, nargs='+', default=list(range(1, 9)), help='Pack sizes K to try')
+    parser.add_argument('--estimate', action='store_true', help='Only estimate prompt tokens, no API calls')
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    args = parser.parse_args()
+
+    profiles = load_profiles(args)
+    print(f"Benchmarking {len(profiles)} profiles at pack sizes {args.pack_sizes}")
+
+    results = []
+    if args.estimate:
+        extractor = LinkedInTraitExtractor(use_response_cache=False)
+        for pack_size in args.pack_sizes:
+            result = estimate_pack(extractor, profiles, pack_size)
+            results.append(result)
+            print(f"K={pack_size}: {result['requests']} requests, ~{result['est_prompt_tokens_per_profile']} prompt tokens/profile")
+    else:
+        for pack_size in args.pack_sizes:
+            result = benchmark_pack(profiles, pack_size)
+            results.append(result)
+            print(f"K={pack_size}: {result['total_tokens_per_profile']} tokens/profile "
+                  f"({result['prompt_tokens_per_profile']} prompt, {result['completion_tokens_per_profile']} completion), "
+                  f"{result['seconds_per_profile']}s/profile, {result['fallbacks']} fallbacks, "
+                  f"{result['extracted']}/{result['profiles']} extracted")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print("Saved to:", args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+'''
+Near-duplicate detection for cleaned profiles, with MinHash and locality-sensitive hashing.
+
+The same founder sometimes shows up twice in a cohort: under an old and a new vanity URL,
+or as two scrapes of almost the same profile. Each copy would otherwise pay for its own
+trait extraction and could end up with conflicting Airtable values.
+
+Each profile's text (name, headline, about, roles, education) is cut into word 3-gram
+shingles, and each shingle is hashed into a MinHash signature of NUM_PERM values. The
+signatures are split into bands. Profiles that share any band are candidates, and
+candidates whose estimated Jaccard similarity reaches the threshold become one cluster.
+Similar text alone isn't enough: co-founders often share the same company blurb as their
+about and role descriptions. A pair is only merged when the normalized names match, or when
+both profiles list the same education. Profiles with too little text to judge are never
+clustered.
+
+find_duplicate_clusters() returns the clusters. LinkedInTraitExtractor(dedupe_profiles=True)
+extracts one representative per cluster and copies its traits to the rest.
+
+Usage:
+    python profile_dedup.py --input cleaned-profile-data/S25Top100cleaned_linkedin_data.json
+'''
+
+import argparse
+import json
+import re
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+WORD_RE = re.compile(r'\w+')
+
+# Hash functions per signature, and how they are banded: 16 bands of 8 rows make pairs with
+# Jaccard similarity around 0.7 and up land in a shared bucket
+NUM_PERM = 128
+BANDS = 16
+
+_MASK_32 = np.uint64(0xFFFFFFFF)
+
+
+def profile_text(profile: Dict[str, Any]) -> str:
+    """The text of a cleaned profile that identifies its person, without the URL."""
+    parts = [profile.get('fullName'), profile.get('headline'), profile.get('about')]
+    for experience in profile.get('experiences', []):
+        parts += [experience.get('title'), experience.get('subtitle'), experience.get('description')]
+        for role in experience.get('roles', []):
+            parts += [role.get('title'), role.get('description')]
+    for education in profile.get('educations', []):
+        parts += [education.get('title'), education.get('subtitle')]
+    return ' '.join(part for part in parts if isinstance(part, str))
+
+
+def normalize_text(text: Any) -> str:
+    """Lowercased words of `text` joined by single spaces, or '' for non-strings."""
+    return ' '.join(WORD_RE.findall(text.lower())) if isinstance(text, str) else ''
+
+
+def same_person(first: Dict[str, Any], second: Dict[str, Any]) -> bool:
+    """Whether two profiles with near-identical text can be the same person: same name, or same education."""
+    first_name = normalize_text(first.get('fullName'))
+    if first_name and first_name == normalize_text(second.get('fullName')):
+        return True
+    first_education = sorted(normalize_text(education.get('title')) for education in first.get('educations', []))
+    second_education = sorted(normalize_text(education.get('title')) for education in second.get('educations', []))
+    return any(first_education) and first_education == second_education
+
+
+def shingles(text: str, size: int = 3) -> set:
+    """Word `size`-grams of lowercased text."""
+    words = WORD_RE.findall(text.lower())
+    return {' '.join(words[index:index + size]) for index in range(max(len(words) - size + 1, 0))}
+
+
+class MinHashLSH:
+    """MinHash signatures and a banded LSH index over them."""
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: (a * x + b) mod 2^64, top 32 bits. a must be odd.
+        self.a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set: set) -> np.ndarray:
+        """MinHash signature (uint32 per hash function) of a non-empty shingle set."""
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingle_set), dtype=np.uint64, count=len(shingle_set))
+        with np.errstate(over='ignore'):
+            permuted = (self.a[:, None] * hashes[None, :] + self.b[:, None]) >> np.uint64(32)
+        return (permuted & _MASK_32).min(axis=1).astype(np.uint32)
+
+    def candidate_pairs(self, signatures: Dict[int, np.ndarray]) -> set:
+        """Pairs of ids whose signatures share at least one band."""
+        pairs = set()
+        for band in range(self.bands):
+            buckets = defaultdict(list)
+            for item_id, signature in signatures.items():
+                buckets[signature[band * self.rows:(band + 1) * self.rows].tobytes()].append(item_id)
+            for members in buckets.values():
+                for index, first in enumerate(members):
+                    for second in members[index + 1:]:
+                        pairs.add((first, second))
+        return pairs
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the two signatures' shingle sets."""
+        return float(np.mean(first == second))
+
+
+def find_duplicate_clusters(
+    profiles: List[Dict[str, Any]],
+    threshold: float = 0.8,
+    min_shingles: int = 20,
+    index: Optional[MinHashLSH] = None
+) -> List[List[int]]:
+    """
+    Clusters of near-duplicate profiles, as lists of indices into `profiles`.
+
+    Only clusters of two or more are returned. The first index in each cluster is the
+    profile with the most text, which is the one to extract. Pairs are only joined when
+    same_person() agrees, so profiles sharing boilerplate text stay apart.
+
+    Args:
+        profiles: Cleaned profiles
+        threshold: Minimum estimated Jaccard similarity of two profiles' shingles
+        min_shingles: Profiles with fewer shingles than this are never clustered
+        index: MinHash/LSH settings. Defaults to NUM_PERM hashes in BANDS bands.
+    """
+    index = index or MinHashLSH()
+    shingle_counts = {}
+    signatures = {}
+    for position, profile in enumerate(profiles):
+        profile_shingles = shingles(profile_text(profile))
+        if len(profile_shingles) >= min_shingles:
+            shingle_counts[position] = len(profile_shingles)
+            signatures[position] = index.signature(profile_shingles)
+
+    parent = {position: position for position in signatures}
+
+    def find(position: int) -> int:
+        while parent[position] != position:
+            parent[position] = parent[parent[position]]
+            position = parent[position]
+        return position
+
+    for first, second in index.candidate_pairs(signatures):
+        if index.similarity(signatures[first], signatures[second]) >= threshold and same_person(profiles[first], profiles[second]):
+            parent[find(first)] = find(second)
+
+    clusters = defaultdict(list)
+    for position in signatures:
+        clusters[find(position)].append(position)
+    return [
+        sorted(members, key=lambda position: (-shingle_counts[position], position))
+        for members in clusters.values() if len(members) > 1
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find near-duplicate profiles in a cleaned profiles file')
+    parser.add_argument('--input', required=True, help='Cleaned profiles JSON')
+    parser.add_argument('--threshold', type=float, default=0.8, help='Minimum estimated Jaccard similarity')
+    parser.add_argument('--output', help='Optional JSON file for the clusters (lists of LinkedIn URLs)')
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        profiles = json.load(f)
+    clusters = find_duplicate_clusters(profiles, args.threshold)
+
+    # ~4 characters per token, profile JSON only (the system prompt and completion are on top)
+    tokens_saved = sum(len(json.dumps(profiles[position])) // 4 for cluster in clusters for position in cluster[1:])
+    print(f"\n=== NEAR-DUPLICATE PROFILES ===")
+    print(f"Profiles: {len(profiles)}, clusters: {len(clusters)}, "
+          f"duplicates that would skip extraction: {sum(len(cluster) - 1 for cluster in clusters)}, "
+          f"~{tokens_saved} profile tokens saved")
+    url_clusters = []
+    for cluster in clusters:
+        urls = [profiles[position].get('linkedinUrl', '') for position in cluster]
+        url_clusters.append(urls)
+        print(f"  {profiles[cluster[0]].get('fullName', 'Unknown')}: {', '.join(urls)}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(url_clusters, f, indent=2)
+        print("Saved to:", args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+'''
+Synthetic Apify profile generator.
+
+Builds deterministic, realistic-looking LinkedIn profiles in the shape the Apify actor
+returns (see apify_requester.py), so the cleaning and trait stages can be benchmarked
+without scraping anything. The same seed always gives the same profiles.
+
+Usage:
+    python profile_generator.py --count 1000 --seed 42 --output apify-profile-data/synthetic_1000.json
+'''
+
+import argparse
+import json
+import os
+import random
+from typing import Any, Dict, Iterator, List
+
+FIRST_NAMES = [
+    'Amelia', 'Oliver', 'Priya', 'Mateo', 'Sofia', 'Liam', 'Chen', 'Fatima', 'Noah', 'Hannah',
+    'Lucas', 'Aisha', 'Jonas', 'Elena', 'Kenji', 'Zara', 'Tomasz', 'Ines', 'Arjun', 'Maya'
+]
+LAST_NAMES = [
+    'Smith', 'Patel', 'Garcia', 'Müller', 'Rossi', 'Nguyen', 'Kowalski', 'Dubois', 'Okafor', 'Kim',
+    'Johansson', 'Silva', 'Cohen', 'Tanaka', 'Fischer', 'Haddad', 'Novak', 'Brown', 'Ivanova', 'Singh'
+]
+COMPANIES = [
+    'Google', 'Meta', 'Stripe', 'Revolut', 'McKinsey & Company', 'Goldman Sachs', 'Deliveroo',
+    'Monzo', 'Palantir', 'Amazon', 'Spotify', 'Wise', 'Accenture', 'Microsoft', 'Bain & Company',
+    'N26', 'Klarna', 'Shopify', 'Unilever', 'BCG'
+]
+STARTUP_WORDS = ['Labs', 'AI', 'Health', 'Pay', 'Robotics', 'Energy', 'Bio', 'Logistics', 'Data', 'Climate']
+TITLES = [
+    'Software Engineer', 'Senior Software Engineer', 'Product Manager', 'Associate', 'Analyst',
+    'Engineering Manager', 'Head of Growth', 'Data Scientist', 'Consultant', 'VP Engineering',
+    'Machine Learning Engineer', 'Research Scientist', 'Business Development Manager'
+]
+FOUNDER_TITLES = ['Founder & CEO', 'Co-Founder & CTO', 'Co-founder', 'Founder']
+SCHOOLS = [
+    'University of Oxford', 'University of Cambridge', 'Imperial College London', 'Stanford University',
+    'MIT', 'ETH Zürich', 'TU Munich', 'London School of Economics', 'UCL', 'INSEAD', 'HEC Paris'
+]
+DEGREES = [
+    ('BSc', 'Computer Science'), ('BA', 'Economics'), ('MEng', 'Mechanical Engineering'),
+    ('MSc', 'Machine Learning'), ('MBA', 'Business Administration'), ('PhD', 'Physics'),
+    ('BSc', 'Mathematics'), ('MSc', 'Finance')
+]
+LOCATIONS = [
+    'London, England, United Kingdom', 'Berlin, Germany', 'Paris, Île-de-France, France',
+    'San Francisco, California, United States', 'Amsterdam, North Holland, Netherlands', 'Remote'
+]
+SKILLS = [
+    'Python', 'Leadership', 'Product Management', 'Machine Learning', 'Fundraising', 'SQL',
+    'Go-to-Market Strategy', 'Team Building', 'Financial Modeling', 'Kubernetes', 'Public Speaking'
+]
+# Accelerator and investor programs, written the ways profiles mention them (aliases, batches,
+# lowercase) plus a few look-alikes that must not be tagged in free text
+PROGRAM_MENTIONS = [
+    'Backed by Y Combinator (W24).', 'YC S23 alum.', 'Went through Techstars London in 2022.',
+    'Part of the Entrepreneur First cohort in London.', 'Met my co-founder at EF.',
+    'Funded by a16z and Seedcamp.', 'Resident at Station F.', 'Berkeley SkyDeck batch 14.',
+    'Angel investors include partners from First Round Capital.', 'Accepted into MassChallenge UK.',
+    'Alumni of yc and techstars.', 'Worked on neo-banking products.', 'Joined an antler-led hackathon.'
+]
+# Roles at programs, matched with company scope like any other employer
+PROGRAM_ROLES = [
+    ('Entrepreneur First', 'Founder in Residence'), ('Antler', 'Entrepreneur in Residence'),
+    ('Y Combinator', 'Visiting Partner'), ('Techstars', 'Mentor'), ('Founders Factory', 'Venture Partner')
+]
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+SENTENCES = [
+    'Built the team from 0 to 25 engineers and shipped our first enterprise contract.',
+    'Led a cross-functional team of 8 across product, design and data.',
+    'Raised a £2.1M pre-seed round from leading European investors.',
+    'Owned the P&L for a £40M business line across three markets.',
+    'Designed and launched a real-time pricing engine used by 2M customers.',
+    'Read more about our launch: https://techcrunch.com/2023/05/01/launch-story',
+    'Mentor at a university entrepreneurship programme.',
+    'Passionate about climate, healthcare and deep tech.',
+]
+
+CURRENT_YEAR = 2025
+CURRENT_MONTH = 10
+
+
+def _duration_text(months: int) -> str:
+    years, remainder = divmod(max(months, 1), 12)
+    parts = []
+    if years:
+        parts.append(f"{years} yr{'s' if years > 1 else ''}")
+    if remainder:
+        parts.append(f"{remainder} mo{'s' if remainder > 1 else ''}")
+    return ' '.join(parts)
+
+
+def _caption(start: int, end: int, is_current: bool) -> str:
+    """LinkedIn-style caption for month indexes (year * 12 + month - 1)."""
+    start_text = f"{MONTH_NAMES[start % 12]} {start // 12}"
+    end_text = 'Present' if is_current else f"{MONTH_NAMES[end % 12]} {end // 12}"
+    return f"{start_text} - {end_text} · {_duration_text(end - start + 1)}"
+
+
+def _urn(rng: random.Random, kind: str) -> str:
+    return f"urn:li:{kind}:{rng.randrange(10**9, 10**10)}"
+
+
+def _description(rng: random.Random, sentences: int) -> List[Dict[str, Any]]:
+    items: List[Dict[str, Any]] = [
+        {'type': 'textComponent', 'text': ' '.join(rng.choice(SENTENCES) for _ in range(sentences))}
+    ]
+    if rng.random() < 0.3:
+        items.append({
+            'type': 'mediaComponent',
+            'thumbnail': f"https://media.licdn.com/dms/image/{rng.randrange(10**8)}/thumb.jpg",
+            'title': 'Company deck'
+        })
+    return items
+
+
+def generate_profile(rng: random.Random, index: int) -> Dict[str, Any]:
+    """Generate one Apify-shaped LinkedIn profile from `rng`."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    slug = f"{first.lower()}-{last.lower()}-{index}"
+
+    # Career timeline, built backwards from today in month indexes
+    now = CURRENT_YEAR * 12 + CURRENT_MONTH - 1
+    cursor = now
+    experiences = []
+    for position in range(rng.randint(1, 7)):
+        is_current = position == 0
+        length = rng.randint(4, 60)
+        start = cursor - length + 1
+        location = rng.choice(LOCATIONS)
+
+        if position == 0 and rng.random() < 0.6:
+            company = f"{rng.choice(['Nova', 'Orbit', 'Kite', 'Atlas', 'Lumen'])} {rng.choice(STARTUP_WORDS)}"
+            title = rng.choice(FOUNDER_TITLES)
+        elif rng.random() < 0.05:
+            company, title = rng.choice(PROGRAM_ROLES)
+        else:
+            company, title = rng.choice(COMPANIES), rng.choice(TITLES)
+
+        if rng.random() < 0.25 and length > 12:
+            # Several roles at the same company
+            split = start + rng.randint(3, length - 3)
+            experiences.append({
+                'companyId': str(rng.randrange(10**6, 10**7)),
+                'companyUrn': _urn(rng, 'fsd_company'),
+                'companyLink1': f"https://www.linkedin.com/company/{rng.randrange(10**6)}/",
+                'logo': f"https://media.licdn.com/dms/image/{rng.randrange(10**8)}/logo.png",
+                'title': company,
+                'subtitle': f"Full-time · {_duration_text(cursor - start + 1)}",
+                'caption': location,
+                'breakdown': True,
+                'subComponents': [
+                    {
+                        'title': f"Senior {title}" if not title.startswith('Senior') else f"Lead {title[7:]}",
+                        'caption': _caption(split, cursor, is_current),
+                        'metadata': location,
+                        'description': _description(rng, rng.randint(1, 3))
+                    },
+                    {
+                        'title': title,
+                        'caption': _caption(start, split - 1, False),
+                        'metadata': location,
+                        'description': _description(rng, rng.randint(0, 2))
+                    }
+                ]
+            })
+        else:
+            experiences.append({
+                'companyId': str(rng.randrange(10**6, 10**7)),
+                'companyUrn': _urn(rng, 'fsd_company'),
+                'companyLink1': f"https://www.linkedin.com/company/{rng.randrange(10**6)}/",
+                'logo': f"https://media.licdn.com/dms/image/{rng.randrange(10**8)}/logo.png",
+                'title': title,
+                'subtitle': f"{company} · {rng.choice(['Full-time', 'Part-time', 'Internship', 'Self-employed'])}",
+                'caption': _caption(start, cursor, is_current),
+                'metadata': f"{location} · {rng.choice(['On-site', 'Hybrid', 'Remote'])}",
+                'breakdown': False,
+                'subComponents': [{'description': _description(rng, rng.randint(0, 4))}]
+            })
+        cursor = start - rng.randint(0, 6) - 1
+
+    educations = []
+    graduation = cursor // 12
+    for degree, field in rng.sample(DEGREES, rng.randint(1, 3)):
+        years = 4 if degree.startswith('B') else (5 if degree == 'PhD' else rng.randint(1, 2))
+        educations.append({
+            'companyId': str(rng.randrange(10**6, 10**7)),
+            'breakdown': False,
+            'title': rng.choice(SCHOOLS),
+            'subtitle': f"{degree}, {field}",
+            'caption': f"{graduation - years} - {graduation}",
+            'logo': f"https://media.licdn.com/dms/image/{rng.randrange(10**8)}/school.png",
+            'subComponents': []
+        })
+        graduation -= years
+
+    about = ' '.join(rng.choice(SENTENCES) for _ in range(rng.randint(2, 12)))
+    if rng.random() < 0.3:
+        about += ' ' + ' '.join(rng.sample(PROGRAM_MENTIONS, rng.randint(1, 2)))
+
+    return {
+        'linkedinUrl': f"https://www.linkedin.com/in/{slug}",
+        'publicIdentifier': slug,
+        'urn': _urn(rng, 'fsd_profile'),
+        'firstName': first,
+        'lastName': last,
+        'fullName': f"{first} {last}",
+        'headline': f"{experiences[0]['title']} | ex-{rng.choice(COMPANIES)} | {rng.choice(SKILLS)}",
+        'connections': rng.randint(50, 500),
+        'followers': rng.randint(50, 20000),
+        'profilePic': f"https://media.licdn.com/dms/image/{rng.randrange(10**8)}/profile.jpg",
+        'profilePicHighQuality': f"https://media.licdn.com/dms/image/{rng.randrange(10**8)}/profile-hq.jpg",
+        'addressWithCountry': rng.choice(LOCATIONS),
+        'about': about,
+        'jobTitle': experiences[0]['title'],
+        'companyName': experiences[0]['title'] if experiences[0].get('breakdown') else experiences[0]['subtitle'].split(' · ')[0],
+        'experiences': experiences,
+        'educations': educations,
+        'skills': [{'title': skill} for skill in rng.sample(SKILLS, rng.randint(0, 8))],
+        'languages': [{'title': 'English', 'caption': 'Native or bilingual proficiency'}],
+        'updates': [{'postText': rng.choice(SENTENCES), 'numLikes': rng.randint(0, 500)}]
+    }
+
+
+def iter_profiles(count: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """Yield `count` profiles one at a time, so large cohorts needn't sit in memory."""
+    rng = random.Random(seed)
+    for index in range(count):
+        yield generate_profile(rng, index)
+
+
+def generate_profiles(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Generate `count` deterministic Apify-shaped profiles."""
+    return list(iter_profiles(count, seed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic Apify LinkedIn profiles')
+    parser.add_argument('--count', type=int, default=100, help='Number of profiles (100 to 100000)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--output', default='apify-profile-data/synthetic_linkedin_profile_data.json', help='Output JSON path')
+    args = parser.parse_args()
+
+    profiles = generate_profiles(args.count, args.seed)
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(profiles, f, indent=2, ensure_ascii=False)
+
+    print(f"Generated {len(profiles)} synthetic profiles (seed {args.seed})")
+    print("Saved to:", args.output)
+
+
+if __name__ == "__main__":
+    main()
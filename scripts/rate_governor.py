@@ -0,0 +1,340 @@
+'''
+Process-wide rate limiting for outbound API calls.
+
+TokenBucket is a small thread-safe token bucket. OpenAIRateGovernor pairs two of them,
+one for requests per minute and one for tokens per minute, and adapts both from the
+x-ratelimit-* and Retry-After headers OpenAI sends back. Every LinkedInTraitExtractor
+shares the governors returned by get_shared_governor() for its API and models, so
+concurrent trait jobs in the same API process pace themselves against one budget per
+model instead of each sleeping on its own.
+
+Limits default to the OPENAI_RPM_LIMIT / OPENAI_TPM_LIMIT environment variables and are
+corrected from response headers as soon as the first call comes back.
+
+AirtableRateGovernor does the same for Airtable's per-base limit of 5 requests per second.
+get_airtable_governor(base_id) returns one governor per base, so every AirtableTraitUpdater
+writing to a base in this process shares its budget.
+'''
+
+import asyncio
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that refills continuously at `capacity` tokens per `period` seconds.
+
+    reserve() deducts immediately and returns how long the caller should wait, so the same
+    bucket works for threads (time.sleep) and event loops (asyncio.sleep).
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.period = period
+        self.tokens = float(capacity)
+        self.blocked_until = 0.0
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Tokens added per second."""
+        return self.capacity / self.period
+
+    def _refill(self, now: float):
+        # During a pause updated_at is in the future: nothing refills until the pause ends
+        if now > self.updated_at:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Take `amount` tokens and return the seconds to wait before using them."""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            # A single request larger than the bucket could never be served otherwise
+            self.tokens -= min(amount, self.capacity)
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            # Callers queued behind a pause are spaced out from its end, not released together
+            return max(wait + max(self.updated_at - now, 0.0), self.blocked_until - now)
+
+    def refund(self, amount: float):
+        """Give back tokens that were reserved but not used."""
+        with self.lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+    def set_capacity(self, capacity: float):
+        """Change the bucket size, keeping the current fill level in proportion."""
+        with self.lock:
+            self._refill(time.monotonic())
+            if capacity > 0 and capacity != self.capacity:
+                self.tokens = self.tokens * capacity / self.capacity
+                self.capacity = float(capacity)
+
+    def set_rate(self, rate: float):
+        """Change the refill rate (tokens per second), keeping the bucket size."""
+        with self.lock:
+            self._refill(time.monotonic())
+            if rate > 0:
+                self.period = self.capacity / rate
+
+    def sync_remaining(self, remaining: float):
+        """Trust the server's count when it says fewer tokens are left than we think."""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, float(remaining))
+
+    def pause(self, seconds: float):
+        """Hold every caller back for at least `seconds`, then resume at the normal rate from empty."""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            # Whatever refills during the pause would otherwise be spent in one burst when it ends
+            self.tokens = min(self.tokens, 0.0)
+            self.updated_at = max(self.updated_at, self.blocked_until)
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Blocking reserve. Returns the time spent waiting."""
+        wait = self.reserve(amount)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, amount: float = 1.0) -> float:
+        """Event-loop friendly reserve. Returns the time spent waiting."""
+        wait = self.reserve(amount)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+def parse_reset_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse OpenAI reset durations such as '1s', '6m0s', '20ms' or '0.5'."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total = 0.0
+    matched = False
+    for amount, unit in re.findall(r'(\d+(?:\.\d+)?)(ms|h|m|s)', value):
+        matched = True
+        total += float(amount) * {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}[unit]
+    return total if matched else None
+
+
+class OpenAIRateGovernor:
+    """
+    Requests-per-minute and tokens-per-minute governor shared by all OpenAI calls in the process.
+
+    Callers estimate a request's tokens, acquire() before sending, then report the response
+    headers (update_from_headers) and actual usage (settle). A 429 goes to record_rate_limited,
+    which pauses everyone for the Retry-After period.
+    """
+
+    def __init__(self, requests_per_minute: int = 500, tokens_per_minute: int = 200000, headroom: float = 0.9):
+        """
+        Args:
+            requests_per_minute: Account RPM limit for the model
+            tokens_per_minute: Account TPM limit for the model
+            headroom: Fraction of the limits to actually use, leaving room for estimate error
+        """
+        self.headroom = headroom
+        self.requests = TokenBucket(requests_per_minute * headroom)
+        self.tokens = TokenBucket(tokens_per_minute * headroom)
+        # seconds_waited is summed over all callers, so it can exceed wall time when running concurrently
+        self.stats = {'requests': 0, 'rate_limited': 0, 'seconds_waited': 0.0}
+        self.stats_lock = threading.Lock()
+
+    @staticmethod
+    def estimate_tokens(request_kwargs: Dict[str, Any]) -> int:
+        """Rough token cost of a chat request: ~4 characters per prompt token plus the output budget."""
+        prompt_chars = sum(len(str(m.get('content', ''))) for m in request_kwargs.get('messages', []))
+        return prompt_chars // 4 + int(request_kwargs.get('max_tokens') or 0)
+
+    def _record_wait(self, waited: float):
+        with self.stats_lock:
+            self.stats['requests'] += 1
+            self.stats['seconds_waited'] += waited
+
+    def acquire(self, estimated_tokens: int):
+        """Block until one request of `estimated_tokens` fits in both budgets."""
+        wait = max(self.requests.reserve(1), self.tokens.reserve(estimated_tokens))
+        if wait > 0:
+            time.sleep(wait)
+        self._record_wait(wait)
+
+    async def acquire_async(self, estimated_tokens: int):
+        """Async version of acquire()."""
+        wait = max(self.requests.reserve(1), self.tokens.reserve(estimated_tokens))
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._record_wait(wait)
+
+    def settle(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """Refund the difference once the response's real token usage is known."""
+        if actual_tokens is not None and actual_tokens < estimated_tokens:
+            self.tokens.refund(estimated_tokens - actual_tokens)
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]):
+        """Adapt to the limits and remaining budget reported in OpenAI's x-ratelimit-* headers."""
+        if not headers:
+            return
+        for bucket, kind in ((self.requests, 'requests'), (self.tokens, 'tokens')):
+            limit = headers.get(f'x-ratelimit-limit-{kind}')
+            remaining = headers.get(f'x-ratelimit-remaining-{kind}')
+            try:
+                if limit:
+                    bucket.set_capacity(float(limit) * self.headroom)
+                if remaining:
+                    bucket.sync_remaining(float(remaining))
+            except ValueError:
+                continue
+            if remaining is not None and remaining.strip() == '0':
+                reset = parse_reset_seconds(headers.get(f'x-ratelimit-reset-{kind}'))
+                if reset:
+                    bucket.pause(reset)
+
+    def record_rate_limited(self, headers: Optional[Mapping[str, str]] = None, default_wait: float = 5.0) -> float:
+        """
+        Handle a 429: pause all callers for the Retry-After period (or `default_wait`).
+
+        Returns:
+            Seconds everyone is paused for
+        """
+        headers = headers or {}
+        wait = None
+        if headers.get('retry-after-ms'):
+            try:
+                wait = float(headers['retry-after-ms']) / 1000
+            except ValueError:
+                pass
+        if wait is None:
+            wait = parse_reset_seconds(headers.get('retry-after'))
+        if wait is None:
+            wait = default_wait
+
+        self.requests.pause(wait)
+        self.tokens.pause(wait)
+        self.update_from_headers(headers)
+        with self.stats_lock:
+            self.stats['rate_limited'] += 1
+        return wait
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus current limits, for job status and logs."""
+        with self.stats_lock:
+            stats = dict(self.stats)
+        stats['seconds_waited'] = round(stats['seconds_waited'], 2)
+        stats['requests_per_minute'] = round(self.requests.capacity)
+        stats['tokens_per_minute'] = round(self.tokens.capacity)
+        return stats
+
+
+_shared_governors: Dict[Tuple[Optional[str], Optional[str]], OpenAIRateGovernor] = {}
+_shared_governor_lock = threading.Lock()
+
+
+def get_shared_governor(base_url: Optional[str] = None, model: Optional[str] = None) -> OpenAIRateGovernor:
+    """
+    The process-wide OpenAI governor for a model, created on first use from OPENAI_RPM_LIMIT / OPENAI_TPM_LIMIT.
+
+    OpenAI limits are per model, so each model gets its own governor and its headers only
+    size its own budget. Other OpenAI-compatible APIs (base_url, e.g. a mock server) get
+    governors of their own, so their limits and 429s never reach jobs talking to OpenAI.
+    """
+    key = (base_url, model)
+    with _shared_governor_lock:
+        if key not in _shared_governors:
+            _shared_governors[key] = OpenAIRateGovernor(
+                requests_per_minute=int(os.getenv('OPENAI_RPM_LIMIT', '500')),
+                tokens_per_minute=int(os.getenv('OPENAI_TPM_LIMIT', '200000'))
+            )
+        return _shared_governors[key]
+
+
+class AirtableRateGovernor:
+    """
+    Requests-per-second governor for one Airtable base, shared by all updaters in the process.
+
+    Callers acquire() before each request and report how it went. Requests are spaced evenly
+    (a bucket of one), since a burst on top of the full rate would go over Airtable's limit.
+    A 429 pauses everyone for the Retry-After period (Airtable asks for 30 seconds) and halves
+    the rate; each successful request then wins back a little of it, up to the base's limit.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float = 5.0,
+        headroom: float = 0.9,
+        min_requests_per_second: float = 1.0,
+        rate_limit_pause: float = 30.0
+    ):
+        """
+        Args:
+            requests_per_second: Airtable's per-base limit
+            headroom: Fraction of the limit to actually use, leaving room for timing jitter
+            min_requests_per_second: Slowest rate 429s can push the governor down to
+            rate_limit_pause: Seconds to pause everyone after a 429 without a Retry-After header
+        """
+        self.limit = requests_per_second * headroom
+        self.min_rate = min(min_requests_per_second, requests_per_second)
+        self.rate_limit_pause = rate_limit_pause
+        self.requests = TokenBucket(1, period=1.0 / self.limit)
+        self.stats = {'requests': 0, 'rate_limited': 0, 'seconds_waited': 0.0}
+        self.stats_lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until one request fits in the budget. Returns the time spent waiting."""
+        waited = self.requests.acquire(1)
+        with self.stats_lock:
+            self.stats['requests'] += 1
+            self.stats['seconds_waited'] += waited
+        return waited
+
+    def record_success(self):
+        """Additive increase: win back a twentieth of a request per second, up to the limit."""
+        if self.requests.rate < self.limit:
+            self.requests.set_rate(min(self.limit, self.requests.rate + 0.05))
+
+    def record_rate_limited(self, retry_after: Optional[str] = None) -> float:
+        """
+        Handle a 429: pause all callers and halve the rate.
+
+        Returns:
+            Seconds everyone is paused for
+        """
+        wait = parse_reset_seconds(retry_after) or self.rate_limit_pause
+        self.requests.pause(wait)
+        self.requests.set_rate(max(self.min_rate, self.requests.rate / 2))
+        with self.stats_lock:
+            self.stats['rate_limited'] += 1
+        return wait
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus the current rate, for job status and logs."""
+        with self.stats_lock:
+            stats = dict(self.stats)
+        stats['seconds_waited'] = round(stats['seconds_waited'], 2)
+        stats['requests_per_second'] = round(self.requests.rate, 2)
+        return stats
+
+
+_airtable_governors: Dict[str, AirtableRateGovernor] = {}
+_airtable_governors_lock = threading.Lock()
+
+
+def get_airtable_governor(base_id: str) -> AirtableRateGovernor:
+    """The process-wide governor for an Airtable base, created on first use from AIRTABLE_REQUESTS_PER_SECOND."""
+    with _airtable_governors_lock:
+        if base_id not in _airtable_governors:
+            _airtable_governors[base_id] = AirtableRateGovernor(
+                requests_per_second=float(os.getenv('AIRTABLE_REQUESTS_PER_SECOND', '5'))
+            )
+        return _airtable_governors[base_id]
@@ -0,0 +1,94 @@
+'''
+Gzip archive of every raw LLM response behind the trait results.
+
+The response cache answers "have we already paid for exactly this request?" and is safe to
+clear. The archive answers "what did the model actually say for this record?". Results only
+keep the parsed ExtractedTraits, so without it a change to parsing, defaulting or the
+Airtable mapping means calling the API again.
+
+Entries are keyed by profile and prompt: <profile hash>/<prompt hash>, where the profile hash
+is of the LinkedIn URL and the prompt hash is of the system prompt and model. Each entry is
+one gzip-compressed JSON file, written atomically. It holds the raw content plus what is
+needed to parse it again: the model, and for section requests, which sections were asked
+for. Trait records list the keys they were built from in
+extraction_metadata['archived_responses'], and LinkedInTraitExtractor.reparse_results()
+rebuilds a whole results file from them without any API calls.
+'''
+
+import gzip
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+from response_cache import canonical_json, hash_text
+
+
+def make_archive_key(profile_url: str, system_prompt: str, model: str) -> str:
+    """Archive key for one response: <profile hash>/<prompt hash>."""
+    profile_hash = hash_text(profile_url.strip())[:16]
+    prompt_hash = hash_text(canonical_json({'system_prompt': hash_text(system_prompt), 'model': model}))[:16]
+    return f"{profile_hash}/{prompt_hash}"
+
+
+class ResponseArchive:
+    """On-disk, gzip-compressed store of raw responses by archive key."""
+
+    def __init__(self, archive_dir: str = 'llm-response-archive'):
+        self.archive_dir = archive_dir
+        self.stats = {'writes': 0, 'reads': 0, 'missing': 0}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.archive_dir, f"{key}.json.gz")
+
+    def put(
+        self,
+        profile_url: str,
+        system_prompt: str,
+        model: str,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Archive one response, replacing any earlier one for the same profile and prompt.
+
+        Returns:
+            The entry's key
+        """
+        key = make_archive_key(profile_url, system_prompt, model)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {
+            'profile_url': profile_url.strip(),
+            'model': model,
+            'content': content,
+            'archived_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            **(metadata or {})
+        }
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                f.write(json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.stats['writes'] += 1
+        return key
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """The archived entry (content, model, profile_url, ...) for `key`, or None."""
+        try:
+            with gzip.open(self._path(key), 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.stats['missing'] += 1
+            return None
+        self.stats['reads'] += 1
+        return entry
+
+    def get_stats(self) -> Dict[str, int]:
+        """Write/read/missing counters since this archive object was created."""
+        return dict(self.stats)
@@ -0,0 +1,109 @@
+'''
+Content-addressed cache of LLM responses for trait extraction.
+
+Each entry is keyed by everything that determines the model's answer: a hash of the system
+prompt, the model name, temperature, max_tokens, a hash of the canonicalized profile JSON and,
+when responses are schema-constrained, a hash of the response format.
+Re-running unchanged profiles therefore never calls the API twice, and editing the prompt or
+the request settings gives new keys, so exactly the affected entries stop matching without
+any manual invalidation. Old entries are simply never read again (clear() removes them).
+
+Entries are one small JSON file each, sharded by key prefix and written atomically
+(temp file + os.replace), so a crash mid-run never leaves a half-written entry behind.
+'''
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+
+def hash_text(text: str) -> str:
+    """SHA-256 hex digest of a string."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def canonical_json(data: Any) -> str:
+    """Stable JSON serialization: sorted keys, no whitespace, so equal data hashes equally."""
+    return json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def make_cache_key(
+    system_prompt: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    profile: Dict[str, Any],
+    response_format: Optional[Dict[str, Any]] = None
+) -> str:
+    """Cache key for one extraction request. A response_format (output schema) is part of the key when given."""
+    parts = {
+        'system_prompt': hash_text(system_prompt),
+        'model': model,
+        'temperature': temperature,
+        'max_tokens': max_tokens,
+        'profile': hash_text(canonical_json(profile))
+    }
+    if response_format is not None:
+        parts['response_format'] = hash_text(canonical_json(response_format))
+    return hash_text(canonical_json(parts))
+
+
+class ResponseCache:
+    """On-disk store of raw response content by cache key."""
+
+    def __init__(self, cache_dir: str = 'llm-response-cache'):
+        self.cache_dir = cache_dir
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response content for `key`, or None."""
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                content = json.load(f)['content']
+        except (OSError, ValueError, KeyError):
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return content
+
+    def put(self, key: str, content: str, metadata: Optional[Dict[str, Any]] = None):
+        """Store response content atomically under `key`."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {
+            'content': content,
+            'cached_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            **(metadata or {})
+        }
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.stats['writes'] += 1
+
+    def delete(self, key: str):
+        """Drop one entry, e.g. when its content turned out to be unparseable."""
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        """Remove every cached response."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Hit/miss/write counters since this cache object was created."""
+        return dict(self.stats)
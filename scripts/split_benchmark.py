@@ -0,0 +1,116 @@
+'''
+Benchmark for split trait extraction (one concurrent request per section group).
+
+Extracts the same profiles one at a time with one request for the whole record
+(monolithic) and with split_sections=True, and reports wall latency per profile
+(mean / p50 / p95) and prompt/completion tokens per profile for each. The response
+cache and the escalation model are off so both modes pay for exactly their own calls.
+
+--estimate skips the API entirely and reports the estimated prompt tokens each mode
+sends per profile (~4 characters per token).
+
+Usage:
+    python split_benchmark.py --input cleaned-profile-data/S25Top100cleaned_linkedin_data.json --profiles 10
+    python split_benchmark.py --count 10 --estimate
+'''
+
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List
+
+from extraction_telemetry import percentile
+from packing_benchmark import load_profiles
+from trait_extractor import LinkedInTraitExtractor
+
+MODES = {'monolithic': False, 'split': True}
+
+
+def estimate_mode(profiles: List[Dict[str, Any]], split_sections: bool) -> Dict[str, Any]:
+    """Estimated prompt tokens per profile in this mode, without calling the API."""
+    extractor = LinkedInTraitExtractor(use_response_cache=False, escalation_model=None)
+    prompt_tokens = 0
+    requests = 0
+    for profile in profiles:
+        if split_sections:
+            kwargs_list = [
+                extractor.build_section_request_kwargs(profile, list(sections))
+                for sections in extractor.SPLIT_SECTION_GROUPS.values()
+            ]
+        else:
+            kwargs_list = [extractor.build_request_kwargs(profile)]
+        for kwargs in kwargs_list:
+            prompt_tokens += extractor.rate_governor.estimate_tokens(kwargs) - kwargs['max_tokens']
+            requests += 1
+    return {
+        'requests_per_profile': round(requests / len(profiles), 1),
+        'est_prompt_tokens_per_profile': round(prompt_tokens / len(profiles), 1)
+    }
+
+
+def benchmark_mode(profiles: List[Dict[str, Any]], split_sections: bool) -> Dict[str, Any]:
+    """Extract every profile in this mode and report latency and tokens per profile."""
+    extractor = LinkedInTraitExtractor(use_response_cache=False, escalation_model=None, split_sections=split_sections)
+    latencies = []
+    extracted = 0
+    for profile in profiles:
+        start = time.perf_counter()
+        traits = extractor.extract_traits_from_profile(profile)
+        latencies.append(time.perf_counter() - start)
+        extracted += traits is not None
+
+    usage = extractor.usage_stats
+    return {
+        'profiles': len(profiles),
+        'extracted': extracted,
+        'requests': usage['requests'],
+        'prompt_tokens_per_profile': round(usage['prompt_tokens'] / len(profiles), 1),
+        'completion_tokens_per_profile': round(usage['completion_tokens'] / len(profiles), 1),
+        'mean_seconds_per_profile': round(sum(latencies) / len(latencies), 3),
+        'p50_seconds_per_profile': round(percentile(latencies, 0.50), 3),
+        'p95_seconds_per_profile': round(percentile(latencies, 0.95), 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark split (per section group) against monolithic trait extraction')
+    parser.add_argument('--input', help='Cleaned profiles JSON. Defaults to synthetic profiles.')
+    parser.add_argument('--count', type=int, default=10, help='Synthetic profiles to generate when no --input')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for synthetic profiles')
+    parser.add_argument('--profiles', type=int, default=10, help='Profiles to extract per mode (0 for all)')
+    parser.add_argument('--estimate', action='store_true', help='Only estimate prompt tokens, no API calls')
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    args = parser.parse_args()
+
+    profiles = load_profiles(args)
+    print(f"Benchmarking {len(profiles)} profiles, monolithic vs split")
+
+    results = {}
+    for mode, split_sections in MODES.items():
+        if args.estimate:
+            result = estimate_mode(profiles, split_sections)
+            print(f"{mode}: {result['requests_per_profile']} requests/profile, "
+                  f"~{result['est_prompt_tokens_per_profile']} prompt tokens/profile")
+        else:
+            result = benchmark_mode(profiles, split_sections)
+            print(f"{mode}: {result['mean_seconds_per_profile']}s/profile "
+                  f"(p50 {result['p50_seconds_per_profile']}s, p95 {result['p95_seconds_per_profile']}s), "
+                  f"{result['prompt_tokens_per_profile']} prompt + {result['completion_tokens_per_profile']} completion tokens/profile, "
+                  f"{result['extracted']}/{result['profiles']} extracted")
+        results[mode] = result
+
+    if not args.estimate and results['split']['mean_seconds_per_profile']:
+        speedup = results['monolithic']['mean_seconds_per_profile'] / results['split']['mean_seconds_per_profile']
+        results['latency_speedup'] = round(speedup, 2)
+        print(f"Split is {results['latency_speedup']}x faster than monolithic per profile")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print("Saved to:", args.output)
+
+
+if __name__ == "__main__":
+    main()
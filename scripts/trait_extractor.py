@@ -14,20 +14,39 @@ Progress Tracking Features:
 
 '''
 
+import asyncio
 import json
 import os
+import tempfile
 import time
-from typing import Dict, List, Any, Optional, Set
-from openai import OpenAI
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Set, Tuple
+from openai import OpenAI, AsyncOpenAI, RateLimitError
+from dataclasses import dataclass, asdict, field
 import dotenv
 
+from rate_governor import OpenAIRateGovernor, get_shared_governor
+from batch_backend import OpenAIBatchBackend, TERMINAL_STATUSES
+from response_cache import ResponseCache, make_cache_key
+from response_archive import ResponseArchive
+from json_repair import repair_json
+from profile_dedup import find_duplicate_clusters
+from model_pricing import estimate_cost
+from extraction_telemetry import ExtractionTelemetry
+from entity_matcher import ENTITY_FIELD_SECTIONS, get_default_matcher, merge_entity_matches
+from trait_prompt import TRAIT_SECTIONS, build_section_prompt, build_system_prompt, get_section_versions
+from trait_rules import RULE_FIELD_NAMES, build_rule_only_record, compute_rule_traits, has_free_text, merge_rule_traits, text_fields_kept
+from trait_schema import build_traits_json_schema, build_response_format, object_schema, validate_against_schema
+
 dotenv.load_dotenv()
 
 def main():
     # CONFIGURATION
     NUMBER_PROFILES = -1        # Number of profiles to process in this session
     FORCE_REEXTRACTION = False  # Set to True when you want to re-extract all profiles (e.g., after changing system prompt)
+    MAX_CONCURRENCY = 1         # Profiles extracted at once. Above 1 uses the async OpenAI client
+    USE_BATCH_API = False       # Submit everything as one OpenAI batch (cheaper, results within 24h)
+    REPARSE_ONLY = False        # Rebuild the results file from archived raw responses, no API calls
     
     # USAGE EXAMPLES:
     # 1. First run: Extract 30 profiles
@@ -42,7 +61,10 @@ def main():
     # 4. Extract all remaining profiles:
     #    NUMBER_PROFILES = -1, FORCE_REEXTRACTION = False
     #
-    # 5. Check progress without processing:
+    # 5. Re-apply changed parsing/defaulting to existing results without calling the API:
+    #    REPARSE_ONLY = True
+    #
+    # 6. Check progress without processing:
     #    Uncomment the progress check section below
     
     """Example usage of the LinkedInTraitExtractor with progress tracking."""
@@ -62,12 +84,33 @@ def main():
     print(f"Loaded {len(profiles)} cleaned profiles")
     
     # Extract traits with progress tracking
-    results = extractor.extract_traits_from_profiles(
-        profiles, 
-        max_profiles=NUMBER_PROFILES,
-        force_reextraction=FORCE_REEXTRACTION,
-        output_file='final-trait-extractions/S25Top100_comprehensive_traits.json'
-    )
+    if REPARSE_ONLY:
+        results = extractor.reparse_results(
+            profiles,
+            output_file='final-trait-extractions/S25Top100_comprehensive_traits.json'
+        )
+    elif USE_BATCH_API:
+        results = extractor.extract_traits_from_profiles_batch(
+            profiles,
+            max_profiles=NUMBER_PROFILES,
+            force_reextraction=FORCE_REEXTRACTION,
+            output_file='final-trait-extractions/S25Top100_comprehensive_traits.json'
+        )
+    elif MAX_CONCURRENCY > 1:
+        results = extractor.extract_traits_from_profiles_concurrent(
+            profiles,
+            max_concurrency=MAX_CONCURRENCY,
+            max_profiles=NUMBER_PROFILES,
+            force_reextraction=FORCE_REEXTRACTION,
+            output_file='final-trait-extractions/S25Top100_comprehensive_traits.json'
+        )
+    else:
+        results = extractor.extract_traits_from_profiles(
+            profiles, 
+            max_profiles=NUMBER_PROFILES,
+            force_reextraction=FORCE_REEXTRACTION,
+            output_file='final-trait-extractions/S25Top100_comprehensive_traits.json'
+        )
     
     print(f"Processed {len(results)} profiles successfully")
 
@@ -132,152 +175,724 @@ class ExtractedTraits:
     research_and_academic: Dict[str, Any]
     international_experience: Dict[str, Any]
     confidence_score: Optional[str] = None
+    # How the record was produced (e.g. json_repaired). Filled in locally, never by the model.
+    extraction_metadata: Dict[str, Any] = field(default_factory=dict, metadata={'llm': False})
+
+
+def traits_to_dict(traits: ExtractedTraits) -> Dict[str, Any]:
+    """Output-file record for one ExtractedTraits, in the field order the updater expects."""
+    return asdict(traits)
+
+
+def traits_from_dict(item: Dict[str, Any]) -> ExtractedTraits:
+    """Rebuild ExtractedTraits from an output-file record, tolerating missing sections."""
+    return ExtractedTraits(
+        full_name=item['full_name'],
+        linkedin_url=item['linkedin_url'],
+        estimated_age=item.get('estimated_age'),
+        education_stages=item.get('education_stages', {}),
+        career_insights=item.get('career_insights', {}),
+        company_background=item.get('company_background', {}),
+        accelerator_and_programs=item.get('accelerator_and_programs', {}),
+        education_career_alignment=item.get('education_career_alignment', {}),
+        personal_brand=item.get('personal_brand', {}),
+        research_and_academic=item.get('research_and_academic', {}),
+        international_experience=item.get('international_experience', {}),
+        confidence_score=item.get('confidence_score', 'Low'),
+        extraction_metadata=item.get('extraction_metadata', {})
+    )
+
+
+CONFIDENCE_LEVELS = ['low', 'medium', 'high']
+
+
+def lowest_confidence(*scores: Optional[str]) -> Optional[str]:
+    """The lowest of several High/Medium/Low confidence scores, ignoring missing or unknown ones."""
+    known = [str(score) for score in scores if str(score).strip().lower() in CONFIDENCE_LEVELS]
+    if not known:
+        return None
+    return min(known, key=lambda score: CONFIDENCE_LEVELS.index(score.strip().lower()))
+
 
 class LinkedInTraitExtractor:
     """
     Extracts specific traits from LinkedIn profiles using OpenAI's API.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    # 429s don't count as failed attempts, but give up after this many in a row
+    MAX_RATE_LIMIT_RETRIES = 6
+
+    # Journaled results are folded into the output JSON array after this many appends
+    COMPACT_EVERY = 50
+
+    # Output budget for packed requests (max_tokens per profile, capped by the model's output limit)
+    PACKED_MAX_TOKENS = 16000
+
+    # Sections every trait record must have, used to validate packed results
+    REQUIRED_TRAIT_SECTIONS = (
+        'education_stages', 'career_insights', 'company_background', 'accelerator_and_programs',
+        'education_career_alignment', 'personal_brand', 'research_and_academic', 'international_experience'
+    )
+    ENTITY_MATCHING_MODES = ('off', 'hints', 'replace')
+
+    # Requests a split extraction sends concurrently, and the record fields each one asks for
+    SPLIT_SECTION_GROUPS = {
+        'education': ('estimated_age', 'education_stages', 'education_career_alignment', 'research_and_academic'),
+        'career': ('career_insights',),
+        'companies': ('company_background', 'accelerator_and_programs'),
+        'brand': ('personal_brand', 'international_experience')
+    }
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        rate_governor: Optional[OpenAIRateGovernor] = None,
+        use_response_cache: bool = True,
+        response_cache: Optional[ResponseCache] = None,
+        use_structured_output: bool = True,
+        use_rule_engine: bool = True,
+        entity_matching: str = 'hints',
+        escalation_model: Optional[str] = None,
+        telemetry: Optional[ExtractionTelemetry] = None,
+        split_sections: bool = False,
+        base_url: Optional[str] = None,
+        use_response_archive: bool = True,
+        response_archive: Optional[ResponseArchive] = None,
+        dedupe_profiles: bool = False
+    ):
         """
         Initialize the trait extractor.
         
         Args:
             api_key: OpenAI API key. If None, will look for OPENAI_API_KEY environment variable.
+            rate_governor: RPM/TPM governor to pace primary model calls with. Defaults to the process-wide
+                shared one for base_url and the model, so mock servers never share a budget with OpenAI.
+                Escalation model calls always use the shared governor for that model.
+            use_response_cache: Reuse stored responses for requests whose prompt, settings and profile are unchanged
+            response_cache: Cache to use. Defaults to one in TRAIT_RESPONSE_CACHE_DIR (llm-response-cache/).
+            use_structured_output: Constrain responses to the ExtractedTraits JSON schema (OpenAI strict structured outputs)
+            use_rule_engine: Compute age, tenure and count fields locally (trait_rules.py) instead of asking the model,
+                and skip the model entirely for profiles with no free text
+            entity_matching: How to use the local notable company / accelerator matcher (entity_matcher.py):
+                'off', 'hints' (matches are added to each profile for the model to use) or
+                'replace' (notable_companies and accelerators come from the matcher, not the model)
+            escalation_model: Stronger model that re-extracts Low-confidence, schema-invalid or failed
+                results of the primary model. None runs every profile on the primary model only.
+            telemetry: Recorder for per-call tokens, latency and retries. Defaults to an in-memory one;
+                pass ExtractionTelemetry(path) to persist a job's calls as JSONL.
+            split_sections: Extract each profile with concurrent smaller requests, one per
+                SPLIT_SECTION_GROUPS group, merged into one record. Lower latency per profile,
+                at the cost of sending the profile once per group.
+            base_url: OpenAI-compatible API to send requests to, e.g. a MockOpenAIServer
+                (mock_openai_server.py) for offline load tests. None for OpenAI (or OPENAI_BASE_URL).
+            use_response_archive: Keep every raw response behind a result (gzip), so results can be
+                rebuilt with reparse_results() after parsing changes, without API calls
+            response_archive: Archive to use. Defaults to one in TRAIT_RESPONSE_ARCHIVE_DIR (llm-response-archive/).
+            dedupe_profiles: Find near-duplicate profiles (profile_dedup.py) before extracting, extract one
+                per cluster and copy its traits to the others, with their own name, URL and rule traits
         """
+        self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        self.base_url = base_url
+        # SDK retries are off so 429s and their Retry-After reach the shared rate governor
         self.client = OpenAI(
-            api_key=api_key or os.getenv('OPENAI_API_KEY')
+            api_key=self.api_key,
+            base_url=self.base_url,
+            max_retries=0
         )
+
+        # Request settings shared by every extraction path
+        self.model = "gpt-4o-mini"  # Using gpt-4o-mini for cost efficiency
+        self.temperature = 0.1  # Low temperature for consistent extraction # basically will be more accurate to the data given. 
+        self.max_tokens = 4000
+        self.rate_governor = rate_governor or get_shared_governor(self.base_url, self.model)
+        # Caps in-flight async requests during extract_traits_from_profiles_async (split sections and escalations included)
+        self.request_semaphore: Optional[asyncio.Semaphore] = None
+
+        # Cascade: only results the primary model is unsure about go to the escalation model
+        self.escalation_model = escalation_model if escalation_model != self.model else None
+        self.cascade_stats = {'escalated': 0, 'replaced': 0, 'reasons': {}}
+
+        # Fields the rule engine computes; the prompt and schema leave them out
+        self.use_rule_engine = use_rule_engine
+        # Off for inputs cleaned without about/descriptions, where every profile looks empty (see check_rule_only_profiles)
+        self.rule_only_profiles = use_rule_engine
+        self.local_fields = list(RULE_FIELD_NAMES) if use_rule_engine else []
+
+        # Notable companies and accelerators matched locally; in 'replace' mode they are local fields too
+        if entity_matching not in self.ENTITY_MATCHING_MODES:
+            raise ValueError(f"entity_matching must be one of {self.ENTITY_MATCHING_MODES}, got {entity_matching!r}")
+        self.entity_matching = entity_matching
+        self.entity_matcher = get_default_matcher() if entity_matching != 'off' else None
+        if entity_matching == 'replace':
+            self.local_fields += list(ENTITY_FIELD_SECTIONS)
+
+        # Responses are constrained to, and validated against, this schema
+        self.use_structured_output = use_structured_output
+        self.split_sections = split_sections
+        self.traits_schema = build_traits_json_schema(ExtractedTraits, self.local_fields)
+        self.packed_traits_schema = object_schema({'profiles': {'type': 'array', 'items': self.traits_schema}})
+        # Version of each prompt section, stored in every record so changed sections can be re-asked alone
+        self.prompt_versions = get_section_versions(self.local_fields, entity_hints=entity_matching == 'hints')
+        # Per-run response quality counters. retries_avoided counts responses that weren't re-requested:
+        # malformed JSON repaired locally, and failures the same request would repeat (refusals, max_tokens cut-offs).
+        self.response_stats = {
+            'responses': 0, 'parse_failures': 0, 'repaired': 0, 'schema_violations': 0, 'retries': 0, 'retries_avoided': 0,
+            'rule_only': 0
+        }
+        # Section re-extraction counters: records checked, up to date, partly or fully re-extracted, failed
+        self.section_stats = {'checked': 0, 'up_to_date': 0, 'partial': 0, 'full': 0, 'failed': 0, 'sections': {}}
+
+        # Token usage of every chat completion made by this extractor
+        self.usage_stats = {'requests': 0, 'prompt_tokens': 0, 'completion_tokens': 0}
+        # The same, per cascade tier, with time spent in API calls and estimated cost (batch requests at the batch discount)
+        self.tier_stats = {
+            tier: {'model': model, 'requests': 0, 'batch_requests': 0, 'prompt_tokens': 0, 'completion_tokens': 0,
+                   'seconds': 0.0, 'estimated_cost_usd': 0.0}
+            for tier, model in (('primary', self.model), ('escalation', self.escalation_model)) if model
+        }
+        # Every call and finished profile, for latency percentiles, throughput and cost
+        self.telemetry = telemetry or ExtractionTelemetry()
+        # Packed-mode counters: requests sent, profiles they covered, profiles that fell back to single calls
+        self.packing_stats = {'packed_requests': 0, 'packed_profiles': 0, 'fallbacks': 0}
+        # Near-duplicate counters: clusters found, profiles copied instead of extracted, prompt tokens not sent
+        self.dedupe_profiles = dedupe_profiles
+        self.dedup_stats = {'clusters': 0, 'duplicates': 0, 'copied': 0, 'est_prompt_tokens_saved': 0}
+
+        # Per output file: records in the output (array + journal) and appends since the last compaction
+        self.journal_state: Dict[str, Dict[str, int]] = {}
+
+        self.response_cache = None
+        if use_response_cache:
+            self.response_cache = response_cache or ResponseCache(os.getenv('TRAIT_RESPONSE_CACHE_DIR', 'llm-response-cache'))
+
+        self.response_archive = None
+        if use_response_archive:
+            self.response_archive = response_archive or ResponseArchive(os.getenv('TRAIT_RESPONSE_ARCHIVE_DIR', 'llm-response-archive'))
+        # Reparse counters: records rebuilt from the archive or rules, kept because responses were missing, failed
+        self.reparse_stats = {'records': 0, 'reparsed': 0, 'rules': 0, 'missing': 0, 'failed': 0}
         
         
     def create_extraction_prompt(self, profile_data: Dict[str, Any]) -> str:
         """Create a simplified prompt with just the profile data."""
-        return json.dumps(profile_data, indent=2)
+        return json.dumps(self.add_entity_hints(profile_data), indent=2)
+
+    def add_entity_hints(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
+        """In 'hints' mode, a copy of the profile with the matcher's results under "entityHints"."""
+        if self.entity_matching != 'hints':
+            return profile_data
+        return {**profile_data, 'entityHints': self.entity_matcher.tag_profile(profile_data)}
     
     def get_system_prompt(self) -> str:
-        """Get the comprehensive system prompt with all extraction guidelines."""
-        return """You are an expert at extracting structured information from LinkedIn profiles. 
-
-Your task is to extract comprehensive traits from LinkedIn profile data and return ONLY a valid JSON object with the specified fields.
-
-REQUIRED JSON FORMAT:
-{
-    "full_name": "Full name from profile",
-    "linkedin_url": "LinkedIn URL from profile",
-    "estimated_age": "A single estimated age based on graduation years (e.g. '30')",
-    "education_stages": {
-        "undergraduate": "University - Degree - Field - Year of Graduation (e.g., 'Stanford University - BS - Computer Science - 2016')",
-        "masters": "University - Degree - Field or null - Year of Graduation or null",
-        "phd": "University - Degree - Field or null - Year of Graduation or null",
-        "other_education": ["Any other certifications, bootcamps, etc."]
-    },
-    "career_insights": {
-        "avg_tenure_per_role": 2.1,
-        "job_hopper": true/false,
-        "total_experience_count": 5,
-        "has_leadership_experience": true/false,
-        "has_previous_c_suite_experience": true/false,
-        "founder_experience_count": 2,
-        "industry_switches": 1,
-        "years_out_of_education": 8,
-        "years_in_industry": 6,
-        "career_summary": "CEO at StartupCo for 3 yrs; VP Product at TechCorp for 2 yrs 6 mos; Senior Engineer at BigTech for 4 yrs"
-    },
-    "company_background": {
-        "notable_companies": ["FAANG, unicorns, top-tier companies"],
-        "startup_companies": ["Early-stage/startup companies"]
-    },
-    "accelerator_and_programs": {
-        "accelerators": ["Y Combinator, Techstars, etc."],
-        "fellowship_programs": ["On Deck, EF, etc."],
-        "board_positions": ["Any board positions"]
-    },
-    "education_career_alignment": {
-        "studies_field": "Primary field of study",
-        "current_field": "Current industry/role focus", 
-        "pivot_description": "Description of career change if applicable"
-    },
-    "personal_brand": {
-        "headline_keywords": ["Key terms from headline"]
-    },
-    "research_and_academic": {
-        "academic_roles": ["Professor, Researcher, etc."],
-    },
-    "international_experience": {
-        "countries_worked": ["List of countries/regions"]
-    },
-    "confidence_score": "High/Medium/Low based on data completeness and clarity"
-}
-
-EXTRACTION GUIDELINES:
-
-1. LINKEDIN URL: Extract the linkedinUrl from the profile data exactly as provided.
-
-2. ESTIMATED AGE: Calculate from graduation years using 2025 as the current year. Most people begin their bachelor's degree at age 18. If no start date is provided for bachelor's, assume it was a 4-year degree (graduating at age 22). If no education dates are present at all, estimate from their EARLIEST work experience, assuming they were 18 at that time. Examples: Bachelor's graduated 2018 = age 29 (2025-2018+22), Earliest work experience 2015 = age 28 (2025-2015+18). Format as a single value.
-
-3. EDUCATION STAGES: Extract all education levels separately. Format as "University - Degree - Field - Year of Graduation". Mark missing stages as null.
-
-4. SENIORITY LEVELS:
-   - Entry: Intern, Junior, Associate, Analyst
-   - Mid: Senior, Lead, Principal, Manager
-   - Senior: Director, VP, Head of
-   - Executive: SVP, EVP, President
-   - C-Suite: CEO, CTO, COO, CMO, etc.
-
-5. CAREER INSIGHTS: 
-   - Job hopper: avg tenure < 2 years
-   - Number of jobs: total number of roles they've had from profile
-   - Industry switches: count distinct industries
-   - Years out of education: Calculate total years since last education completion (undergraduate, masters, or PhD graduation). Use 2025 as current year. If no education dates, estimate from earliest work experience (assuming they were 18 at that time)
-   - Years in industry: Calculate years of experience in their current/primary industry (excluding startup/founder roles). Use 2025 as current year
-   - Career summary: Format as "Title at Company for Duration; Title at Company for Duration" (chronological order, most recent first)
-
-6. COMPANY BACKGROUND: Spot notable companies or startup companies worked in. Quantify the number of startups they've worked in by the number of startup or 'founder' related roles in their work expereince section
-
-7. EDUCATION-CAREER ALIGNMENT: Compare field of study with current work. Identify pivots and unusual career paths.
-
-8. PERSONAL BRAND: Analyze headline and about section for entrepreneurial identity, thought leadership, mission-driven language.
-
-9. RESEARCH/ACADEMIC: Look for PhD, research roles, peer reviewer positions, academic publications.
-
-10. INTERNATIONAL EXPERIENCE: Extract countries/regions from work locations and company descriptions.
-
-NOTABLE COMPANIES INCLUDE:
-Meta, Facebook, Google, Alphabet, Apple, Amazon, Microsoft, Tesla, Stripe, Figma, Notion, OpenAI, Anthropic, Netflix, Nvidia, Intel, AMD, Oracle, IBM, Salesforce, Adobe, Uber, Lyft, Snap, Twitter, X Corp, Spotify, Airbnb, Shopify, Square, Block, PayPal, Dropbox, Slack, Cloudflare, Zoom, Palantir, Snowflake, Atlassian, Twilio, Coinbase, Reddit, SpaceX, ByteDance, TikTok, Discord, Databricks, Canva, Instacart, Klarna, Revolut, N26, Checkout.com, GitLab, Nubank, Celonis, Getir, Gorillas, Rappi, Flink, Miro, ClickUp, Postman, Loom, DeepL, Lemonade, Brex, Robinhood, Remote, Deel, Rippling, Scale AI, Samsara, Perplexity, Hugging Face, Character AI, Cohere, Runway, Adept AI, Grok, DeepMind, Quora, Linear, Glovo, Bunq, Zeco, Tink, Mollie, Bitpanda, Wefox, Ledger, Vinted, Tado, Back Market, Oviva, Sennder, Sorare, Tier Mobility, Voi, Sknups, TrueLayer, Habito, Gousto, Factorial, Railway, Jobandtalent, Paysend, Ormatek, Frichti, and many more unicorns and top-tier tech companies.
-
-ACCELERATOR PROGRAMS INCLUDE:
-Y Combinator, YC, Techstars, Antler, Entrepreneur First, EF, On Deck, Sequoia Scout, Greylock, A16Z, Andreessen Horowitz, Onstage, General Catalyst, Accel, Founders Fund, First Round, Index Ventures, Bessemer Venture Partners, Lightspeed, Neo, South Park Commons, Initialized Capital, Craft Ventures, Social Capital, 8VC, Atomic, Village Global, Pear VC, UpWest Labs, Fifty Years, Nascent, Prelude Ventures, Acrew Capital, Homebrew, Shrug Capital, F.inc, Founders Inc, Signal Fire, Boost VC, Founder Collective, Seedcamp, Station F, Backed VC, LocalGlobe, Kindred Capital, Crane Venture Partners, Balderton Capital, Hoxton Ventures, Point Nine, Speedinvest, Pentech, Tech Nation, Startup Wise Guys, European Innovation Council, Rockstart, Founders Factory, La Famille, Startupbootcamp, Bethnal Green Ventures, Future Positive Capital, Alchemist Accelerator, StartupYard, Berkeley SkyDeck, MassChallenge, and many more accelerators and incubators.
-
-
-STARTUP INDICATORS: 
-- Small team size mentions
-- "Stealth mode" companies  
-- Early employee numbers (#1-50)
-- Pre-seed, seed, Series A mentions
-- Equity compensation mentions
-- "Building from scratch" language
-
-LEADERSHIP INDICATORS:
-- Team size management
-- Budget responsibility  
-- P&L ownership
-- "Led team of X"
-- Hiring/firing authority
-- Strategic planning role
-
-AGE CALCULATION METHODOLOGY:
-- Current year: 2025
-- Standard bachelor's degree: 4 years (age 18-22)
-- If bachelor's graduation year provided: Age = 2025 - graduation_year + 22
-- If no education dates but work experience exists: Age = 2025 - earliest_work_year + 18
-- If only master's/PhD graduation: Use that graduation year + appropriate age (typically 24 for master's, 28 for PhD)
-- If no dates at all: Use earliest work experience year + 18
-
-IMPORTANT: Return ONLY the JSON object, no additional text or markdown formatting. Be thorough in your analysis but conservative in your claims. IF YOU ARE EVER UNSURE, JUST PUT IN A VALUE OF "-1" FOR STRINGS, AND -1 FOR NUMBERS"""
+        """
+        Get the comprehensive system prompt with all extraction guidelines (see trait_prompt.py).
+        With the rule engine on, the instructions for locally computed fields are left out.
+        """
+        return build_system_prompt(self.local_fields, entity_hints=self.entity_matching == 'hints')
     
+    def build_request_kwargs(self, profile_data: Dict[str, Any], model: Optional[str] = None) -> Dict[str, Any]:
+        """Chat-completions arguments for extracting traits from one profile (with the primary model by default)."""
+        return {
+            'model': model or self.model,
+            'messages': [
+                {
+                    "role": "system", 
+                    "content": self.get_system_prompt()
+                },
+                {"role": "user", "content": self.create_extraction_prompt(profile_data)}
+            ],
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens,
+            **self.get_response_format_kwargs(self.traits_schema, 'linkedin_traits')
+        }
+
+    def get_response_format_kwargs(self, schema: Dict[str, Any], name: str) -> Dict[str, Any]:
+        """response_format request argument for `schema`, or nothing when structured output is off."""
+        if not self.use_structured_output:
+            return {}
+        return {'response_format': build_response_format(schema, name)}
+
+    def get_packed_system_prompt(self) -> str:
+        """System prompt for packed requests: the normal guidelines plus the multi-profile output format."""
+        return self.get_system_prompt() + """
+
+MULTIPLE PROFILES:
+The user message is a JSON array of LinkedIn profiles. Analyse each profile independently using all of the guidelines above.
+Return ONLY a JSON object of the form {"profiles": [ ... ]} with exactly one object per input profile, each in the REQUIRED JSON FORMAT above.
+Set "linkedin_url" in each object to that profile's "linkedinUrl" exactly as given, so results can be matched back to profiles."""
+
+    def build_packed_request_kwargs(self, profiles: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Chat-completions arguments for extracting traits from several profiles in one request."""
+        return {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": self.get_packed_system_prompt()},
+                {"role": "user", "content": json.dumps([self.add_entity_hints(profile) for profile in profiles], indent=2)}
+            ],
+            'temperature': self.temperature,
+            'max_tokens': min(self.max_tokens * len(profiles), self.PACKED_MAX_TOKENS),
+            **self.get_response_format_kwargs(self.packed_traits_schema, 'linkedin_traits_packed')
+        }
+
+    def validate_traits_record(self, item: Any) -> bool:
+        """True if `item` looks like a complete trait record: named, with every section as an object."""
+        if not isinstance(item, dict) or not item.get('full_name') or not item.get('linkedin_url'):
+            return False
+        return all(isinstance(item.get(section), dict) for section in self.REQUIRED_TRAIT_SECTIONS)
+
+    def parse_packed_response(self, content: str, profiles: List[Dict[str, Any]]) -> Dict[str, Tuple[ExtractedTraits, str]]:
+        """
+        Match the records of a packed response back to their profiles by LinkedIn URL.
+
+        Returns:
+            {linkedinUrl: (ExtractedTraits, record JSON)} for every record that passed validation.
+            Profiles that are missing, invalid or break the schema are simply absent. If the
+            response had to be repaired, every record from it is flagged json_repaired.
+
+        Raises:
+            json.JSONDecodeError: if the response isn't valid JSON and can't be repaired
+        """
+        # A packed response cut off at max_tokens still yields every record before the cut
+        data, repairs = repair_json(content)
+        records = data.get('profiles', []) if isinstance(data, dict) else data
+        profiles_by_url = {profile.get('linkedinUrl', '').strip(): profile for profile in profiles}
+
+        matched = {}
+        for item in records if isinstance(records, list) else []:
+            if not self.validate_traits_record(item):
+                continue
+            profile_url = str(item['linkedin_url']).strip()
+            if profile_url in profiles_by_url and profile_url not in matched:
+                record_json = json.dumps(item, ensure_ascii=False)
+                traits = self.parse_traits_response(record_json, profiles_by_url[profile_url])
+                if traits.extraction_metadata.get('schema_violations'):
+                    # Left to the single-profile fallback rather than cached
+                    continue
+                if repairs:
+                    traits.extraction_metadata.update({'json_repaired': True, 'json_repairs': list(repairs)})
+                matched[profile_url] = (traits, record_json)
+        if repairs and matched:
+            self.response_stats['repaired'] += 1
+            print(f"🔧 Repaired malformed packed response: {', '.join(repairs)}")
+        return matched
+
+    def parse_traits_response(self, content: str, profile_data: Dict[str, Any]) -> ExtractedTraits:
+        """
+        Turn the model's response text into an ExtractedTraits object.
+
+        Malformed responses (markdown fences, surrounding prose, trailing commas, truncation)
+        are repaired locally; repaired records are flagged in extraction_metadata.
+
+        Raises:
+            json.JSONDecodeError: if the response isn't valid JSON and can't be repaired
+        """
+        traits_data, repairs = repair_json(content)
+        if not isinstance(traits_data, dict):
+            raise json.JSONDecodeError('Response is not a JSON object', content, 0)
+
+        # Structured output should make this impossible, but responses from the cache, batches
+        # or unconstrained requests get the same check
+        schema_errors = validate_against_schema(traits_data, self.traits_schema)
+        metadata = {'json_repaired': True, 'json_repairs': repairs} if repairs else {}
+        metadata['prompt_versions'] = dict(self.prompt_versions)
+        if schema_errors:
+            metadata['schema_violations'] = len(schema_errors)
+            self.response_stats['schema_violations'] += 1
+            print(f"Response for {profile_data.get('fullName', 'Unknown')} doesn't match the traits schema: {'; '.join(schema_errors[:3])}")
+
+        self.apply_local_traits(traits_data, profile_data)
+        
+        # Validate and create ExtractedTraits object
+        return ExtractedTraits(
+            full_name=traits_data.get('full_name', profile_data.get('fullName', 'Unknown')),
+            linkedin_url=traits_data.get('linkedin_url', profile_data.get('linkedinUrl', 'not found')),
+            estimated_age=traits_data.get('estimated_age'),
+            education_stages=traits_data.get('education_stages', {}),
+            career_insights=traits_data.get('career_insights', {}),
+            company_background=traits_data.get('company_background', {}),
+            accelerator_and_programs=traits_data.get('accelerator_and_programs', {}),
+            education_career_alignment=traits_data.get('education_career_alignment', {}),
+            personal_brand=traits_data.get('personal_brand', {}),
+            research_and_academic=traits_data.get('research_and_academic', {}),
+            international_experience=traits_data.get('international_experience', {}),
+            confidence_score=traits_data.get('confidence_score', 'Low'),
+            extraction_metadata=metadata
+        )
+
+    def apply_local_traits(self, traits_data: Dict[str, Any], profile_data: Dict[str, Any]):
+        """Overwrite a record's locally computed fields: rule traits, and matched entities in 'replace' mode."""
+        # Computed fields always come from the rule engine, never from the model
+        if self.use_rule_engine:
+            merge_rule_traits(traits_data, compute_rule_traits(profile_data))
+        if self.entity_matching == 'replace':
+            merge_entity_matches(traits_data, self.entity_matcher.tag_profile(profile_data))
+
+    def get_cache_key(self, profile_data: Dict[str, Any], packed: bool = False, model: Optional[str] = None) -> str:
+        """
+        Response cache key for this profile under the current prompt and request settings.
+        Packed answers are keyed separately, since they come from a different prompt, and so
+        are escalation model answers.
+        """
+        if packed:
+            system_prompt = self.get_packed_system_prompt()
+            response_format = self.get_response_format_kwargs(self.packed_traits_schema, 'linkedin_traits_packed').get('response_format')
+        else:
+            system_prompt = self.get_system_prompt()
+            response_format = self.get_response_format_kwargs(self.traits_schema, 'linkedin_traits').get('response_format')
+        return make_cache_key(system_prompt, model or self.model, self.temperature, self.max_tokens, profile_data, response_format)
+
+    def get_rule_only_traits(self, profile_data: Dict[str, Any]) -> Optional[ExtractedTraits]:
+        """Traits built by the rule engine alone, for profiles with no free text for the model to read."""
+        if not self.rule_only_profiles or has_free_text(profile_data):
+            return None
+        self.response_stats['rule_only'] += 1
+        record = build_rule_only_record(profile_data)
+        if self.entity_matcher:
+            merge_entity_matches(record, self.entity_matcher.tag_profile(profile_data))
+        traits = traits_from_dict(record)
+        traits.extraction_metadata = {'source': 'rules'}
+        return traits
+
+    def check_rule_only_profiles(self, profiles: List[Dict[str, Any]]):
+        """
+        Only skip the model for profiles without free text when the input kept the text fields.
+        With the 'lean' cleaning schema no profile has an about section or descriptions, and
+        the model still has headlines and titles to judge.
+        """
+        if not self.use_rule_engine:
+            return
+        self.rule_only_profiles = text_fields_kept(profiles)
+        if not self.rule_only_profiles and profiles:
+            print("⚠️ No profile has an about section or descriptions (cleaned with the 'lean' schema?); "
+                  "every profile goes to the model instead of rule-only records")
+
+    def get_traits_without_api(self, profile_data: Dict[str, Any], packed: bool = False) -> Optional[ExtractedTraits]:
+        """Traits that need no API call: rule-only for profiles without free text, else a cached response."""
+        return self.get_rule_only_traits(profile_data) or self.get_cached_traits(profile_data, packed)
+
+    def get_cached_traits(
+        self, profile_data: Dict[str, Any], packed: bool = False, model: Optional[str] = None
+    ) -> Optional[ExtractedTraits]:
+        """Traits from a stored response for exactly this request, or None if there isn't one."""
+        if not self.response_cache:
+            return None
+        key = self.get_cache_key(profile_data, packed, model)
+        content = self.response_cache.get(key)
+        if content is None:
+            return None
+        try:
+            traits = self.parse_traits_response(content, profile_data)
+        except json.JSONDecodeError:
+            self.response_cache.delete(key)
+            return None
+        if self.get_incomplete_reason(traits.extraction_metadata):
+            # Cached before incomplete responses were kept out of the cache
+            self.response_cache.delete(key)
+            return None
+        self.archive_traits_response(traits, profile_data, content, packed, model)
+        return self.mark_model_tier(traits, model or self.model)
+
+    @staticmethod
+    def get_incomplete_reason(metadata: Dict[str, Any]) -> Optional[str]:
+        """
+        Why a parsed response can't be trusted as a whole: 'truncated' if repair had to close a
+        cut-off response, 'schema_invalid' if it breaks the schema. None for complete responses.
+        Incomplete responses are never cached, so later runs ask again instead of reusing them.
+        """
+        if 'closed_truncated' in metadata.get('json_repairs', []):
+            return 'truncated'
+        if metadata.get('schema_violations'):
+            return 'schema_invalid'
+        return None
+
+    def cache_response(self, profile_data: Dict[str, Any], content: str, packed: bool = False, model: Optional[str] = None):
+        """Store a successfully parsed response so the same request is never paid for twice."""
+        if self.response_cache:
+            self.response_cache.put(self.get_cache_key(profile_data, packed, model), content, {'model': model or self.model})
+
+    def archive_response(
+        self, profile_data: Dict[str, Any], system_prompt: str, model: str, content: str, sections: Optional[List[str]] = None
+    ) -> Optional[str]:
+        """Archive a raw response, returning its archive key (None with the archive off or on a write error)."""
+        if not self.response_archive:
+            return None
+        try:
+            return self.response_archive.put(
+                profile_data.get('linkedinUrl', ''), system_prompt, model, content, {'sections': sections} if sections else None
+            )
+        except OSError as e:
+            print(f"Error archiving response: {e}")
+            return None
+
+    def archive_traits_response(
+        self, traits: ExtractedTraits, profile_data: Dict[str, Any], content: str, packed: bool = False, model: Optional[str] = None
+    ):
+        """Archive the response `traits` were parsed from and note its key in their metadata."""
+        system_prompt = self.get_packed_system_prompt() if packed else self.get_system_prompt()
+        key = self.archive_response(profile_data, system_prompt, model or self.model, content)
+        if key:
+            traits.extraction_metadata['archived_responses'] = [key]
+
+    def get_model_tier(self, model: str) -> str:
+        """'escalation' for the escalation model, 'primary' otherwise."""
+        return 'escalation' if self.escalation_model and model == self.escalation_model else 'primary'
+
+    def mark_model_tier(self, traits: Optional[ExtractedTraits], model: str) -> Optional[ExtractedTraits]:
+        """Record which model (and cascade tier) produced `traits`."""
+        if traits:
+            traits.extraction_metadata.update({'model': model, 'model_tier': self.get_model_tier(model)})
+        return traits
+
+    def get_escalation_reason(self, traits: Optional[ExtractedTraits]) -> Optional[str]:
+        """Why a primary-model result should be re-extracted with the escalation model, or None if it shouldn't."""
+        if not self.escalation_model:
+            return None
+        if traits is None:
+            return 'failed'
+        metadata = traits.extraction_metadata
+        if metadata.get('source') == 'rules' or metadata.get('model_tier') == 'escalation':
+            return None
+        if metadata.get('schema_violations'):
+            return 'schema_invalid'
+        if str(traits.confidence_score).strip().lower() == 'low':
+            return 'low_confidence'
+        return None
+
+    def start_escalation(self, profile_data: Dict[str, Any], reason: str):
+        self.cascade_stats['escalated'] += 1
+        self.cascade_stats['reasons'][reason] = self.cascade_stats['reasons'].get(reason, 0) + 1
+        print(f"⬆️ Escalating {profile_data.get('fullName', 'Unknown')} to {self.escalation_model} ({reason})")
+
+    def finish_escalation(
+        self, traits: Optional[ExtractedTraits], escalated: Optional[ExtractedTraits], reason: str
+    ) -> Optional[ExtractedTraits]:
+        """The escalated result, noting what it replaced, or the primary one if escalation failed."""
+        if escalated is None:
+            return traits
+        self.cascade_stats['replaced'] += 1
+        escalated.extraction_metadata['escalated_from'] = {
+            'model': self.model,
+            'reason': reason,
+            'confidence_score': traits.confidence_score if traits else None
+        }
+        return escalated
+
+    def escalate_traits(self, profile_data: Dict[str, Any], traits: Optional[ExtractedTraits]) -> Optional[ExtractedTraits]:
+        """Re-extract with the escalation model if the primary result calls for it."""
+        reason = self.get_escalation_reason(traits)
+        if not reason:
+            return traits
+        self.start_escalation(profile_data, reason)
+        return self.finish_escalation(traits, self.extract_traits_with_model(profile_data, self.escalation_model), reason)
+
+    async def escalate_traits_async(
+        self, profile_data: Dict[str, Any], traits: Optional[ExtractedTraits], client: AsyncOpenAI
+    ) -> Optional[ExtractedTraits]:
+        """Async version of escalate_traits."""
+        reason = self.get_escalation_reason(traits)
+        if not reason:
+            return traits
+        self.start_escalation(profile_data, reason)
+        escalated = await self.extract_traits_with_model_async(profile_data, client, self.escalation_model)
+        return self.finish_escalation(traits, escalated, reason)
+
+    def is_refusal(self, choice) -> bool:
+        """True if the model refused to answer. It will refuse the same input again, so there is no retry."""
+        refusal = getattr(choice.message, 'refusal', None)
+        if refusal:
+            self.response_stats['retries_avoided'] += 1
+            print(f"Model refused to extract traits: {refusal}")
+        return bool(refusal)
+
+    def can_retry(self, choice) -> bool:
+        """Whether re-requesting an unusable answer could help: not if it was cut off at max_tokens, as it would be again."""
+        if getattr(choice, 'finish_reason', None) == 'length':
+            self.response_stats['retries_avoided'] += 1
+            return False
+        return True
+
+    def process_completion(
+        self, response, profile_data: Dict[str, Any], model: Optional[str] = None
+    ) -> Tuple[Optional[ExtractedTraits], bool]:
+        """
+        Turn one chat completion into traits, caching it if it is complete.
+
+        Returns:
+            (traits or None, whether re-requesting could help). Incomplete responses (see
+            get_incomplete_reason) come back with their traits and True, unless the model hit
+            max_tokens and would be cut off again.
+        """
+        self.response_stats['responses'] += 1
+        choice = response.choices[0]
+        if self.is_refusal(choice):
+            return None, False
+
+        content = choice.message.content
+        try:
+            traits = self.parse_traits_response(content, profile_data)
+        except json.JSONDecodeError as e:
+            self.response_stats['parse_failures'] += 1
+            print(f"JSON parsing error: {e}")
+            print(f"Response content: {content}")
+            return None, self.can_retry(choice)
+
+        incomplete = self.get_incomplete_reason(traits.extraction_metadata)
+        repairs = traits.extraction_metadata.get('json_repairs', [])
+        if repairs:
+            self.response_stats['repaired'] += 1
+            # Fence stripping always happened; anything else used to fail parsing and cost a retry
+            if set(repairs) - {'stripped_fences'} and not incomplete:
+                self.response_stats['retries_avoided'] += 1
+            print(f"🔧 Repaired malformed response: {', '.join(repairs)}")
+
+        self.archive_traits_response(traits, profile_data, content, model=model)
+        traits = self.mark_model_tier(traits, model or self.model)
+        if incomplete:
+            # Kept only as a fallback for this run; another attempt (or the escalation model) may do better
+            print(f"⚠️ Incomplete response ({incomplete}), not caching it")
+            return traits, self.can_retry(choice)
+
+        self.cache_response(profile_data, content, model=model)
+        return traits, False
+
+    def record_usage(self, response, model: Optional[str] = None, seconds: float = 0.0, retries: int = 0):
+        """Record a chat completion's token usage and latency (see record_tokens)."""
+        usage = getattr(response, 'usage', None)
+        self.record_tokens(
+            model or self.model,
+            getattr(usage, 'prompt_tokens', 0) or 0,
+            getattr(usage, 'completion_tokens', 0) or 0,
+            getattr(getattr(usage, 'prompt_tokens_details', None), 'cached_tokens', 0) or 0,
+            seconds, retries
+        )
+
+    def record_batch_usage(self, body: Dict[str, Any]):
+        """Record the token usage of one batch result line's response body, at the batch discount."""
+        usage = body.get('usage') or {}
+        self.record_tokens(
+            body.get('model') or self.model,
+            usage.get('prompt_tokens', 0) or 0,
+            usage.get('completion_tokens', 0) or 0,
+            (usage.get('prompt_tokens_details') or {}).get('cached_tokens', 0) or 0,
+            batch=True
+        )
+
+    def record_tokens(
+        self, model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0,
+        seconds: float = 0.0, retries: int = 0, batch: bool = False
+    ):
+        """
+        Add one completion's token usage to usage_stats, with its latency and estimated cost to
+        its tier's tier_stats, and record the call in telemetry.
+        """
+        tier = self.get_model_tier(model)
+        self.telemetry.record_call(
+            model, seconds, prompt_tokens, completion_tokens, cached_tokens, retries=retries, tier=tier, batch=batch
+        )
+        for stats in (self.usage_stats, self.tier_stats[tier]):
+            stats['requests'] += 1
+            stats['prompt_tokens'] += prompt_tokens
+            stats['completion_tokens'] += completion_tokens
+        self.tier_stats[tier]['batch_requests'] += batch
+        self.tier_stats[tier]['seconds'] += seconds
+        self.tier_stats[tier]['estimated_cost_usd'] += estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens, batch)
+
+    def get_tier_report(self) -> Dict[str, Dict[str, Any]]:
+        """Per cascade tier: requests, tokens, average latency and estimated cost (model_pricing.py)."""
+        report = {}
+        for tier, stats in self.tier_stats.items():
+            # Batch results have no latency of their own
+            timed_requests = stats['requests'] - stats['batch_requests']
+            report[tier] = {
+                **stats,
+                'seconds': round(stats['seconds'], 2),
+                'avg_latency_seconds': round(stats['seconds'] / timed_requests, 3) if timed_requests else 0,
+                'estimated_cost_usd': round(stats['estimated_cost_usd'], 4)
+            }
+        return report
+
+    def create_async_client(self) -> AsyncOpenAI:
+        """Async client for one event loop, configured like self.client."""
+        return AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+
+    def record_failed_call(self, request_kwargs: Dict[str, Any], started: float, retries: int):
+        """Record a call that raised in telemetry."""
+        model = request_kwargs.get('model') or self.model
+        self.telemetry.record_call(
+            model, time.perf_counter() - started, retries=retries, tier=self.get_model_tier(model), status='error'
+        )
+
+    def get_rate_governor(self, model: Optional[str] = None) -> OpenAIRateGovernor:
+        """Governor for calls to `model`: each model has its own OpenAI limits."""
+        if not model or model == self.model:
+            return self.rate_governor
+        return get_shared_governor(self.base_url, model)
+
+    def call_chat_completion(self, request_kwargs: Dict[str, Any], attempt: int = 0):
+        """
+        Send one chat completion through the model's shared rate governor.
+
+        Waits for RPM/TPM budget, feeds the response's rate-limit headers back to the governor
+        and waits out 429s (Retry-After) without counting them as failed attempts.
+        `attempt` is the caller's retry number, recorded in telemetry together with 429 retries.
+        """
+        rate_governor = self.get_rate_governor(request_kwargs.get('model'))
+        estimated_tokens = rate_governor.estimate_tokens(request_kwargs)
+        for rate_limit_retry in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            rate_governor.acquire(estimated_tokens)
+            started = time.perf_counter()
+            try:
+                raw_response = self.client.chat.completions.with_raw_response.create(**request_kwargs)
+            except RateLimitError as e:
+                if rate_limit_retry == self.MAX_RATE_LIMIT_RETRIES:
+                    self.record_failed_call(request_kwargs, started, attempt + rate_limit_retry)
+                    raise
+                wait = rate_governor.record_rate_limited(e.response.headers)
+                print(f"Rate limited by OpenAI, pausing all extraction for {wait:.1f}s")
+                continue
+            except Exception:
+                self.record_failed_call(request_kwargs, started, attempt + rate_limit_retry)
+                raise
+            rate_governor.update_from_headers(raw_response.headers)
+            response = raw_response.parse()
+            rate_governor.settle(estimated_tokens, getattr(response.usage, 'total_tokens', None))
+            self.record_usage(response, request_kwargs.get('model'), time.perf_counter() - started, attempt + rate_limit_retry)
+            return response
+
+    async def call_chat_completion_async(self, client: AsyncOpenAI, request_kwargs: Dict[str, Any], attempt: int = 0):
+        """Async version of call_chat_completion."""
+        rate_governor = self.get_rate_governor(request_kwargs.get('model'))
+        estimated_tokens = rate_governor.estimate_tokens(request_kwargs)
+        for rate_limit_retry in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            await rate_governor.acquire_async(estimated_tokens)
+            started = time.perf_counter()
+            try:
+                if self.request_semaphore:
+                    async with self.request_semaphore:
+                        raw_response = await client.chat.completions.with_raw_response.create(**request_kwargs)
+                else:
+                    raw_response = await client.chat.completions.with_raw_response.create(**request_kwargs)
+            except RateLimitError as e:
+                if rate_limit_retry == self.MAX_RATE_LIMIT_RETRIES:
+                    self.record_failed_call(request_kwargs, started, attempt + rate_limit_retry)
+                    raise
+                wait = rate_governor.record_rate_limited(e.response.headers)
+                print(f"Rate limited by OpenAI, pausing all extraction for {wait:.1f}s")
+                continue
+            except Exception:
+                self.record_failed_call(request_kwargs, started, attempt + rate_limit_retry)
+                raise
+            rate_governor.update_from_headers(raw_response.headers)
+            response = raw_response.parse()
+            rate_governor.settle(estimated_tokens, getattr(response.usage, 'total_tokens', None))
+            self.record_usage(response, request_kwargs.get('model'), time.perf_counter() - started, attempt + rate_limit_retry)
+            return response
+
     def extract_traits_from_profile(self, profile_data: Dict[str, Any], max_retries: int = 2) -> Optional[ExtractedTraits]:
         """
         Extract traits from a single profile using OpenAI API.
+
+        Runs the primary model and, when an escalation model is set, re-extracts results the
+        primary model was unsure about (see get_escalation_reason) with it.
         
         Args:
             profile_data: Cleaned LinkedIn profile data
@@ -286,70 +901,378 @@ IMPORTANT: Return ONLY the JSON object, no additional text or markdown formattin
         Returns:
             ExtractedTraits object or None if extraction fails
         """
-        prompt = self.create_extraction_prompt(profile_data)
+        rule_traits = self.get_rule_only_traits(profile_data)
+        if rule_traits:
+            print("📐 No free text, traits computed by rules")
+            return rule_traits
+
+        traits = self.extract_traits_with_model(profile_data, self.model, max_retries)
+        return self.escalate_traits(profile_data, traits)
+
+    def extract_traits_with_model(self, profile_data: Dict[str, Any], model: str, max_retries: int = 2) -> Optional[ExtractedTraits]:
+        """One cascade tier of extract_traits_from_profile: a cached response or API calls to `model`."""
+        if self.split_sections:
+            return self.extract_traits_split(profile_data, model, max_retries)
+        cached_traits = self.get_cached_traits(profile_data, model=model)
+        if cached_traits:
+            print(f"♻️ Reused cached response")
+            return cached_traits
+
+        request_kwargs = self.build_request_kwargs(profile_data, model)
+        # An incomplete result is retried, but still returned if no attempt does better
+        fallback = None
         
         for attempt in range(max_retries):
             try:
-                response = self.client.chat.completions.create(
-                    model="gpt-4o-mini",  # Using gpt-4o-mini for cost efficiency
-                    messages=[
-                        {
-                            "role": "system", 
-                            "content": self.get_system_prompt()
-                        },
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.1,  # Low temperature for consistent extraction # basically will be more accurate to the data given. 
-                    max_tokens=4000
-                )
+                response = self.call_chat_completion(request_kwargs, attempt)
                 
                 # Parse the response
-                content = response.choices[0].message.content.strip()
-                
-                # Try to extract JSON from response
-                try:
-                    # Remove potential markdown formatting
-                    if content.startswith('```json'):
-                        content = content[7:]
-                    if content.startswith('```'):
-                        content = content[3:]
-                    if content.endswith('```'):
-                        content = content[:-3]
-                    
-                    traits_data = json.loads(content.strip())
-                    
-                    # Validate and create ExtractedTraits object
-                    return ExtractedTraits(
-                        full_name=traits_data.get('full_name', profile_data.get('fullName', 'Unknown')),
-                        linkedin_url=traits_data.get('linkedin_url', profile_data.get('linkedinUrl', 'not found')),
-                        estimated_age=traits_data.get('estimated_age'),
-                        education_stages=traits_data.get('education_stages', {}),
-                        career_insights=traits_data.get('career_insights', {}),
-                        company_background=traits_data.get('company_background', {}),
-                        accelerator_and_programs=traits_data.get('accelerator_and_programs', {}),
-                        education_career_alignment=traits_data.get('education_career_alignment', {}),
-                        personal_brand=traits_data.get('personal_brand', {}),
-                        research_and_academic=traits_data.get('research_and_academic', {}),
-                        international_experience=traits_data.get('international_experience', {}),
-                        confidence_score=traits_data.get('confidence_score', 'Low')
-                    )
-                    
-                except json.JSONDecodeError as e:
-                    print(f"JSON parsing error on attempt {attempt + 1}: {e}")
-                    print(f"Response content: {content}")
-                    if attempt == max_retries - 1:
-                        return None
-                    continue
+                traits, should_retry = self.process_completion(response, profile_data, model)
+                if not should_retry or attempt == max_retries - 1:
+                    return traits or fallback
+                fallback = traits or fallback
+                self.response_stats['retries'] += 1
+                continue
                     
             except Exception as e:
                 print(f"API call error on attempt {attempt + 1}: {e}")
                 if attempt == max_retries - 1:
-                    return None
+                    return fallback
                 time.sleep(2 ** attempt)  # Exponential backoff
                 continue
         
-        return None
+        return fallback
+
+    async def extract_traits_from_profile_async(
+        self,
+        profile_data: Dict[str, Any],
+        client: AsyncOpenAI,
+        max_retries: int = 2
+    ) -> Optional[ExtractedTraits]:
+        """
+        Async version of extract_traits_from_profile, using the async OpenAI client.
+        
+        Args:
+            profile_data: Cleaned LinkedIn profile data
+            client: AsyncOpenAI client for the current event loop
+            max_retries: Maximum number of API call retries
+            
+        Returns:
+            ExtractedTraits object or None if extraction fails
+        """
+        rule_traits = self.get_rule_only_traits(profile_data)
+        if rule_traits:
+            print("📐 No free text, traits computed by rules")
+            return rule_traits
+
+        traits = await self.extract_traits_with_model_async(profile_data, client, self.model, max_retries)
+        return await self.escalate_traits_async(profile_data, traits, client)
+
+    async def extract_traits_with_model_async(
+        self,
+        profile_data: Dict[str, Any],
+        client: AsyncOpenAI,
+        model: str,
+        max_retries: int = 2
+    ) -> Optional[ExtractedTraits]:
+        """Async version of extract_traits_with_model."""
+        if self.split_sections:
+            return await self.extract_traits_split_async(profile_data, client, model, max_retries)
+        cached_traits = self.get_cached_traits(profile_data, model=model)
+        if cached_traits:
+            print(f"♻️ Reused cached response")
+            return cached_traits
+
+        request_kwargs = self.build_request_kwargs(profile_data, model)
+        fallback = None
+
+        for attempt in range(max_retries):
+            try:
+                response = await self.call_chat_completion_async(client, request_kwargs, attempt)
+
+                traits, should_retry = self.process_completion(response, profile_data, model)
+                if not should_retry or attempt == max_retries - 1:
+                    return traits or fallback
+                fallback = traits or fallback
+                self.response_stats['retries'] += 1
+                continue
+
+            except Exception as e:
+                print(f"API call error on attempt {attempt + 1}: {e}")
+                if attempt == max_retries - 1:
+                    return fallback
+                await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                continue
+
+        return fallback
     
+    def build_section_request_kwargs(
+        self, profile_data: Dict[str, Any], sections: List[str], model: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Chat-completions arguments that only ask for `sections` of one profile's trait record."""
+        schema = build_traits_json_schema(ExtractedTraits, self.local_fields, sections)
+        return {
+            'model': model or self.model,
+            'messages': [
+                {"role": "system", "content": build_section_prompt(sections, self.local_fields, self.entity_matching == 'hints')},
+                {"role": "user", "content": self.create_extraction_prompt(profile_data)}
+            ],
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens,
+            **self.get_response_format_kwargs(schema, 'linkedin_traits_sections')
+        }
+
+    def parse_section_response(self, content: str, profile_data: Dict[str, Any], sections: List[str]) -> Dict[str, Any]:
+        """
+        The requested sections (and confidence_score) from a section request's response, with
+        the number of schema violations under 'schema_violations' and the JSON repairs applied
+        under 'json_repairs' if there were any.
+
+        Raises:
+            json.JSONDecodeError: if the response isn't valid JSON, can't be repaired or lacks a requested section
+        """
+        data, repairs = repair_json(content)
+        if not isinstance(data, dict):
+            raise json.JSONDecodeError('Response is not a JSON object', content, 0)
+        missing = [section for section in sections if section in TRAIT_SECTIONS and not isinstance(data.get(section), dict)]
+        if missing:
+            raise json.JSONDecodeError(f"Response is missing sections {missing}", content, 0)
+
+        schema_errors = validate_against_schema(data, build_traits_json_schema(ExtractedTraits, self.local_fields, sections))
+        if schema_errors:
+            self.response_stats['schema_violations'] += 1
+            print(f"Section response for {profile_data.get('fullName', 'Unknown')} doesn't match the schema: {'; '.join(schema_errors[:3])}")
+        values = {key: data[key] for key in list(sections) + ['confidence_score'] if key in data}
+        if schema_errors:
+            values['schema_violations'] = len(schema_errors)
+        if repairs:
+            values['json_repairs'] = repairs
+        return values
+
+    def get_cached_sections(
+        self, request_kwargs: Dict[str, Any], profile_data: Dict[str, Any], sections: List[str]
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """(cache key, cached section values or None) for a section request. The key is None with the cache off."""
+        if not self.response_cache:
+            return None, None
+        cache_key = make_cache_key(
+            request_kwargs['messages'][0]['content'], request_kwargs['model'], self.temperature, self.max_tokens,
+            profile_data, request_kwargs.get('response_format')
+        )
+        content = self.response_cache.get(cache_key)
+        if content is not None:
+            try:
+                values = self.parse_section_response(content, profile_data, sections)
+            except json.JSONDecodeError:
+                self.response_cache.delete(cache_key)
+                return cache_key, None
+            if self.get_incomplete_reason(values):
+                self.response_cache.delete(cache_key)
+                return cache_key, None
+            values['archived_response'] = self.archive_response(
+                profile_data, request_kwargs['messages'][0]['content'], request_kwargs['model'], content, sections
+            )
+            return cache_key, values
+        return cache_key, None
+
+    def process_section_completion(
+        self, response, request_kwargs: Dict[str, Any], profile_data: Dict[str, Any], sections: List[str], cache_key: Optional[str]
+    ) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Section values from one chat completion, archiving it and caching it if it is complete.
+
+        Returns:
+            (values or None, whether re-requesting could help), decided like process_completion
+        """
+        self.response_stats['responses'] += 1
+        choice = response.choices[0]
+        if self.is_refusal(choice):
+            return None, False
+
+        content = choice.message.content
+        try:
+            values = self.parse_section_response(content, profile_data, sections)
+        except json.JSONDecodeError as e:
+            self.response_stats['parse_failures'] += 1
+            print(f"JSON parsing error: {e}")
+            return None, self.can_retry(choice)
+
+        if values.get('json_repairs'):
+            self.response_stats['repaired'] += 1
+            print(f"🔧 Repaired malformed section response: {', '.join(values['json_repairs'])}")
+        values['archived_response'] = self.archive_response(
+            profile_data, request_kwargs['messages'][0]['content'], request_kwargs['model'], content, sections
+        )
+        incomplete = self.get_incomplete_reason(values)
+        if incomplete:
+            print(f"⚠️ Incomplete section response ({incomplete}), not caching it")
+            return values, self.can_retry(choice)
+
+        if cache_key:
+            self.response_cache.put(cache_key, content, {'model': request_kwargs['model']})
+        return values, False
+
+    def extract_sections(
+        self, profile_data: Dict[str, Any], sections: List[str], model: Optional[str] = None, max_retries: int = 2
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Ask the model for only some sections of a profile's trait record.
+
+        Returns:
+            {section: values, 'confidence_score': ...} or None if extraction fails
+        """
+        request_kwargs = self.build_section_request_kwargs(profile_data, sections, model)
+        cache_key, values = self.get_cached_sections(request_kwargs, profile_data, sections)
+        if values:
+            return values
+
+        fallback = None
+        for attempt in range(max_retries):
+            try:
+                response = self.call_chat_completion(request_kwargs, attempt)
+                values, should_retry = self.process_section_completion(response, request_kwargs, profile_data, sections, cache_key)
+                if not should_retry or attempt == max_retries - 1:
+                    return values or fallback
+                fallback = values or fallback
+                self.response_stats['retries'] += 1
+            except Exception as e:
+                print(f"API call error on attempt {attempt + 1}: {e}")
+                if attempt == max_retries - 1:
+                    return fallback
+                time.sleep(2 ** attempt)  # Exponential backoff
+
+        return fallback
+
+    async def extract_sections_async(
+        self,
+        profile_data: Dict[str, Any],
+        sections: List[str],
+        client: AsyncOpenAI,
+        model: Optional[str] = None,
+        max_retries: int = 2
+    ) -> Optional[Dict[str, Any]]:
+        """Async version of extract_sections."""
+        request_kwargs = self.build_section_request_kwargs(profile_data, sections, model)
+        cache_key, values = self.get_cached_sections(request_kwargs, profile_data, sections)
+        if values:
+            return values
+
+        fallback = None
+        for attempt in range(max_retries):
+            try:
+                response = await self.call_chat_completion_async(client, request_kwargs, attempt)
+                values, should_retry = self.process_section_completion(response, request_kwargs, profile_data, sections, cache_key)
+                if not should_retry or attempt == max_retries - 1:
+                    return values or fallback
+                fallback = values or fallback
+                self.response_stats['retries'] += 1
+            except Exception as e:
+                print(f"API call error on attempt {attempt + 1}: {e}")
+                if attempt == max_retries - 1:
+                    return fallback
+                await asyncio.sleep(2 ** attempt)  # Exponential backoff
+
+        return fallback
+
+    def extract_traits_split(self, profile_data: Dict[str, Any], model: str, max_retries: int = 2) -> Optional[ExtractedTraits]:
+        """
+        Extract one profile with a concurrent request per SPLIT_SECTION_GROUPS group instead of
+        one request for the whole record: each response is a fraction of the output tokens, so
+        the profile takes as long as its slowest group rather than the whole record.
+        """
+        with ThreadPoolExecutor(max_workers=len(self.SPLIT_SECTION_GROUPS)) as executor:
+            group_values = list(executor.map(
+                lambda sections: self.extract_sections(profile_data, list(sections), model, max_retries),
+                self.SPLIT_SECTION_GROUPS.values()
+            ))
+        return self.merge_split_sections(profile_data, list(zip(self.SPLIT_SECTION_GROUPS.values(), group_values)), model)
+
+    async def extract_traits_split_async(
+        self, profile_data: Dict[str, Any], client: AsyncOpenAI, model: str, max_retries: int = 2
+    ) -> Optional[ExtractedTraits]:
+        """Async version of extract_traits_split."""
+        group_values = await asyncio.gather(*(
+            self.extract_sections_async(profile_data, list(sections), client, model, max_retries)
+            for sections in self.SPLIT_SECTION_GROUPS.values()
+        ))
+        return self.merge_split_sections(profile_data, list(zip(self.SPLIT_SECTION_GROUPS.values(), group_values)), model)
+
+    def merge_split_sections(
+        self, profile_data: Dict[str, Any], groups: List[Tuple[Tuple[str, ...], Optional[Dict[str, Any]]]], model: str
+    ) -> Optional[ExtractedTraits]:
+        """One trait record from the split requests' (sections, answer) pairs, or None if any request failed."""
+        failed = [' + '.join(sections) for sections, values in groups if values is None]
+        if failed:
+            print(f"Split extraction failed for {', '.join(failed)} of {profile_data.get('fullName', 'Unknown')}")
+            return None
+
+        record = {
+            'full_name': profile_data.get('fullName', 'Unknown'),
+            'linkedin_url': profile_data.get('linkedinUrl', 'not found'),
+            'estimated_age': None,
+            'confidence_score': lowest_confidence(*(values.get('confidence_score') for _, values in groups)) or 'Low'
+        }
+        metadata = {'prompt_versions': dict(self.prompt_versions), 'split_requests': len(groups)}
+        for sections, values in groups:
+            for section in sections:
+                record[section] = values.get(section, {} if section in TRAIT_SECTIONS else None)
+            if values.get('schema_violations'):
+                metadata['schema_violations'] = metadata.get('schema_violations', 0) + values['schema_violations']
+            if values.get('json_repairs'):
+                metadata['json_repaired'] = True
+                metadata['json_repairs'] = metadata.get('json_repairs', []) + values['json_repairs']
+        archived = [values['archived_response'] for _, values in groups if values.get('archived_response')]
+        if archived:
+            metadata['archived_responses'] = archived
+        self.apply_local_traits(record, profile_data)
+        record['extraction_metadata'] = metadata
+        return self.mark_model_tier(traits_from_dict(record), model)
+
+    def merge_sections(
+        self, traits: ExtractedTraits, section_values: Dict[str, Any], profile_data: Dict[str, Any]
+    ) -> ExtractedTraits:
+        """
+        An existing record with some sections replaced by freshly extracted ones.
+
+        Local fields are recomputed, and the replaced sections' versions updated. The record's
+        confidence_score becomes the lower of the old one and the new answer's.
+        """
+        record = traits_to_dict(traits)
+        sections = [section for section in TRAIT_SECTIONS if section in section_values]
+        for section in sections:
+            record[section] = section_values[section]
+        self.apply_local_traits(record, profile_data)
+
+        record['confidence_score'] = lowest_confidence(
+            record.get('confidence_score'), section_values.get('confidence_score')
+        ) or record.get('confidence_score')
+
+        metadata = dict(record.get('extraction_metadata') or {})
+        versions = dict(metadata.get('prompt_versions') or {})
+        versions.update({section: self.prompt_versions[section] for section in sections})
+        metadata['prompt_versions'] = versions
+        metadata['sections_reextracted'] = sections
+        if section_values.get('json_repairs'):
+            metadata['json_repaired'] = True
+            metadata['json_repairs'] = list(metadata.get('json_repairs', [])) + section_values['json_repairs']
+        if section_values.get('archived_response'):
+            metadata['archived_responses'] = list(metadata.get('archived_responses', [])) + [section_values['archived_response']]
+        record['extraction_metadata'] = metadata
+        return traits_from_dict(record)
+
+    def get_stale_sections(self, traits: ExtractedTraits) -> List[str]:
+        """
+        Sections of a record extracted with a different prompt version than the current one.
+        All of them if the core prompt changed or the record has no versions.
+        """
+        metadata = traits.extraction_metadata or {}
+        if metadata.get('source') == 'rules':
+            return []
+        versions = metadata.get('prompt_versions') or {}
+        if versions.get('core') != self.prompt_versions['core']:
+            return list(TRAIT_SECTIONS)
+        return [section for section in TRAIT_SECTIONS if versions.get(section) != self.prompt_versions[section]]
+
     def load_progress(self, progress_file: str) -> List[str]:
         """Load progress tracking file"""
         try:
@@ -374,44 +1297,101 @@ IMPORTANT: Return ONLY the JSON object, no additional text or markdown formattin
         except Exception as e:
             print(f"Error saving progress: {e}")
 
+    def get_journal_file(self, output_file: str) -> str:
+        """Append-only journal that sits next to the output file."""
+        return output_file.replace('.json', '_journal.jsonl')
+
+    def load_result_records(self, output_file: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Raw records from the output JSON array and from its journal.
+
+        If a compaction was interrupted after writing the array but before clearing the
+        journal, the journal's records are already at the end of the array and are dropped.
+        """
+        records = []
+        if os.path.exists(output_file):
+            with open(output_file, 'r', encoding='utf-8') as file:
+                records = json.load(file)
+
+        journal_records = []
+        journal_file = self.get_journal_file(output_file)
+        if os.path.exists(journal_file):
+            with open(journal_file, 'r', encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        journal_records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A line cut short by a crash mid-append
+                        continue
+
+        if journal_records and records[-len(journal_records):] == journal_records:
+            journal_records = []
+        return records, journal_records
+
     def load_existing_results(self, output_file: str) -> List[ExtractedTraits]:
-        """Load existing results from file if it exists"""
+        """Load existing results (output file plus any not yet compacted journal records) if they exist"""
         try:
-            if os.path.exists(output_file):
-                with open(output_file, 'r', encoding='utf-8') as file:
-                    existing_data = json.load(file)
-                existing_results = [
-                    ExtractedTraits(
-                        full_name=item['full_name'],
-                        linkedin_url=item['linkedin_url'],
-                        estimated_age=item.get('estimated_age'),
-                        education_stages=item.get('education_stages', {}),
-                        career_insights=item.get('career_insights', {}),
-                        company_background=item.get('company_background', {}),
-                        accelerator_and_programs=item.get('accelerator_and_programs', {}),
-                        education_career_alignment=item.get('education_career_alignment', {}),
-                        personal_brand=item.get('personal_brand', {}),
-                        research_and_academic=item.get('research_and_academic', {}),
-                        international_experience=item.get('international_experience', {}),
-                        confidence_score=item.get('confidence_score', 'Low')
-                    ) for item in existing_data
-                ]
+            records, journal_records = self.load_result_records(output_file)
+            if records or journal_records:
+                existing_results = [traits_from_dict(item) for item in records + journal_records]
                 print(f"Loaded {len(existing_results)} existing results from {output_file}")
                 return existing_results
         except Exception as e:
             print(f"Error loading existing results: {e}")
         return []
 
+    def compact_results(self, output_file: str) -> int:
+        """
+        Fold the journal into the output JSON array and clear it.
+
+        The array is replaced atomically, so readers such as the Airtable updater always see
+        a complete file. Records are copied as raw dicts, without rebuilding dataclasses.
+
+        Returns:
+            Number of records in the output file
+        """
+        records, journal_records = self.load_result_records(output_file)
+        journal_file = self.get_journal_file(output_file)
+        if journal_records:
+            records.extend(journal_records)
+            os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(output_file) or '.', suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(records, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, output_file)
+        if os.path.exists(journal_file):
+            os.remove(journal_file)
+
+        self.journal_state[output_file] = {'total': len(records), 'pending': 0}
+        return len(records)
+
     def append_results_to_file(self, new_results: List[ExtractedTraits], output_file: str) -> int:
-        """Append new results to existing file"""
+        """
+        Append new results to the output's journal, compacting every COMPACT_EVERY records.
+
+        Each call only writes the new records, so saving after every profile costs the same
+        late in a large run as at the start.
+        """
         try:
             # Ensure output directory exists
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
-            
-            existing_results = self.load_existing_results(output_file)
-            existing_results.extend(new_results)
-            self.save_results(existing_results, output_file)
-            return len(existing_results)
+
+            state = self.journal_state.get(output_file)
+            if state is None:
+                records, journal_records = self.load_result_records(output_file)
+                state = {'total': len(records) + len(journal_records), 'pending': len(journal_records)}
+                self.journal_state[output_file] = state
+
+            with open(self.get_journal_file(output_file), 'a', encoding='utf-8') as journal:
+                for traits in new_results:
+                    journal.write(json.dumps(traits_to_dict(traits), ensure_ascii=False) + '\n')
+                journal.flush()
+            state['total'] += len(new_results)
+            state['pending'] += len(new_results)
+
+            if state['pending'] >= self.COMPACT_EVERY:
+                self.compact_results(output_file)
+            return state['total']
         except Exception as e:
             print(f"Error appending results: {e}")
             return 0
@@ -424,28 +1404,49 @@ IMPORTANT: Return ONLY the JSON object, no additional text or markdown formattin
                     and profile.get('linkedinUrl', '').strip() not in processed_set]
         return remaining
 
-    def extract_traits_from_profiles(
-        self, 
-        profiles: List[Dict[str, Any]], 
-        delay_between_calls: float = 1.0,
+    def group_duplicates(self, profiles: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+        """
+        Split profiles into the ones to extract and near-duplicates to copy traits to.
+
+        Returns:
+            (profiles to extract, {representative URL: its duplicates' profiles})
+        """
+        clusters = find_duplicate_clusters(profiles)
+        skipped = set()
+        duplicates = {}
+        for cluster in clusters:
+            representative = profiles[cluster[0]].get('linkedinUrl', '').strip()
+            duplicates[representative] = [profiles[position] for position in cluster[1:]]
+            skipped.update(cluster[1:])
+        self.dedup_stats['clusters'] += len(clusters)
+        self.dedup_stats['duplicates'] += len(skipped)
+        return [profile for position, profile in enumerate(profiles) if position not in skipped], duplicates
+
+    def copy_for_duplicate(self, traits: ExtractedTraits, profile_data: Dict[str, Any], duplicate_of: str) -> ExtractedTraits:
+        """A copy of a representative's traits for a near-duplicate profile, with its own identity and rule traits."""
+        traits_data = traits_to_dict(traits)
+        traits_data['full_name'] = profile_data.get('fullName', 'Unknown')
+        traits_data['linkedin_url'] = profile_data.get('linkedinUrl', '').strip()
+        self.apply_local_traits(traits_data, profile_data)
+        traits_data['extraction_metadata']['duplicate_of'] = duplicate_of
+        return traits_from_dict(traits_data)
+
+    def prepare_session(
+        self,
+        profiles: List[Dict[str, Any]],
         max_profiles: int = -1,
         force_reextraction: bool = False,
         progress_file: str = None,
         output_file: str = None
-    ) -> List[ExtractedTraits]:
+    ) -> Dict[str, Any]:
         """
-        Extract traits from multiple profiles with rate limiting and progress tracking.
-        
-        Args:
-            profiles: List of cleaned LinkedIn profile data
-            delay_between_calls: Delay in seconds between API calls
-            max_profiles: Maximum number of profiles to process in this session. -1 for all.
-            force_reextraction: If True, re-extract all profiles even if already processed.
-            progress_file: File to save progress tracking data
-            output_file: File to save final results
-            
+        Load progress and existing results and work out which profiles this session should process.
+
         Returns:
-            List of ExtractedTraits objects
+            Dictionary with progress_file, processed_urls, existing_results and remaining_profiles.
+            remaining_profiles is None when everything has already been processed. With
+            dedupe_profiles, near-duplicates are left out of remaining_profiles and listed under
+            their representative's URL in duplicates.
         """
         # Set up progress tracking
         if progress_file is None and output_file:
@@ -461,10 +1462,20 @@ IMPORTANT: Return ONLY the JSON object, no additional text or markdown formattin
         
         # Get remaining profiles to process
         remaining_profiles = self.get_remaining_profiles(profiles, processed_urls)
+        self.check_rule_only_profiles(profiles)
+
+        session = {
+            'progress_file': progress_file,
+            'processed_urls': processed_urls,
+            'existing_results': existing_results,
+            'remaining_profiles': None,
+            'duplicates': {},
+            'duplicate_results': []
+        }
         
         if not remaining_profiles and not force_reextraction:
             print("✅ All profiles have already been processed!")
-            return existing_results
+            return session
         
         print(f"📊 Progress Status:")
         print(f"  Total profiles: {len(profiles)}")
@@ -474,15 +1485,136 @@ IMPORTANT: Return ONLY the JSON object, no additional text or markdown formattin
         if len(processed_urls) > 0 and not force_reextraction:
             print(f"🔄 RESUMING from {len(processed_urls)} completed profiles")
         
-        # Track new results from this session
-        new_results = []
-        profiles_processed_this_session = 0
+        # Near-duplicates are grouped before the session limit, so a cluster is never split across sessions
+        if self.dedupe_profiles:
+            remaining_profiles, session['duplicates'] = self.group_duplicates(remaining_profiles)
+            duplicates = sum(len(group) for group in session['duplicates'].values())
+            print(f"🧬 Near-duplicates: {len(session['duplicates'])} clusters, {duplicates} profiles will reuse their cluster's extraction")
         
         # Determine how many profiles to process in this session
         if max_profiles != -1:
             remaining_profiles = remaining_profiles[:max_profiles]
         
         print(f"Starting extraction session. Target: {len(remaining_profiles)} profiles")
+        session['remaining_profiles'] = remaining_profiles
+        return session
+
+    def record_extraction(self, traits: ExtractedTraits, profile_url: str, session: Dict[str, Any], output_file: str = None):
+        """Mark a profile as processed and save progress and results incrementally."""
+        session['processed_urls'].append(profile_url)
+        self.telemetry.record_profile(profile_url)
+        
+        # Near-duplicates of this profile get a copy of its traits instead of their own extraction
+        records = [traits]
+        for duplicate in session['duplicates'].pop(profile_url, []):
+            duplicate_traits = self.copy_for_duplicate(traits, duplicate, profile_url)
+            session['processed_urls'].append(duplicate_traits.linkedin_url)
+            session['duplicate_results'].append(duplicate_traits)
+            records.append(duplicate_traits)
+            # Prompt tokens only: the completion the duplicate would have needed is counted at the summary
+            kwargs = self.build_request_kwargs(duplicate)
+            self.dedup_stats['est_prompt_tokens_saved'] += self.rate_governor.estimate_tokens(kwargs) - kwargs['max_tokens']
+            self.dedup_stats['copied'] += 1
+        
+        # Save progress incrementally
+        if session['progress_file']:
+            self.save_progress(session['progress_file'], session['processed_urls'])
+        
+        # Save results incrementally
+        if output_file:
+            total_saved = self.append_results_to_file(records, output_file)
+            print(f"Progress saved: {total_saved} total profiles processed")
+
+    def finish_session(
+        self,
+        profiles: List[Dict[str, Any]],
+        session: Dict[str, Any],
+        new_results: List[ExtractedTraits],
+        output_file: str = None
+    ) -> List[ExtractedTraits]:
+        """Compact the results journal, print the session summary and return existing plus new results."""
+        if output_file:
+            try:
+                self.compact_results(output_file)
+            except Exception as e:
+                print(f"Error compacting results: {e}")
+        new_results = new_results + session['duplicate_results']
+        all_results = session['existing_results'] + new_results
+        
+        print(f"\n=== SESSION SUMMARY ===")
+        print(f"New profiles processed this session: {len(new_results)}")
+        if self.dedupe_profiles:
+            report = self.get_dedup_report()
+            print(f"Near-duplicates: {report['clusters']} clusters, {report['copied']} profiles copied instead of extracted, "
+                  f"~{report['est_tokens_saved']} tokens saved")
+        print(f"Total profiles in results file: {len(all_results)}")
+        print(f"Remaining unprocessed profiles: {len(self.get_remaining_profiles(profiles, session['processed_urls']))}")
+        for model in filter(None, (self.model, self.escalation_model)):
+            governor_stats = self.get_rate_governor(model).get_stats()
+            print(f"Rate governor ({model}): {governor_stats['rate_limited']} rate limits hit, "
+                  f"{governor_stats['seconds_waited']}s spent waiting for budget")
+        if self.response_cache:
+            cache_stats = self.response_cache.get_stats()
+            print(f"Response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+        stats = self.response_stats
+        print(f"Responses: {stats['responses']}, rule-only (no API call): {stats['rule_only']}, "
+              f"parse failures: {stats['parse_failures']}, repaired: {stats['repaired']}, "
+              f"schema violations: {stats['schema_violations']}, retries: {stats['retries']}, retries avoided: {stats['retries_avoided']}")
+        if self.escalation_model:
+            print(f"Cascade: {self.cascade_stats['escalated']} escalated to {self.escalation_model} "
+                  f"({self.cascade_stats['reasons']}), {self.cascade_stats['replaced']} replaced")
+        for tier, tier_report in self.get_tier_report().items():
+            print(f"  {tier} ({tier_report['model']}): {tier_report['requests']} requests, "
+                  f"{tier_report['prompt_tokens'] + tier_report['completion_tokens']} tokens, "
+                  f"{tier_report['avg_latency_seconds']}s avg latency, ~${tier_report['estimated_cost_usd']}")
+        telemetry = self.telemetry.get_summary()
+        print(f"Calls: {telemetry['calls']} ({telemetry['errors']} errors), latency p50 {telemetry['latency_p50_seconds']}s / "
+              f"p95 {telemetry['latency_p95_seconds']}s, {telemetry['tokens_per_profile']} tokens/profile, "
+              f"~${telemetry['estimated_cost_usd']} total, {telemetry['profiles_per_min']} profiles/min")
+        if telemetry['unpriced_models']:
+            print(f"⚠️  No pricing for {', '.join(telemetry['unpriced_models'])}; their calls are not in the cost estimate")
+        
+        return all_results
+
+    def get_dedup_report(self) -> Dict[str, Any]:
+        """Near-duplicate counters, with estimated tokens saved (completions at this run's average per request)."""
+        usage = self.usage_stats
+        completion_tokens = usage['completion_tokens'] / usage['requests'] if usage['requests'] else 0
+        report = dict(self.dedup_stats)
+        report['est_tokens_saved'] = round(report['est_prompt_tokens_saved'] + report['copied'] * completion_tokens)
+        return report
+
+    def extract_traits_from_profiles(
+        self, 
+        profiles: List[Dict[str, Any]], 
+        delay_between_calls: float = 0.0,
+        max_profiles: int = -1,
+        force_reextraction: bool = False,
+        progress_file: str = None,
+        output_file: str = None
+    ) -> List[ExtractedTraits]:
+        """
+        Extract traits from multiple profiles with rate limiting and progress tracking.
+        
+        Args:
+            profiles: List of cleaned LinkedIn profile data
+            delay_between_calls: Extra delay in seconds between API calls. Pacing against the
+                OpenAI limits is handled by the shared rate governor, so this is usually 0.
+            max_profiles: Maximum number of profiles to process in this session. -1 for all.
+            force_reextraction: If True, re-extract all profiles even if already processed.
+            progress_file: File to save progress tracking data
+            output_file: File to save final results
+            
+        Returns:
+            List of ExtractedTraits objects
+        """
+        session = self.prepare_session(profiles, max_profiles, force_reextraction, progress_file, output_file)
+        remaining_profiles = session['remaining_profiles']
+        if remaining_profiles is None:
+            return session['existing_results']
+        
+        # Track new results from this session
+        new_results = []
         
         for i, profile in enumerate(remaining_profiles):
             profile_url = profile.get('linkedinUrl', '').strip()
@@ -497,18 +1629,8 @@ IMPORTANT: Return ONLY the JSON object, no additional text or markdown formattin
             traits = self.extract_traits_from_profile(profile)
             if traits:
                 new_results.append(traits)
-                processed_urls.append(profile_url)
-                profiles_processed_this_session += 1
                 print(f"✓ Successfully extracted traits")
-                
-                # Save progress incrementally
-                if progress_file:
-                    self.save_progress(progress_file, processed_urls)
-                
-                # Save results incrementally
-                if output_file:
-                    total_saved = self.append_results_to_file([traits], output_file)
-                    print(f"Progress saved: {total_saved} total profiles processed")
+                self.record_extraction(traits, profile_url, session, output_file)
             else:
                 print(f"✗ Failed to extract traits")
             
@@ -516,15 +1638,344 @@ IMPORTANT: Return ONLY the JSON object, no additional text or markdown formattin
             if i < len(remaining_profiles) - 1:
                 time.sleep(delay_between_calls)
         
-        # Final summary
-        all_results = existing_results + new_results
+        return self.finish_session(profiles, session, new_results, output_file)
+
+    async def extract_traits_from_profiles_async(
+        self,
+        profiles: List[Dict[str, Any]],
+        max_concurrency: int = 8,
+        max_profiles: int = -1,
+        force_reextraction: bool = False,
+        progress_file: str = None,
+        output_file: str = None
+    ) -> List[ExtractedTraits]:
+        """
+        Extract traits from multiple profiles concurrently, with at most `max_concurrency`
+        OpenAI requests in flight. The limit is on requests, not profiles: a profile's split
+        section requests and escalation calls each take a slot. Progress and results are
+        saved as each profile finishes, so an interrupted run resumes exactly like the
+        sequential one.
         
-        print(f"\n=== SESSION SUMMARY ===")
-        print(f"New profiles processed this session: {len(new_results)}")
-        print(f"Total profiles in results file: {len(all_results)}")
-        print(f"Remaining unprocessed profiles: {len(self.get_remaining_profiles(profiles, processed_urls))}")
+        Args:
+            profiles: List of cleaned LinkedIn profile data
+            max_concurrency: Maximum number of in-flight OpenAI requests
+            max_profiles: Maximum number of profiles to process in this session. -1 for all.
+            force_reextraction: If True, re-extract all profiles even if already processed.
+            progress_file: File to save progress tracking data
+            output_file: File to save final results
+            
+        Returns:
+            List of ExtractedTraits objects
+        """
+        session = self.prepare_session(profiles, max_profiles, force_reextraction, progress_file, output_file)
+        remaining_profiles = session['remaining_profiles']
+        if remaining_profiles is None:
+            return session['existing_results']
+
+        print(f"Running with up to {max_concurrency} concurrent requests")
+
+        self.request_semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        new_results: List[ExtractedTraits] = []
+        completed = 0
+
+        try:
+            async with self.create_async_client() as client:
+
+                async def extract_one(profile: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[ExtractedTraits]]:
+                    return profile, await self.extract_traits_from_profile_async(profile, client)
+
+                tasks = []
+                for i, profile in enumerate(remaining_profiles):
+                    if not profile.get('linkedinUrl', '').strip():
+                        print(f"Skipping profile {i + 1}: No LinkedIn URL found")
+                        continue
+                    tasks.append(asyncio.ensure_future(extract_one(profile)))
+
+                # Results are saved on the event loop as each request completes, so saves never overlap
+                for next_done in asyncio.as_completed(tasks):
+                    profile, traits = await next_done
+                    completed += 1
+                    print(f"Processed profile {completed}/{len(tasks)}: {profile.get('fullName', 'Unknown')}")
+                    if traits:
+                        new_results.append(traits)
+                        print(f"✓ Successfully extracted traits")
+                        self.record_extraction(traits, profile.get('linkedinUrl', '').strip(), session, output_file)
+                    else:
+                        print(f"✗ Failed to extract traits")
+        finally:
+            self.request_semaphore = None
+        return self.finish_session(profiles, session, new_results, output_file)
+
+    def extract_traits_from_profiles_concurrent(
+        self,
+        profiles: List[Dict[str, Any]],
+        max_concurrency: int = 8,
+        max_profiles: int = -1,
+        force_reextraction: bool = False,
+        progress_file: str = None,
+        output_file: str = None
+    ) -> List[ExtractedTraits]:
+        """Blocking wrapper around extract_traits_from_profiles_async, for threads and scripts."""
+        return asyncio.run(self.extract_traits_from_profiles_async(
+            profiles, max_concurrency, max_profiles, force_reextraction, progress_file, output_file
+        ))
+    
+    def extract_traits_from_profile_pack(self, profiles: List[Dict[str, Any]]) -> Dict[str, Optional[ExtractedTraits]]:
+        """
+        Extract traits for several profiles with one request, so the system prompt is sent once.
+
+        Cached answers are reused first. Every profile whose packed result is missing or fails
+        validation falls back to a normal single-profile call.
         
-        return all_results
+        Args:
+            profiles: Cleaned LinkedIn profiles, each with a linkedinUrl
+            
+        Returns:
+            {linkedinUrl: ExtractedTraits or None if extraction failed}
+        """
+        results: Dict[str, Optional[ExtractedTraits]] = {}
+        to_pack = []
+        for profile in profiles:
+            profile_url = profile.get('linkedinUrl', '').strip()
+            cached_traits = self.get_traits_without_api(profile, packed=True) or self.get_cached_traits(profile)
+            if cached_traits:
+                results[profile_url] = self.escalate_traits(profile, cached_traits)
+            else:
+                to_pack.append(profile)
+
+        matched = {}
+        if len(to_pack) > 1:
+            self.packing_stats['packed_requests'] += 1
+            self.packing_stats['packed_profiles'] += len(to_pack)
+            try:
+                response = self.call_chat_completion(self.build_packed_request_kwargs(to_pack))
+                matched = self.parse_packed_response(response.choices[0].message.content, to_pack)
+            except json.JSONDecodeError as e:
+                print(f"Packed response was not valid JSON ({e}), falling back to single-profile calls")
+            except Exception as e:
+                print(f"Packed API call error ({e}), falling back to single-profile calls")
+
+        for profile in to_pack:
+            profile_url = profile.get('linkedinUrl', '').strip()
+            if profile_url in matched:
+                traits, record_json = matched[profile_url]
+                self.cache_response(profile, record_json, packed=True)
+                self.archive_traits_response(traits, profile, record_json, packed=True)
+                results[profile_url] = self.escalate_traits(profile, self.mark_model_tier(traits, self.model))
+            else:
+                if len(to_pack) > 1:
+                    self.packing_stats['fallbacks'] += 1
+                results[profile_url] = self.extract_traits_from_profile(profile)
+        return results
+
+    def extract_traits_from_profiles_packed(
+        self,
+        profiles: List[Dict[str, Any]],
+        pack_size: int = 4,
+        max_profiles: int = -1,
+        force_reextraction: bool = False,
+        progress_file: str = None,
+        output_file: str = None
+    ) -> List[ExtractedTraits]:
+        """
+        Extract traits sending `pack_size` profiles per request, with progress tracking.
+        
+        Args:
+            profiles: List of cleaned LinkedIn profile data
+            pack_size: Profiles per request. 1 behaves like extract_traits_from_profiles.
+            max_profiles: Maximum number of profiles to process in this session. -1 for all.
+            force_reextraction: If True, re-extract all profiles even if already processed.
+            progress_file: File to save progress tracking data
+            output_file: File to save final results
+            
+        Returns:
+            List of ExtractedTraits objects
+        """
+        session = self.prepare_session(profiles, max_profiles, force_reextraction, progress_file, output_file)
+        remaining_profiles = session['remaining_profiles']
+        if remaining_profiles is None:
+            return session['existing_results']
+
+        with_urls = [profile for profile in remaining_profiles if profile.get('linkedinUrl', '').strip()]
+        if len(with_urls) < len(remaining_profiles):
+            print(f"Skipping {len(remaining_profiles) - len(with_urls)} profiles: No LinkedIn URL found")
+
+        pack_size = max(1, pack_size)
+        new_results = []
+        for start in range(0, len(with_urls), pack_size):
+            pack = with_urls[start:start + pack_size]
+            print(f"Processing profiles {start + 1}-{start + len(pack)}/{len(with_urls)} in one request")
+
+            results = self.extract_traits_from_profile_pack(pack)
+            for profile in pack:
+                profile_url = profile.get('linkedinUrl', '').strip()
+                traits = results.get(profile_url)
+                if traits:
+                    new_results.append(traits)
+                    print(f"✓ Successfully extracted traits for {profile.get('fullName', 'Unknown')}")
+                    self.record_extraction(traits, profile_url, session, output_file)
+                else:
+                    print(f"✗ Failed to extract traits for {profile.get('fullName', 'Unknown')}")
+
+        print(f"Packing: {self.packing_stats['packed_requests']} packed requests covering "
+              f"{self.packing_stats['packed_profiles']} profiles, {self.packing_stats['fallbacks']} single-call fallbacks")
+        return self.finish_session(profiles, session, new_results, output_file)
+
+    def build_batch_file(self, profiles: List[Dict[str, Any]], batch_file: str) -> int:
+        """
+        Write one Batch API request line per profile, keyed by LinkedIn URL.
+
+        Returns:
+            Number of requests written
+        """
+        os.makedirs(os.path.dirname(batch_file) or '.', exist_ok=True)
+        written = set()
+        with open(batch_file, 'w', encoding='utf-8') as f:
+            for profile in profiles:
+                profile_url = profile.get('linkedinUrl', '').strip()
+                # custom_id must be unique within a batch
+                if not profile_url or profile_url in written:
+                    continue
+                written.add(profile_url)
+                f.write(json.dumps({
+                    'custom_id': profile_url,
+                    'method': 'POST',
+                    'url': '/v1/chat/completions',
+                    'body': self.build_request_kwargs(profile)
+                }, ensure_ascii=False) + '\n')
+        return len(written)
+
+    def extract_traits_from_profiles_batch(
+        self,
+        profiles: List[Dict[str, Any]],
+        max_profiles: int = -1,
+        force_reextraction: bool = False,
+        progress_file: str = None,
+        output_file: str = None,
+        batch_backend=None,
+        poll_interval: float = 30.0
+    ) -> List[ExtractedTraits]:
+        """
+        Extract traits through a batch endpoint instead of one request per profile.
+
+        Builds a JSONL request file from the remaining profiles, submits it, polls until the
+        batch finishes and ingests the results into the normal output and progress files.
+        The submitted batch id is kept in a <output>_batch.json state file, so if the process
+        stops while waiting, the next run picks the same batch back up instead of paying for
+        it twice. Profiles whose request failed stay unprocessed and go in the next batch.
+        
+        Args:
+            profiles: List of cleaned LinkedIn profile data
+            max_profiles: Maximum number of profiles to process in this session. -1 for all.
+            force_reextraction: If True, re-extract all profiles even if already processed.
+            progress_file: File to save progress tracking data
+            output_file: File to save final results
+            batch_backend: Object with submit/get_status/fetch_results. Defaults to the OpenAI Batch API.
+                Use batch_backend.LocalBatchBackend to run offline.
+            poll_interval: Seconds between status checks
+            
+        Returns:
+            List of ExtractedTraits objects
+        """
+        batch_backend = batch_backend or OpenAIBatchBackend(self.client)
+        output_base = (output_file or 'final-trait-extractions/batch_traits.json').replace('.json', '')
+        batch_file = f"{output_base}_batch_input.jsonl"
+        state_file = f"{output_base}_batch.json"
+
+        session = self.prepare_session(profiles, max_profiles, force_reextraction, progress_file, output_file)
+        new_results = []
+
+        # Resume a batch submitted by an earlier run, if there is one
+        batch_state = None
+        if os.path.exists(state_file):
+            with open(state_file, 'r', encoding='utf-8') as f:
+                batch_state = json.load(f)
+            print(f"🔄 Resuming batch {batch_state['batch_id']} submitted at {batch_state['submitted_at']}")
+        else:
+            remaining_profiles = session['remaining_profiles']
+            if remaining_profiles is None:
+                return session['existing_results']
+
+            # Profiles with a cached response (or no free text) don't need to go in the batch at all
+            to_submit = []
+            for profile in remaining_profiles:
+                profile_url = profile.get('linkedinUrl', '').strip()
+                cached_traits = self.get_traits_without_api(profile) if profile_url else None
+                if cached_traits:
+                    cached_traits = self.escalate_traits(profile, cached_traits)
+                    new_results.append(cached_traits)
+                    self.record_extraction(cached_traits, profile_url, session, output_file)
+                else:
+                    to_submit.append(profile)
+            if new_results:
+                print(f"♻️ Reused {len(new_results)} cached or rule-only results")
+
+            request_count = self.build_batch_file(to_submit, batch_file)
+            if request_count == 0:
+                print("No uncached profiles with a LinkedIn URL to submit")
+                return self.finish_session(profiles, session, new_results, output_file)
+            batch_id = batch_backend.submit(batch_file)
+            batch_state = {
+                'batch_id': batch_id,
+                'batch_file': batch_file,
+                'request_count': request_count,
+                'submitted_at': time.strftime('%Y-%m-%d %H:%M:%S')
+            }
+            os.makedirs(os.path.dirname(state_file) or '.', exist_ok=True)
+            with open(state_file, 'w', encoding='utf-8') as f:
+                json.dump(batch_state, f, indent=2)
+            print(f"📤 Submitted batch {batch_id} with {request_count} requests")
+
+        # Poll until the batch reaches a terminal status
+        while True:
+            status = batch_backend.get_status(batch_state['batch_id'])
+            print(f"Batch {batch_state['batch_id']}: {status['status']} "
+                  f"({status['completed']}/{status['total']} done, {status['failed']} failed)")
+            if status['status'] in TERMINAL_STATUSES:
+                break
+            time.sleep(poll_interval)
+
+        # Expired and cancelled batches still return whatever finished before they stopped
+        profiles_by_url = {profile.get('linkedinUrl', '').strip(): profile for profile in profiles}
+        processed_set = set(session['processed_urls'])
+        ingested = 0
+        failed = 0
+        for result in batch_backend.fetch_results(batch_state['batch_id']):
+            profile_url = result.get('custom_id', '')
+            profile = profiles_by_url.get(profile_url)
+            if profile is None or profile_url in processed_set:
+                continue
+
+            response = result.get('response') or {}
+            if response.get('status_code') != 200:
+                failed += 1
+                error = result.get('error') or response.get('body', {}).get('error')
+                print(f"✗ Batch request failed for {profile_url}: {error}")
+                continue
+            self.record_batch_usage(response['body'])
+
+            content = response['body']['choices'][0]['message']['content']
+            try:
+                traits = self.parse_traits_response(content, profile)
+            except json.JSONDecodeError as e:
+                failed += 1
+                print(f"✗ JSON parsing error for {profile_url}: {e}")
+                continue
+
+            if not self.get_incomplete_reason(traits.extraction_metadata):
+                self.cache_response(profile, content)
+            self.archive_traits_response(traits, profile, content)
+            # Escalations are few, so they go straight to the API rather than into another batch
+            traits = self.escalate_traits(profile, self.mark_model_tier(traits, self.model))
+            new_results.append(traits)
+            ingested += 1
+            processed_set.add(profile_url)
+            self.record_extraction(traits, profile_url, session, output_file)
+
+        print(f"📥 Ingested {ingested} results from batch {batch_state['batch_id']} ({failed} failed)")
+        os.remove(state_file)
+
+        return self.finish_session(profiles, session, new_results, output_file)
     
     def save_results(self, results: List[ExtractedTraits], output_file: str):
         """Save comprehensive extraction results to JSON file."""
@@ -532,31 +1983,191 @@ IMPORTANT: Return ONLY the JSON object, no additional text or markdown formattin
             # Ensure output directory exists
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
             
-            output_data = []
-            
-            for traits in results:
-                output_data.append({
-                    'full_name': traits.full_name,
-                    'linkedin_url': traits.linkedin_url,
-                    'estimated_age': traits.estimated_age,
-                    'education_stages': traits.education_stages,
-                    'career_insights': traits.career_insights,
-                    'company_background': traits.company_background,
-                    'accelerator_and_programs': traits.accelerator_and_programs,
-                    'education_career_alignment': traits.education_career_alignment,
-                    'personal_brand': traits.personal_brand,
-                    'research_and_academic': traits.research_and_academic,
-                    'international_experience': traits.international_experience,
-                    'confidence_score': traits.confidence_score
-                })
+            output_data = [traits_to_dict(traits) for traits in results]
             
             with open(output_file, 'w', encoding='utf-8') as f:
                 json.dump(output_data, f, indent=2, ensure_ascii=False)
+
+            # The saved list is the complete result set, so any journal for this file is superseded
+            journal_file = self.get_journal_file(output_file)
+            if os.path.exists(journal_file):
+                os.remove(journal_file)
+            self.journal_state.pop(output_file, None)
             
             print(f"Results saved to {output_file}")
         except Exception as e:
             print(f"Error saving results: {e}")
 
+    def reextract_changed_sections(
+        self, profiles: List[Dict[str, Any]], output_file: str, max_profiles: int = -1
+    ) -> List[ExtractedTraits]:
+        """
+        Bring an existing results file up to date with the current prompt.
+
+        Each record's stored prompt versions are compared to the current ones. Records whose
+        sections are all current are left alone; for the rest only the changed sections are
+        re-asked and merged in. Records from a different core prompt (or with no versions) are
+        re-extracted in full. Rule-only records don't depend on the prompt and are skipped.
+
+        Args:
+            profiles: Cleaned profiles the results were extracted from
+            output_file: Results file to update in place
+            max_profiles: Maximum number of records to re-extract (-1 for all)
+
+        Returns:
+            All results, updated
+        """
+        records, journal_records = self.load_result_records(output_file)
+        results = [traits_from_dict(item) for item in records + journal_records]
+        profiles_by_url = {profile.get('linkedinUrl', '').strip(): profile for profile in profiles}
+        stats = self.section_stats
+
+        stale = []
+        for index, traits in enumerate(results):
+            stats['checked'] += 1
+            sections = self.get_stale_sections(traits)
+            if not sections:
+                stats['up_to_date'] += 1
+            elif traits.linkedin_url.strip() in profiles_by_url:
+                stale.append((index, sections))
+        if max_profiles != -1:
+            stale = stale[:max_profiles]
+        print(f"🧩 {len(results)} records, {stats['up_to_date']} up to date, {len(stale)} to re-extract")
+
+        updated = 0
+        for index, sections in stale:
+            traits = results[index]
+            profile_data = profiles_by_url[traits.linkedin_url.strip()]
+            print(f"Re-extracting {', '.join(sections)} for {traits.full_name}")
+
+            if len(sections) == len(TRAIT_SECTIONS):
+                new_traits = self.extract_traits_from_profile(profile_data)
+                stats['full' if new_traits else 'failed'] += 1
+            else:
+                section_values = self.extract_sections(profile_data, sections)
+                new_traits = self.merge_sections(traits, section_values, profile_data) if section_values else None
+                stats['partial' if new_traits else 'failed'] += 1
+                for section in sections:
+                    stats['sections'][section] = stats['sections'].get(section, 0) + 1
+            if new_traits is None:
+                continue
+
+            results[index] = new_traits
+            self.telemetry.record_profile(traits.linkedin_url)
+            updated += 1
+            if updated % self.COMPACT_EVERY == 0:
+                self.save_results(results, output_file)
+
+        if updated:
+            self.save_results(results, output_file)
+        print(f"\n=== SECTION RE-EXTRACTION SUMMARY ===")
+        print(f"Up to date: {stats['up_to_date']}, partly re-extracted: {stats['partial']}, "
+              f"fully re-extracted: {stats['full']}, failed: {stats['failed']}")
+        print(f"Sections re-asked: {stats['sections']}")
+        return results
+
+    def rebuild_from_archive(self, traits: ExtractedTraits, profile_data: Dict[str, Any]) -> Optional[ExtractedTraits]:
+        """
+        Parse a record's archived responses again with the current parsing code.
+
+        Whole-record responses are parsed and any later section responses merged in; records
+        made by split extraction are merged from their section responses. Provenance (prompt
+        versions, escalation, archive keys) is kept from the existing record.
+
+        Returns:
+            The rebuilt record, or None if any of its responses is missing from the archive
+
+        Raises:
+            json.JSONDecodeError: if an archived response no longer parses
+        """
+        keys = traits.extraction_metadata.get('archived_responses') or []
+        entries = [self.response_archive.get(key) for key in keys]
+        if not entries or any(entry is None for entry in entries):
+            return None
+
+        record_entries = [entry for entry in entries if not entry.get('sections')]
+        section_entries = [entry for entry in entries if entry.get('sections')]
+        if record_entries:
+            rebuilt = self.mark_model_tier(self.parse_traits_response(record_entries[-1]['content'], profile_data), record_entries[-1]['model'])
+            for entry in section_entries:
+                rebuilt = self.merge_sections(rebuilt, self.parse_section_response(entry['content'], profile_data, entry['sections']), profile_data)
+        else:
+            groups = [
+                (tuple(entry['sections']), self.parse_section_response(entry['content'], profile_data, entry['sections']))
+                for entry in section_entries
+            ]
+            rebuilt = self.merge_split_sections(profile_data, groups, section_entries[0]['model'])
+
+        metadata = rebuilt.extraction_metadata
+        for key in ('prompt_versions', 'escalated_from', 'sections_reextracted', 'archived_responses'):
+            metadata.pop(key, None)
+            if key in traits.extraction_metadata:
+                metadata[key] = traits.extraction_metadata[key]
+        # Packed records archive their own record JSON, not the repaired response
+        for key in ('json_repaired', 'json_repairs'):
+            if key in traits.extraction_metadata:
+                metadata.setdefault(key, traits.extraction_metadata[key])
+        # Near-duplicates were built from their representative's responses
+        if traits.extraction_metadata.get('duplicate_of'):
+            rebuilt = self.copy_for_duplicate(rebuilt, profile_data, traits.extraction_metadata['duplicate_of'])
+        return rebuilt
+
+    def reparse_results(self, profiles: List[Dict[str, Any]], output_file: str) -> List[ExtractedTraits]:
+        """
+        Rebuild a results file from the response archive, without any API calls.
+
+        Every record is re-parsed from the raw responses it was built from, so fixes to parsing,
+        defaulting or the rule engine reach existing results. Rule-only records are recomputed.
+        Records whose responses aren't archived (older results, or the archive was off) are kept as they are.
+
+        Args:
+            profiles: Cleaned profiles the results were extracted from
+            output_file: Results file to rebuild in place
+
+        Returns:
+            All results, rebuilt where possible
+        """
+        if not self.response_archive:
+            raise ValueError("reparse_results needs the response archive (use_response_archive=True)")
+
+        records, journal_records = self.load_result_records(output_file)
+        results = [traits_from_dict(item) for item in records + journal_records]
+        profiles_by_url = {profile.get('linkedinUrl', '').strip(): profile for profile in profiles}
+        self.check_rule_only_profiles(profiles)
+        stats = self.reparse_stats
+        start_time = time.perf_counter()
+
+        for index, traits in enumerate(results):
+            stats['records'] += 1
+            profile_data = profiles_by_url.get(traits.linkedin_url.strip())
+            if profile_data is None:
+                stats['missing'] += 1
+                continue
+            if traits.extraction_metadata.get('source') == 'rules':
+                rebuilt = self.get_rule_only_traits(profile_data)
+                stats['rules' if rebuilt else 'missing'] += 1
+                results[index] = rebuilt or traits
+                continue
+
+            try:
+                rebuilt = self.rebuild_from_archive(traits, profile_data)
+            except json.JSONDecodeError as e:
+                stats['failed'] += 1
+                print(f"✗ Archived response for {traits.full_name} no longer parses: {e}")
+                continue
+            if rebuilt is None:
+                stats['missing'] += 1
+                continue
+            results[index] = rebuilt
+            stats['reparsed'] += 1
+
+        self.save_results(results, output_file)
+        print(f"\n=== REPARSE SUMMARY ===")
+        print(f"Records: {stats['records']}, rebuilt from archive: {stats['reparsed']}, recomputed by rules: {stats['rules']}, "
+              f"kept (no archived responses): {stats['missing']}, failed: {stats['failed']}")
+        print(f"Took {time.perf_counter() - start_time:.2f}s, no API calls")
+        return results
+
     def check_progress(self, input_profiles_file: str, output_file: str) -> Dict[str, Any]:
         """
         Check extraction progress and return summary statistics.
@@ -625,55 +2236,4 @@ if __name__ == "__main__":
     # extractor.check_progress(
     #     'cleaned-profile-data/S25Top100cleaned_linkedin_data.json',
     #     'final-trait-extractions/S25Top100_comprehensive_traits.json'
-    # ) 
-
-
-''' 
-Notable compaies and stuff - can be reused later
-
- self.faang_companies = {
-            'facebook', 'meta', 'apple', 'amazon', 'netflix', 'google', 'alphabet',
-            'microsoft', 'tesla', 'nvidia', 'intel', 'amd', 'oracle', 'ibm',
-            'salesforce', 'adobe', 'uber', 'lyft', 'snap', 'twitter', 'x corp', 'spotify',
-            'airbnb', 'shopify', 'square', 'block', 'paypal', 'dropbox', 'slack', 'cloudflare',
-            'zoom', 'palantir', 'snowflake', 'atlassian', 'twilio', 'coinbase', 'reddit'
-        }
-
-        self.unicorn_startups = {
-            # Global
-            'stripe', 'spacex', 'bytedance', 'tiktok', 'figma', 'notion', 'discord',
-            'databricks', 'canva', 'instacart', 'klarna', 'revolut', 'nubank', 'checkout.com',
-            'gitlab', 'celonis', 'getir', 'gorillas', 'rappi', 'flink', 'miro', 'clickup',
-            'postman', 'loom', 'deepl', 'lemonade', 'brex', 'robinhood', 'remote', 'deal',
-            'rippling', 'scale ai', 'samsara', 'openai', 'anthropic', 'perplexity', 'hugging face',
-            'character ai', 'cohere', 'runway', 'adept ai', 'grok', 'deepmind', 'quora', 'linear',
-
-            # Europe (focus)
-            'revolut', 'klarna', 'getir', 'gorillas', 'flink', 'glovo', 'bunq', 'n26', 'zeco', 'tink',
-            'mollie', 'bitpanda', 'wefox', 'ledger', 'vinted', 'tado', 'back market', 'oviva',
-            'sennder', 'sorare', 'tier mobility', 'voi', 'sknups', 'truelayer', 'habito',
-            'gousto', 'factorial', 'railway', 'jobandtalent', 'paysend', 'ormatek', 'frichti'
-        }
-
-        self.accelerator_programs = {
-            # Global + US-focused
-            'y combinator', 'yc', 'techstars', 'antler', 'entrepreneur first', 'ef',
-            'on deck', 'sequoia scout', 'greylock', 'a16z', 'andreessen horowitz',
-            'general catalyst', 'accel', 'founders fund', 'first round', 'index ventures',
-            'bessemer venture partners', 'lightspeed', 'neo', 'south park commons',
-            'initialized capital', 'craft ventures', 'social capital', '8vc', 'atomic',
-            'village global', 'pear vc', 'upwest labs', 'fifty years', 'nascent',
-            'prelude ventures', 'acrew capital', 'homebrew', 'shrug capital', 'f.inc', 'founders inc',
-            'signal fire', 'boost vc', 'founder collective',
-
-            # Europe-focused
-            'seedcamp', 'station f', 'backed vc', 'localglobe', 'kindred capital',
-            'crane venture partners', 'balderton capital', 'hoxton ventures', 'point nine',
-            'speedinvest', 'pentech', 'entrepreneur first', 'tech nation', 'startup wise guys',
-            'european innovation council', 'rockstart', 'founders factory', 'la famille',
-            'startupbootcamp', 'bethnal green ventures', 'future positive capital',
-            'alchemist accelerator', 'startupyard', 'berkeley skydeck', 'masschallenge'
-        }
-
-
-'''
\ No newline at end of file
+    # )
@@ -0,0 +1,341 @@
+'''
+Sectioned system prompt for trait extraction.
+
+The prompt LinkedInTraitExtractor sends is assembled from the named sections below, in
+order. build_system_prompt() with no arguments gives the full prompt. Given the fields the
+rule engine (trait_rules.py) computes locally, it leaves out everything that only exists to
+make the model compute them: their lines in the output format, their guidelines and the
+age methodology. The model then only answers the judgement-based fields.
+
+Notable companies and accelerators can come from the local entity matcher
+(entity_matcher.py) instead: as local fields their lists and format lines are dropped, or
+with entity_hints=True the ENTITY_HINTS section tells the model to use the matcher's
+"entityHints" in each profile.
+
+Each section of the trait record (education_stages, career_insights, ...) depends on its
+own part of the prompt: its block in the output format, its numbered guidelines and any
+lists or indicators it uses (SECTION_GUIDELINES / SECTION_PROMPT_SECTIONS). Everything else
+(intro, top-level fields, closing) is 'core'. get_section_versions() hashes each part, so
+a section's version changes exactly when the instructions for it do, and
+build_section_prompt() builds a prompt that only asks for some sections.
+'''
+
+import hashlib
+import re
+from typing import Dict, Iterable, List, Tuple
+
+INTRO = """You are an expert at extracting structured information from LinkedIn profiles. 
+
+Your task is to extract comprehensive traits from LinkedIn profile data and return ONLY a valid JSON object with the specified fields.
+
+"""
+
+OUTPUT_FORMAT = """REQUIRED JSON FORMAT:
+{
+    "full_name": "Full name from profile",
+    "linkedin_url": "LinkedIn URL from profile",
+    "estimated_age": "A single estimated age based on graduation years (e.g. '30')",
+    "education_stages": {
+        "undergraduate": "University - Degree - Field - Year of Graduation (e.g., 'Stanford University - BS - Computer Science - 2016')",
+        "masters": "University - Degree - Field or null - Year of Graduation or null",
+        "phd": "University - Degree - Field or null - Year of Graduation or null",
+        "other_education": ["Any other certifications, bootcamps, etc."]
+    },
+    "career_insights": {
+        "avg_tenure_per_role": 2.1,
+        "job_hopper": true/false,
+        "total_experience_count": 5,
+        "has_leadership_experience": true/false,
+        "has_previous_c_suite_experience": true/false,
+        "founder_experience_count": 2,
+        "industry_switches": 1,
+        "years_out_of_education": 8,
+        "years_in_industry": 6,
+        "career_summary": "CEO at StartupCo for 3 yrs; VP Product at TechCorp for 2 yrs 6 mos; Senior Engineer at BigTech for 4 yrs"
+    },
+    "company_background": {
+        "notable_companies": ["FAANG, unicorns, top-tier companies"],
+        "startup_companies": ["Early-stage/startup companies"]
+    },
+    "accelerator_and_programs": {
+        "accelerators": ["Y Combinator, Techstars, etc."],
+        "fellowship_programs": ["On Deck, EF, etc."],
+        "board_positions": ["Any board positions"]
+    },
+    "education_career_alignment": {
+        "studies_field": "Primary field of study",
+        "current_field": "Current industry/role focus", 
+        "pivot_description": "Description of career change if applicable"
+    },
+    "personal_brand": {
+        "headline_keywords": ["Key terms from headline"]
+    },
+    "research_and_academic": {
+        "academic_roles": ["Professor, Researcher, etc."],
+    },
+    "international_experience": {
+        "countries_worked": ["List of countries/regions"]
+    },
+    "confidence_score": "High/Medium/Low based on data completeness and clarity"
+}
+
+"""
+
+GUIDELINES = """EXTRACTION GUIDELINES:
+
+1. LINKEDIN URL: Extract the linkedinUrl from the profile data exactly as provided.
+
+2. ESTIMATED AGE: Calculate from graduation years using 2025 as the current year. Most people begin their bachelor's degree at age 18. If no start date is provided for bachelor's, assume it was a 4-year degree (graduating at age 22). If no education dates are present at all, estimate from their EARLIEST work experience, assuming they were 18 at that time. Examples: Bachelor's graduated 2018 = age 29 (2025-2018+22), Earliest work experience 2015 = age 28 (2025-2015+18). Format as a single value.
+
+3. EDUCATION STAGES: Extract all education levels separately. Format as "University - Degree - Field - Year of Graduation". Mark missing stages as null.
+
+4. SENIORITY LEVELS:
+   - Entry: Intern, Junior, Associate, Analyst
+   - Mid: Senior, Lead, Principal, Manager
+   - Senior: Director, VP, Head of
+   - Executive: SVP, EVP, President
+   - C-Suite: CEO, CTO, COO, CMO, etc.
+
+5. CAREER INSIGHTS: 
+   - Job hopper: avg tenure < 2 years
+   - Number of jobs: total number of roles they've had from profile
+   - Industry switches: count distinct industries
+   - Years out of education: Calculate total years since last education completion (undergraduate, masters, or PhD graduation). Use 2025 as current year. If no education dates, estimate from earliest work experience (assuming they were 18 at that time)
+   - Years in industry: Calculate years of experience in their current/primary industry (excluding startup/founder roles). Use 2025 as current year
+   - Career summary: Format as "Title at Company for Duration; Title at Company for Duration" (chronological order, most recent first)
+
+6. COMPANY BACKGROUND: Spot notable companies or startup companies worked in. Quantify the number of startups they've worked in by the number of startup or 'founder' related roles in their work expereince section
+
+7. EDUCATION-CAREER ALIGNMENT: Compare field of study with current work. Identify pivots and unusual career paths.
+
+8. PERSONAL BRAND: Analyze headline and about section for entrepreneurial identity, thought leadership, mission-driven language.
+
+9. RESEARCH/ACADEMIC: Look for PhD, research roles, peer reviewer positions, academic publications.
+
+10. INTERNATIONAL EXPERIENCE: Extract countries/regions from work locations and company descriptions.
+
+"""
+
+NOTABLE_COMPANIES = """NOTABLE COMPANIES INCLUDE:
+Meta, Facebook, Google, Alphabet, Apple, Amazon, Microsoft, Tesla, Stripe, Figma, Notion, OpenAI, Anthropic, Netflix, Nvidia, Intel, AMD, Oracle, IBM, Salesforce, Adobe, Uber, Lyft, Snap, Twitter, X Corp, Spotify, Airbnb, Shopify, Square, Block, PayPal, Dropbox, Slack, Cloudflare, Zoom, Palantir, Snowflake, Atlassian, Twilio, Coinbase, Reddit, SpaceX, ByteDance, TikTok, Discord, Databricks, Canva, Instacart, Klarna, Revolut, N26, Checkout.com, GitLab, Nubank, Celonis, Getir, Gorillas, Rappi, Flink, Miro, ClickUp, Postman, Loom, DeepL, Lemonade, Brex, Robinhood, Remote, Deel, Rippling, Scale AI, Samsara, Perplexity, Hugging Face, Character AI, Cohere, Runway, Adept AI, Grok, DeepMind, Quora, Linear, Glovo, Bunq, Zeco, Tink, Mollie, Bitpanda, Wefox, Ledger, Vinted, Tado, Back Market, Oviva, Sennder, Sorare, Tier Mobility, Voi, Sknups, TrueLayer, Habito, Gousto, Factorial, Railway, Jobandtalent, Paysend, Ormatek, Frichti, and many more unicorns and top-tier tech companies.
+
+"""
+
+ACCELERATOR_PROGRAMS = """ACCELERATOR PROGRAMS INCLUDE:
+Y Combinator, YC, Techstars, Antler, Entrepreneur First, EF, On Deck, Sequoia Scout, Greylock, A16Z, Andreessen Horowitz, Onstage, General Catalyst, Accel, Founders Fund, First Round, Index Ventures, Bessemer Venture Partners, Lightspeed, Neo, South Park Commons, Initialized Capital, Craft Ventures, Social Capital, 8VC, Atomic, Village Global, Pear VC, UpWest Labs, Fifty Years, Nascent, Prelude Ventures, Acrew Capital, Homebrew, Shrug Capital, F.inc, Founders Inc, Signal Fire, Boost VC, Founder Collective, Seedcamp, Station F, Backed VC, LocalGlobe, Kindred Capital, Crane Venture Partners, Balderton Capital, Hoxton Ventures, Point Nine, Speedinvest, Pentech, Tech Nation, Startup Wise Guys, European Innovation Council, Rockstart, Founders Factory, La Famille, Startupbootcamp, Bethnal Green Ventures, Future Positive Capital, Alchemist Accelerator, StartupYard, Berkeley SkyDeck, MassChallenge, and many more accelerators and incubators.
+
+
+"""
+
+ENTITY_HINTS = """ENTITY HINTS:
+Each profile includes an "entityHints" object with the notable companies and accelerator programs found in it by exact name matching, already resolved to canonical names (e.g. "YC" -> "Y Combinator", "Facebook" -> "Meta"). Use these names as given in notable_companies and accelerators, and only add ones the hints missed.
+
+"""
+
+INDICATORS = """STARTUP INDICATORS: 
+- Small team size mentions
+- "Stealth mode" companies  
+- Early employee numbers (#1-50)
+- Pre-seed, seed, Series A mentions
+- Equity compensation mentions
+- "Building from scratch" language
+
+LEADERSHIP INDICATORS:
+- Team size management
+- Budget responsibility  
+- P&L ownership
+- "Led team of X"
+- Hiring/firing authority
+- Strategic planning role
+
+"""
+
+AGE_METHODOLOGY = """AGE CALCULATION METHODOLOGY:
+- Current year: 2025
+- Standard bachelor's degree: 4 years (age 18-22)
+- If bachelor's graduation year provided: Age = 2025 - graduation_year + 22
+- If no education dates but work experience exists: Age = 2025 - earliest_work_year + 18
+- If only master's/PhD graduation: Use that graduation year + appropriate age (typically 24 for master's, 28 for PhD)
+- If no dates at all: Use earliest work experience year + 18
+
+"""
+
+CLOSING = """IMPORTANT: Return ONLY the JSON object, no additional text or markdown formatting. Be thorough in your analysis but conservative in your claims. IF YOU ARE EVER UNSURE, JUST PUT IN A VALUE OF "-1" FOR STRINGS, AND -1 FOR NUMBERS"""
+
+PROMPT_SECTIONS: List[Tuple[str, str]] = [
+    ('intro', INTRO),
+    ('output_format', OUTPUT_FORMAT),
+    ('guidelines', GUIDELINES),
+    ('notable_companies', NOTABLE_COMPANIES),
+    ('accelerator_programs', ACCELERATOR_PROGRAMS),
+    ('indicators', INDICATORS),
+    ('age_methodology', AGE_METHODOLOGY),
+    ('closing', CLOSING)
+]
+
+# Guideline lines that only explain how to compute a field
+FIELD_GUIDELINE_PREFIXES: Dict[str, Tuple[str, ...]] = {
+    'estimated_age': ('2. ESTIMATED AGE:',),
+    'job_hopper': ('   - Job hopper:',),
+    'total_experience_count': ('   - Number of jobs:',),
+    'years_out_of_education': ('   - Years out of education:',)
+}
+
+# Whole sections that only explain how to compute a field
+FIELD_SECTIONS: Dict[str, Tuple[str, ...]] = {
+    'estimated_age': ('age_methodology',),
+    'notable_companies': ('notable_companies',),
+    'accelerators': ('accelerator_programs',)
+}
+
+FORMAT_KEY_RE = re.compile(r'^\s*"(\w+)":')
+
+
+def _drop_lines(text: str, local_fields: set) -> str:
+    """Remove output-format lines and guideline lines for locally computed fields."""
+    prefixes = tuple(prefix for name in local_fields for prefix in FIELD_GUIDELINE_PREFIXES.get(name, ()))
+    kept = []
+    for line in text.split('\n'):
+        key = FORMAT_KEY_RE.match(line)
+        if key and key.group(1) in local_fields:
+            continue
+        if prefixes and line.startswith(prefixes):
+            continue
+        kept.append(line)
+    return '\n'.join(kept)
+
+
+def build_system_prompt(local_fields: Iterable[str] = (), entity_hints: bool = False) -> str:
+    """
+    Assemble the system prompt.
+
+    Args:
+        local_fields: Leaf field names (e.g. 'estimated_age', 'job_hopper') computed locally,
+            which the prompt should no longer ask for
+        entity_hints: Add the ENTITY_HINTS section (after the accelerator list) for profiles
+            that carry the entity matcher's results
+
+    Returns:
+        The prompt text. With no local fields and no hints it is the full original prompt.
+    """
+    local_fields = set(local_fields)
+    if not local_fields:
+        return ''.join(text for _, text in _get_sections(entity_hints))
+    return ''.join(text for _, text in _get_active_sections(local_fields, entity_hints))
+
+
+def _get_sections(entity_hints: bool) -> List[Tuple[str, str]]:
+    sections = list(PROMPT_SECTIONS)
+    if entity_hints:
+        sections.insert(sections.index(('indicators', INDICATORS)), ('entity_hints', ENTITY_HINTS))
+    return sections
+
+
+def _get_active_sections(local_fields: set, entity_hints: bool) -> List[Tuple[str, str]]:
+    """Prompt sections with everything about local fields removed."""
+    skipped_sections = {section for name in local_fields for section in FIELD_SECTIONS.get(name, ())}
+    return [
+        (name, _drop_lines(text, local_fields))
+        for name, text in _get_sections(entity_hints)
+        if name not in skipped_sections
+    ]
+
+
+# Sections of a trait record, in output order
+TRAIT_SECTIONS = [
+    'education_stages', 'career_insights', 'company_background', 'accelerator_and_programs',
+    'education_career_alignment', 'personal_brand', 'research_and_academic', 'international_experience'
+]
+
+# Numbered EXTRACTION GUIDELINES each trait section depends on (1 and 2 are core)
+SECTION_GUIDELINES: Dict[str, Tuple[int, ...]] = {
+    'education_stages': (3,),
+    'career_insights': (4, 5),
+    'company_background': (6,),
+    'accelerator_and_programs': (),
+    'education_career_alignment': (7,),
+    'personal_brand': (8,),
+    'research_and_academic': (9,),
+    'international_experience': (10,)
+}
+
+# Whole prompt sections each trait section depends on
+SECTION_PROMPT_SECTIONS: Dict[str, Tuple[str, ...]] = {
+    'career_insights': ('indicators',),
+    'company_background': ('notable_companies', 'entity_hints', 'indicators'),
+    'accelerator_and_programs': ('accelerator_programs', 'entity_hints')
+}
+
+SECTION_BLOCK_RE = re.compile(r'^    "(\w+)": \{')
+GUIDELINE_ITEM_RE = re.compile(r'^(\d+)\. ', re.MULTILINE)
+
+
+def _split_output_format(text: str) -> List[Tuple[str, str]]:
+    """Output format as (trait section or 'core', text) pieces, in order."""
+    pieces = []
+    block = None
+    for line in text.split('\n'):
+        match = SECTION_BLOCK_RE.match(line)
+        if match and match.group(1) in TRAIT_SECTIONS:
+            block = match.group(1)
+        pieces.append((block or 'core', line + '\n'))
+        if block and line.startswith('    }'):
+            block = None
+    # The split added a newline after the last line
+    pieces[-1] = (pieces[-1][0], pieces[-1][1][:-1])
+    return pieces
+
+
+def _split_guidelines(text: str) -> List[Tuple[str, str]]:
+    """Guidelines as (trait section or 'core', text) pieces, one per numbered item."""
+    starts = [match.start() for match in GUIDELINE_ITEM_RE.finditer(text)]
+    pieces = [('core', text[:starts[0]] if starts else text)]
+    owners = {number: section for section, numbers in SECTION_GUIDELINES.items() for number in numbers}
+    for index, start in enumerate(starts):
+        end = starts[index + 1] if index + 1 < len(starts) else len(text)
+        number = int(GUIDELINE_ITEM_RE.match(text, start).group(1))
+        pieces.append((owners.get(number, 'core'), text[start:end]))
+    return pieces
+
+
+def get_prompt_parts(local_fields: Iterable[str] = (), entity_hints: bool = False) -> List[Tuple[Tuple[str, ...], str]]:
+    """
+    The system prompt as (owning sections, text) parts, in order. Joining every part's text
+    gives build_system_prompt(local_fields, entity_hints). Owners are trait sections or 'core'.
+    """
+    owners_by_section = {}
+    for trait_section, prompt_sections in SECTION_PROMPT_SECTIONS.items():
+        for name in prompt_sections:
+            owners_by_section.setdefault(name, []).append(trait_section)
+
+    parts = []
+    for name, text in _get_active_sections(set(local_fields), entity_hints):
+        if name == 'output_format':
+            parts.extend(((owner,), piece) for owner, piece in _split_output_format(text))
+        elif name == 'guidelines':
+            parts.extend(((owner,), piece) for owner, piece in _split_guidelines(text))
+        else:
+            parts.append((tuple(owners_by_section.get(name, ['core'])), text))
+    return parts
+
+
+def get_section_versions(local_fields: Iterable[str] = (), entity_hints: bool = False) -> Dict[str, str]:
+    """Version of 'core' and of every trait section: a short hash of the prompt text it depends on."""
+    texts: Dict[str, List[str]] = {name: [] for name in ['core'] + TRAIT_SECTIONS}
+    for owners, text in get_prompt_parts(local_fields, entity_hints):
+        for owner in owners:
+            texts[owner].append(text)
+    return {name: hashlib.sha256(''.join(parts).encode('utf-8')).hexdigest()[:12] for name, parts in texts.items()}
+
+
+def build_section_prompt(sections: Iterable[str], local_fields: Iterable[str] = (), entity_hints: bool = False) -> str:
+    """
+    A system prompt that only asks for `sections` of the trait record (plus full_name,
+    linkedin_url and confidence_score). estimated_age is left out unless it is one of `sections`.
+    """
+    wanted = set(sections) | {'core'}
+    local_fields = set(local_fields) | ({'estimated_age'} - set(sections))
+    return ''.join(
+        text for owners, text in get_prompt_parts(local_fields, entity_hints)
+        if wanted.intersection(owners)
+    )
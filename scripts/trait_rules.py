@@ -0,0 +1,225 @@
+'''
+Deterministic trait rules over cleaned profiles.
+
+Computes the arithmetic traits the system prompt used to ask the model for, following the
+same rules (2025 as the current year, bachelor's graduation at 22, first job at 18, ...),
+from the structured 'dates' the data cleaner parses out of captions (or from the captions
+themselves, for profiles cleaned before 'dates' was added):
+
+ - estimated_age (AGE CALCULATION METHODOLOGY in the prompt)
+ - career_insights: total_experience_count, avg_tenure_per_role, job_hopper,
+   founder_experience_count, years_out_of_education
+
+Profiles without any free text (no about section and no role descriptions) have nothing
+left for the model to judge; build_rule_only_record() fills in what can be read straight
+off the structured data so those profiles can skip the LLM entirely. That only holds when
+the cleaner kept the text fields: see text_fields_kept().
+'''
+
+import re
+from typing import Any, Dict, List, Optional
+
+from data_cleaner import parse_date_caption
+
+CURRENT_YEAR = 2025
+
+# Locally computed fields, by section (None = top level)
+RULE_FIELDS: Dict[Optional[str], List[str]] = {
+    None: ['estimated_age'],
+    'career_insights': [
+        'total_experience_count', 'avg_tenure_per_role', 'job_hopper',
+        'founder_experience_count', 'years_out_of_education'
+    ]
+}
+RULE_FIELD_NAMES = [name for names in RULE_FIELDS.values() for name in names]
+
+# Age at graduation by degree level, from the prompt's age methodology
+GRADUATION_AGE = {'undergraduate': 22, 'masters': 24, 'phd': 28}
+
+FOUNDER_RE = re.compile(r'\b(co[- ]?founder|founder|founding)\b', re.IGNORECASE)
+PHD_RE = re.compile(r'\b(ph\.?\s?d|dphil|doctor(ate)?)\b', re.IGNORECASE)
+MASTERS_RE = re.compile(r"\b(m\.?sc|msc|m\.?a|mba|mphil|mres|meng|llm|mfa|master'?s?)\b", re.IGNORECASE)
+BACHELORS_RE = re.compile(r"\b(b\.?sc|bsc|b\.?a|ba|beng|bs|llb|bba|bachelor'?s?)\b", re.IGNORECASE)
+
+
+def get_dates(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """An experience, role or education's structured dates, parsed from its caption if the cleaner didn't add them."""
+    return item.get('dates') or parse_date_caption(item.get('caption'))
+
+
+def get_roles(profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Every role in a cleaned profile as {title, company, caption, dates}, most recent first.
+    Roles grouped under one company (LinkedIn breakdowns) count individually.
+    """
+    roles = []
+    for experience in profile.get('experiences', []):
+        if experience.get('roles'):
+            for role in experience['roles']:
+                roles.append({
+                    'title': role.get('title', ''),
+                    'company': experience.get('title', ''),
+                    'caption': role.get('caption', ''),
+                    'dates': get_dates(role)
+                })
+        else:
+            roles.append({
+                'title': experience.get('title', ''),
+                'company': (experience.get('subtitle') or '').split(' · ')[0],
+                'caption': experience.get('caption', ''),
+                'dates': get_dates(experience)
+            })
+    return roles
+
+
+def classify_degree(subtitle: str) -> Optional[str]:
+    """'undergraduate', 'masters' or 'phd' from an education subtitle like 'BSc, Computer Science'."""
+    degree = (subtitle or '').split(',')[0]
+    if PHD_RE.search(degree):
+        return 'phd'
+    if MASTERS_RE.search(degree):
+        return 'masters'
+    if BACHELORS_RE.search(degree):
+        return 'undergraduate'
+    return None
+
+
+def get_graduations(profile: Dict[str, Any]) -> Dict[str, int]:
+    """Latest graduation year per degree level."""
+    graduations = {}
+    for education in profile.get('educations', []):
+        level = classify_degree(education.get('subtitle', ''))
+        end_year = (get_dates(education) or {}).get('end_year')
+        if level and end_year:
+            graduations[level] = max(graduations.get(level, 0), end_year)
+    return graduations
+
+
+def earliest_work_year(roles: List[Dict[str, Any]]) -> Optional[int]:
+    years = [role['dates']['start_year'] for role in roles if role.get('dates') and role['dates'].get('start_year')]
+    return min(years) if years else None
+
+
+def estimate_age(profile: Dict[str, Any], roles: List[Dict[str, Any]]) -> Optional[str]:
+    """Age methodology from the prompt: bachelor's graduation + 22, else master's + 24 / PhD + 28, else first job at 18."""
+    graduations = get_graduations(profile)
+    for level in ('undergraduate', 'masters', 'phd'):
+        if level in graduations:
+            return str(CURRENT_YEAR - graduations[level] + GRADUATION_AGE[level])
+    first_job = earliest_work_year(roles)
+    if first_job:
+        return str(CURRENT_YEAR - first_job + 18)
+    return None
+
+
+def years_out_of_education(profile: Dict[str, Any], roles: List[Dict[str, Any]]) -> Optional[int]:
+    """Years since the last degree was completed, or since the first job if there are no education dates."""
+    end_years = list(get_graduations(profile).values()) or [
+        (get_dates(education) or {}).get('end_year')
+        for education in profile.get('educations', [])
+        if (get_dates(education) or {}).get('end_year')
+    ]
+    if end_years:
+        return max(CURRENT_YEAR - max(end_years), 0)
+    first_job = earliest_work_year(roles)
+    return CURRENT_YEAR - first_job if first_job else None
+
+
+def compute_rule_traits(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The locally computed traits for one cleaned profile, shaped like the trait record:
+    {'estimated_age': ..., 'career_insights': {...}}. Values that can't be determined are None.
+    """
+    roles = get_roles(profile)
+    tenures = [role['dates']['duration_months'] for role in roles if role.get('dates') and role['dates'].get('duration_months')]
+    avg_tenure = round(sum(tenures) / len(tenures) / 12, 1) if tenures else None
+
+    return {
+        'estimated_age': estimate_age(profile, roles),
+        'career_insights': {
+            'total_experience_count': len(roles),
+            'avg_tenure_per_role': avg_tenure,
+            'job_hopper': avg_tenure < 2 if avg_tenure is not None else None,
+            'founder_experience_count': sum(1 for role in roles if FOUNDER_RE.search(role['title'] or '')),
+            'years_out_of_education': years_out_of_education(profile, roles)
+        }
+    }
+
+
+def merge_rule_traits(record: Dict[str, Any], rule_traits: Dict[str, Any]) -> Dict[str, Any]:
+    """Overwrite a trait record's computed fields with the rule values (None means unknown: '-1' / -1)."""
+    for section, names in RULE_FIELDS.items():
+        target = record if section is None else record.setdefault(section, {})
+        source = rule_traits if section is None else rule_traits.get(section, {})
+        for name in names:
+            value = source.get(name)
+            if value is None:
+                value = '-1' if name == 'estimated_age' else -1
+            target[name] = value
+    return record
+
+
+def has_free_text(profile: Dict[str, Any]) -> bool:
+    """True if the profile has an about section or any role description for the model to read."""
+    if (profile.get('about') or '').strip():
+        return True
+    for experience in profile.get('experiences', []):
+        if (experience.get('description') or '').strip():
+            return True
+        if any((role.get('description') or '').strip() for role in experience.get('roles', [])):
+            return True
+    return False
+
+
+def text_fields_kept(profiles: List[Dict[str, Any]]) -> bool:
+    """
+    True if any profile has free text. False means the cleaning schema dropped about and
+    descriptions (the 'lean' schema), so an empty profile says nothing about the person.
+    """
+    return any(has_free_text(profile) for profile in profiles)
+
+
+def _duration_text(caption: str) -> str:
+    """'2 yrs 5 mos' from a caption like 'Jun 2023 - Present · 2 yrs 5 mos'."""
+    return caption.split('·')[-1].strip() if '·' in (caption or '') else ''
+
+
+def build_rule_only_record(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    A trait record built without the LLM, for profiles with no free text: the computed
+    fields plus what the structured data states directly (education stages, career
+    summary, headline keywords). Everything that needs judgement is left out.
+    """
+    roles = get_roles(profile)
+
+    education_stages: Dict[str, Any] = {'undergraduate': None, 'masters': None, 'phd': None, 'other_education': []}
+    for education in profile.get('educations', []):
+        parts = [part.strip() for part in (education.get('subtitle') or '').split(',', 1)]
+        degree = parts[0] if parts else ''
+        field = parts[1] if len(parts) > 1 else ''
+        end_year = (get_dates(education) or {}).get('end_year')
+        description = ' - '.join(str(part) for part in (education.get('title'), degree, field, end_year) if part)
+        level = classify_degree(education.get('subtitle', ''))
+        if level and not education_stages[level]:
+            education_stages[level] = description
+        elif description:
+            education_stages['other_education'].append(description)
+
+    summary = []
+    for role in roles:
+        entry = f"{role['title']} at {role['company']}"
+        duration = _duration_text(role['caption'])
+        summary.append(f"{entry} for {duration}" if duration else entry)
+
+    headline = profile.get('headline') or ''
+    keywords = [part.strip() for part in re.split(r'[|,·]', headline) if part.strip()]
+
+    record = {
+        'full_name': profile.get('fullName', 'Unknown'),
+        'linkedin_url': profile.get('linkedinUrl', 'not found'),
+        'education_stages': education_stages,
+        'career_insights': {'career_summary': '; '.join(summary)},
+        'personal_brand': {'headline_keywords': keywords},
+        'confidence_score': 'Low'
+    }
+    return merge_rule_traits(record, compute_rule_traits(profile))
@@ -0,0 +1,175 @@
+'''
+JSON schema for extracted traits.
+
+build_traits_json_schema() walks the ExtractedTraits dataclass, skipping fields marked
+llm=False and any fields computed locally by the rule engine: plain and Optional string fields map to (nullable) strings, and each Dict
+section is expanded from TRAIT_SECTION_PROPERTIES, which mirrors the REQUIRED JSON FORMAT
+in the system prompt.
+The result is in OpenAI strict structured-output form (every property required, no extra
+properties), so it can be sent as response_format and the model can only return
+schema-conforming JSON.
+
+validate_against_schema() checks parsed responses locally against the same schema. It
+covers the subset of JSON Schema used here: type (incl. nullable type lists), properties,
+required, additionalProperties, items and enum.
+'''
+
+import dataclasses
+import typing
+from typing import Any, Dict, Iterable, List, Optional
+
+NULLABLE_STRING = {'type': ['string', 'null']}
+STRING_LIST = {'type': 'array', 'items': {'type': 'string'}}
+
+# Top-level fields a request for only some sections still answers
+SECTION_REQUEST_FIELDS = {'full_name', 'linkedin_url', 'confidence_score'}
+
+# Fields of each Dict section of ExtractedTraits, matching the system prompt's format
+TRAIT_SECTION_PROPERTIES: Dict[str, Dict[str, Dict[str, Any]]] = {
+    'education_stages': {
+        'undergraduate': NULLABLE_STRING,
+        'masters': NULLABLE_STRING,
+        'phd': NULLABLE_STRING,
+        'other_education': STRING_LIST
+    },
+    'career_insights': {
+        'avg_tenure_per_role': {'type': 'number'},
+        'job_hopper': {'type': 'boolean'},
+        'total_experience_count': {'type': 'integer'},
+        'has_leadership_experience': {'type': 'boolean'},
+        'has_previous_c_suite_experience': {'type': 'boolean'},
+        'founder_experience_count': {'type': 'integer'},
+        'industry_switches': {'type': 'integer'},
+        'years_out_of_education': {'type': 'number'},
+        'years_in_industry': {'type': 'number'},
+        'career_summary': {'type': 'string'}
+    },
+    'company_background': {
+        'notable_companies': STRING_LIST,
+        'startup_companies': STRING_LIST
+    },
+    'accelerator_and_programs': {
+        'accelerators': STRING_LIST,
+        'fellowship_programs': STRING_LIST,
+        'board_positions': STRING_LIST
+    },
+    'education_career_alignment': {
+        'studies_field': {'type': 'string'},
+        'current_field': {'type': 'string'},
+        'pivot_description': NULLABLE_STRING
+    },
+    'personal_brand': {
+        'headline_keywords': STRING_LIST
+    },
+    'research_and_academic': {
+        'academic_roles': STRING_LIST
+    },
+    'international_experience': {
+        'countries_worked': STRING_LIST
+    }
+}
+
+
+def object_schema(properties: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Strict object schema: every property required, nothing else allowed."""
+    return {
+        'type': 'object',
+        'properties': properties,
+        'required': list(properties),
+        'additionalProperties': False
+    }
+
+
+def _field_schema(field: dataclasses.Field, local_fields: Iterable[str]) -> Dict[str, Any]:
+    if field.name in TRAIT_SECTION_PROPERTIES:
+        return object_schema({
+            name: schema for name, schema in TRAIT_SECTION_PROPERTIES[field.name].items() if name not in local_fields
+        })
+    if type(None) in typing.get_args(field.type):
+        return NULLABLE_STRING
+    return {'type': 'string'}
+
+
+def build_traits_json_schema(
+    traits_cls, local_fields: Iterable[str] = (), sections: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """
+    Strict JSON schema for one trait record, generated from the ExtractedTraits dataclass.
+
+    Args:
+        traits_cls: The ExtractedTraits dataclass
+        local_fields: Field names (top level or inside a section) computed locally, left out of the schema
+        sections: Only these sections (plus the identifying fields and confidence_score), for
+            requests that ask for part of the record. None for the whole record.
+    """
+    local_fields = set(local_fields)
+    if sections is not None:
+        sections = set(sections) | SECTION_REQUEST_FIELDS
+    return object_schema({
+        field.name: _field_schema(field, local_fields)
+        for field in dataclasses.fields(traits_cls)
+        # Fields marked llm=False are filled in locally, not by the model
+        if field.metadata.get('llm', True) and field.name not in local_fields
+        and (sections is None or field.name in sections)
+    })
+
+
+def build_response_format(schema: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """response_format argument that constrains a chat completion to `schema`."""
+    return {
+        'type': 'json_schema',
+        'json_schema': {'name': name, 'strict': True, 'schema': schema}
+    }
+
+
+def _matches_type(value: Any, schema_type: str) -> bool:
+    if schema_type == 'null':
+        return value is None
+    if schema_type == 'boolean':
+        return isinstance(value, bool)
+    if schema_type == 'integer':
+        return isinstance(value, int) and not isinstance(value, bool)
+    if schema_type == 'number':
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if schema_type == 'string':
+        return isinstance(value, str)
+    if schema_type == 'array':
+        return isinstance(value, list)
+    if schema_type == 'object':
+        return isinstance(value, dict)
+    return False
+
+
+def validate_against_schema(value: Any, schema: Dict[str, Any], path: str = '$') -> List[str]:
+    """
+    Check `value` against `schema`.
+
+    Returns:
+        List of human-readable violations, empty if the value conforms
+    """
+    errors = []
+    schema_types = schema.get('type')
+    if schema_types is not None:
+        schema_types = schema_types if isinstance(schema_types, list) else [schema_types]
+        if not any(_matches_type(value, schema_type) for schema_type in schema_types):
+            return [f"{path}: expected {'/'.join(schema_types)}, got {type(value).__name__}"]
+
+    if 'enum' in schema and value not in schema['enum']:
+        errors.append(f"{path}: {value!r} is not one of {schema['enum']}")
+
+    if isinstance(value, dict):
+        properties = schema.get('properties', {})
+        for key in schema.get('required', []):
+            if key not in value:
+                errors.append(f"{path}: missing '{key}'")
+        for key, item in value.items():
+            if key in properties:
+                errors.extend(validate_against_schema(item, properties[key], f"{path}.{key}"))
+            elif schema.get('additionalProperties') is False:
+                errors.append(f"{path}: unexpected '{key}'")
+
+    if isinstance(value, list) and 'items' in schema:
+        for index, item in enumerate(value):
+            errors.extend(validate_against_schema(item, schema['items'], f"{path}[{index}]"))
+
+    return errors
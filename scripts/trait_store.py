@@ -0,0 +1,482 @@
+'''
+Columnar store of extracted traits for cohort analytics.
+
+The traits output is a nested JSON list, so answering "median estimated_age of S25 founders
+with a PhD" means walking every record in Python. TraitStore flattens the records once into
+typed NumPy columns, one per field (section fields as "section.field"):
+
+ - number: float64. Unknown values ("-1", -1, None) become NaN. Ranges like "25-30" become their midpoint.
+ - bool: int8, with 1 for true, 0 for false and -1 for unknown.
+ - category: dictionary-encoded strings, as int32 codes into a sorted array of distinct
+   values. Unknown values get code -1.
+ - list: string lists as CSR arrays. Per-row offsets index into one array of dictionary codes.
+
+plus a dictionary-encoded cohort column and the model tier each record came from. Stores are
+saved as one compressed .npz and filtered with boolean masks:
+
+    store = TraitStore.load('trait-store/traits.npz')
+    mask = store.eq('cohort', 'S25') & store.known('education_stages.phd')
+    store.median('estimated_age', mask)
+    store.value_counts('company_background.notable_companies', mask, top=10)
+
+Usage:
+    python trait_store.py export --input S25=final-trait-extractions/S25Top100_comprehensive_traits.json --output trait-store/traits.npz
+    python trait_store.py summary --store trait-store/traits.npz
+    python trait_store.py benchmark --count 100000
+'''
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import statistics
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from trait_schema import TRAIT_SECTION_PROPERTIES
+
+UNKNOWN_STRINGS = {'', '-1', 'none', 'null', 'n/a', 'unknown', 'not found'}
+NUMBER_RE = re.compile(r'(?<![\d.])-?\d+(?:\.\d+)?')
+
+
+def _column_kinds() -> Dict[str, str]:
+    kinds = {
+        'cohort': 'category', 'full_name': 'category', 'linkedin_url': 'category',
+        'estimated_age': 'number', 'confidence_score': 'category', 'model_tier': 'category'
+    }
+    for section, properties in TRAIT_SECTION_PROPERTIES.items():
+        for name, schema in properties.items():
+            types = schema['type'] if isinstance(schema['type'], list) else [schema['type']]
+            if 'array' in types:
+                kind = 'list'
+            elif 'boolean' in types:
+                kind = 'bool'
+            elif 'number' in types or 'integer' in types:
+                kind = 'number'
+            else:
+                kind = 'category'
+            kinds[f"{section}.{name}"] = kind
+    return kinds
+
+
+# Column name -> kind, in store order
+COLUMN_KINDS: Dict[str, str] = _column_kinds()
+
+
+def _is_unknown(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and value.strip().lower() in UNKNOWN_STRINGS)
+
+
+def to_number(value: Any) -> float:
+    """Numeric value of a trait, NaN if unknown. Strings use the mean of the numbers in them ("25-30" -> 27.5)."""
+    if isinstance(value, bool) or _is_unknown(value):
+        return math.nan
+    if isinstance(value, (int, float)):
+        return math.nan if value == -1 else float(value)
+    numbers = [float(number) for number in NUMBER_RE.findall(str(value))]
+    return sum(numbers) / len(numbers) if numbers and numbers != [-1.0] else math.nan
+
+
+def to_flag(value: Any) -> int:
+    """1 / 0 for true / false, -1 if unknown."""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str) and value.strip().lower() in ('true', 'yes'):
+        return 1
+    if isinstance(value, str) and value.strip().lower() in ('false', 'no'):
+        return 0
+    return -1
+
+
+def to_category(value: Any) -> Optional[str]:
+    return None if _is_unknown(value) else str(value).strip()
+
+
+def to_list(value: Any) -> List[str]:
+    """Known items of a list trait. Comma-separated strings are split."""
+    items = value if isinstance(value, list) else str(value).split(',') if isinstance(value, str) else []
+    return [str(item).strip() for item in items if not _is_unknown(item)]
+
+
+def get_field(record: Dict[str, Any], column: str) -> Any:
+    """Raw value of `column` in an output-file trait record."""
+    if column == 'model_tier':
+        return (record.get('extraction_metadata') or {}).get('model_tier')
+    if '.' in column:
+        section, name = column.split('.', 1)
+        return (record.get(section) or {}).get(name)
+    return record.get(column)
+
+
+def _encode(values: Sequence[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """(int32 codes, sorted categories) for strings, with code -1 for None."""
+    categories = sorted({value for value in values if value is not None})
+    lookup = {value: code for code, value in enumerate(categories)}
+    codes = np.fromiter((lookup[value] if value is not None else -1 for value in values), dtype=np.int32, count=len(values))
+    return codes, np.array(categories, dtype=str)
+
+
+class TraitStore:
+    """Typed columns for a set of trait records, with mask-based filters and aggregates."""
+
+    def __init__(self, columns: Dict[str, Dict[str, np.ndarray]], size: int):
+        """
+        Args:
+            columns: {column name: arrays} ('values'; 'codes' + 'categories'; or 'offsets' + 'codes' + 'categories')
+            size: Number of records
+        """
+        self.columns = columns
+        self.size = size
+        self._list_rows: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], cohort: Optional[str] = None) -> 'TraitStore':
+        """
+        Build a store from output-file trait records.
+
+        Args:
+            records: Trait records (dicts). A record's own 'cohort' key takes precedence over `cohort`.
+            cohort: Cohort to label the records with, e.g. 'S25'
+        """
+        raw: Dict[str, List[Any]] = {column: [] for column in COLUMN_KINDS}
+        size = 0
+        for record in records:
+            size += 1
+            for column, kind in COLUMN_KINDS.items():
+                value = record.get('cohort', cohort) if column == 'cohort' else get_field(record, column)
+                if kind == 'number':
+                    raw[column].append(to_number(value))
+                elif kind == 'bool':
+                    raw[column].append(to_flag(value))
+                elif kind == 'category':
+                    raw[column].append(to_category(value))
+                else:
+                    raw[column].append(to_list(value))
+
+        columns = {}
+        for column, kind in COLUMN_KINDS.items():
+            values = raw[column]
+            if kind == 'number':
+                columns[column] = {'values': np.array(values, dtype=np.float64)}
+            elif kind == 'bool':
+                columns[column] = {'values': np.array(values, dtype=np.int8)}
+            elif kind == 'category':
+                codes, categories = _encode(values)
+                columns[column] = {'codes': codes, 'categories': categories}
+            else:
+                lengths = np.fromiter((len(items) for items in values), dtype=np.int64, count=len(values))
+                codes, categories = _encode([item for items in values for item in items])
+                offsets = np.zeros(len(values) + 1, dtype=np.int64)
+                np.cumsum(lengths, out=offsets[1:])
+                columns[column] = {'offsets': offsets, 'codes': codes, 'categories': categories}
+        return cls(columns, size)
+
+    @classmethod
+    def from_files(cls, inputs: Dict[str, str]) -> 'TraitStore':
+        """Build a store from several results files, {cohort: traits JSON path}."""
+        def records():
+            for cohort, path in inputs.items():
+                with open(path, 'r', encoding='utf-8') as f:
+                    for record in json.load(f):
+                        yield {**record, 'cohort': cohort}
+        return cls.from_records(records())
+
+    def save(self, path: str):
+        """Save every column to one compressed .npz file."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        arrays = {f"{column}#{part}": array for column, parts in self.columns.items() for part, array in parts.items()}
+        np.savez_compressed(path, __size__=np.array([self.size]), **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> 'TraitStore':
+        with np.load(path, allow_pickle=False) as data:
+            columns: Dict[str, Dict[str, np.ndarray]] = {}
+            for key in data.files:
+                if key == '__size__':
+                    continue
+                column, part = key.rsplit('#', 1)
+                columns.setdefault(column, {})[part] = data[key]
+            return cls(columns, int(data['__size__'][0]))
+
+    def kind(self, column: str) -> str:
+        if column not in self.columns:
+            raise KeyError(f"Unknown column {column!r}")
+        return COLUMN_KINDS.get(column, 'category')
+
+    def _code(self, column: str, value: str) -> int:
+        categories = self.columns[column]['categories']
+        index = int(np.searchsorted(categories, value))
+        return index if index < len(categories) and categories[index] == value else -2
+
+    def _rows(self, column: str) -> np.ndarray:
+        """Row index of every item of a list column, computed once per column."""
+        if column not in self._list_rows:
+            lengths = np.diff(self.columns[column]['offsets'])
+            self._list_rows[column] = np.repeat(np.arange(self.size), lengths)
+        return self._list_rows[column]
+
+    def values(self, column: str) -> np.ndarray:
+        """A column's values: floats, -1/0/1 flags, or decoded strings (None for unknown)."""
+        kind = self.kind(column)
+        parts = self.columns[column]
+        if kind in ('number', 'bool'):
+            return parts['values']
+        if kind == 'category':
+            decoded = np.append(parts['categories'].astype(object), None)
+            return decoded[parts['codes']]
+        items = parts['categories'].astype(object)[parts['codes']]
+        offsets = parts['offsets']
+        return np.array([list(items[offsets[i]:offsets[i + 1]]) for i in range(self.size)], dtype=object)
+
+    # Filters: each returns a boolean mask over the records
+
+    def eq(self, column: str, value: Any) -> np.ndarray:
+        kind = self.kind(column)
+        if kind == 'number':
+            return self.columns[column]['values'] == float(value)
+        if kind == 'bool':
+            return self.columns[column]['values'] == to_flag(value)
+        if kind == 'list':
+            return self.contains(column, value)
+        return self.columns[column]['codes'] == self._code(column, str(value))
+
+    def isin(self, column: str, values: Iterable[Any]) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        for value in values:
+            mask |= self.eq(column, value)
+        return mask
+
+    def known(self, column: str) -> np.ndarray:
+        """Records where `column` has a value (non-empty for lists)."""
+        kind = self.kind(column)
+        parts = self.columns[column]
+        if kind == 'number':
+            return ~np.isnan(parts['values'])
+        if kind == 'bool':
+            return parts['values'] != -1
+        if kind == 'category':
+            return parts['codes'] >= 0
+        return np.diff(parts['offsets']) > 0
+
+    def between(self, column: str, low: float, high: float) -> np.ndarray:
+        """Records whose numeric `column` is within [low, high]."""
+        values = self.columns[column]['values']
+        return (values >= low) & (values <= high)
+
+    def contains(self, column: str, value: str) -> np.ndarray:
+        """Records whose list `column` includes `value`."""
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self._rows(column)[self.columns[column]['codes'] == self._code(column, value)]] = True
+        return mask
+
+    def where(self, **conditions: Any) -> np.ndarray:
+        """
+        AND of simple conditions, with column dots written as double underscores:
+        value -> eq, list/set -> isin, (low, high) tuple -> between, True/False for bool columns.
+
+        e.g. store.where(cohort='S25', career_insights__job_hopper=True, estimated_age=(25, 35))
+        """
+        mask = np.ones(self.size, dtype=bool)
+        for name, condition in conditions.items():
+            column = name.replace('__', '.')
+            if isinstance(condition, tuple):
+                mask &= self.between(column, *condition)
+            elif isinstance(condition, (list, set)):
+                mask &= self.isin(column, condition)
+            else:
+                mask &= self.eq(column, condition)
+        return mask
+
+    # Aggregates over the records selected by `mask` (all records if None)
+
+    def count(self, mask: Optional[np.ndarray] = None) -> int:
+        return self.size if mask is None else int(np.count_nonzero(mask))
+
+    def _numbers(self, column: str, mask: Optional[np.ndarray]) -> np.ndarray:
+        values = self.columns[column]['values'].astype(np.float64)
+        if self.kind(column) == 'bool':
+            values[values == -1] = np.nan
+        values = values if mask is None else values[mask]
+        return values[~np.isnan(values)]
+
+    def mean(self, column: str, mask: Optional[np.ndarray] = None) -> Optional[float]:
+        """Mean of the known values (for bool columns: share true). None if there are none."""
+        values = self._numbers(column, mask)
+        return float(values.mean()) if len(values) else None
+
+    def median(self, column: str, mask: Optional[np.ndarray] = None) -> Optional[float]:
+        values = self._numbers(column, mask)
+        return float(np.median(values)) if len(values) else None
+
+    def value_counts(self, column: str, mask: Optional[np.ndarray] = None, top: int = 10) -> List[Tuple[str, int]]:
+        """Most common values of a category or list column, as (value, count) pairs."""
+        parts = self.columns[column]
+        if self.kind(column) == 'list':
+            codes = parts['codes'] if mask is None else parts['codes'][mask[self._rows(column)]]
+        else:
+            codes = parts['codes'] if mask is None else parts['codes'][mask]
+            codes = codes[codes >= 0]
+        counts = np.bincount(codes, minlength=len(parts['categories']))
+        order = np.argsort(-counts, kind='stable')[:top]
+        return [(str(parts['categories'][code]), int(counts[code])) for code in order if counts[code]]
+
+    def group_by(self, column: str, value_column: str, how: str = 'median', mask: Optional[np.ndarray] = None) -> Dict[str, Optional[float]]:
+        """{category: mean/median/count of value_column} for each value of a category column."""
+        result = {}
+        for code, name in enumerate(self.columns[column]['categories']):
+            group = self.columns[column]['codes'] == code
+            group = group if mask is None else group & mask
+            result[str(name)] = self.count(group) if how == 'count' else getattr(self, how)(value_column, group)
+        return result
+
+
+def synthetic_records(count: int, seed: int = 42) -> Iterable[Dict[str, Any]]:
+    """Random but plausible trait records, for benchmarking the store without an extraction run."""
+    rng = random.Random(seed)
+    cohorts = ['S24', 'W25', 'S25', 'F25']
+    schools = ['Stanford', 'MIT', 'Oxford', 'ETH Zurich', 'IIT Bombay', 'TU Munich', 'Imperial College London']
+    companies = ['Google', 'Meta', 'Stripe', 'McKinsey', 'Revolut', 'OpenAI', 'Amazon', 'Uber', 'N26']
+    accelerators = ['Y Combinator', 'Techstars', 'Antler', 'Entrepreneur First']
+    countries = ['United States', 'United Kingdom', 'Germany', 'India', 'France', 'Singapore']
+    fields = ['Computer Science', 'Economics', 'Physics', 'Mechanical Engineering', 'Biology']
+
+    def maybe(pool, chance):
+        return rng.choice(pool) if rng.random() < chance else None
+
+    for index in range(count):
+        tenure = round(rng.uniform(0.5, 6), 1)
+        yield {
+            'cohort': rng.choice(cohorts),
+            'full_name': f"Founder {index}",
+            'linkedin_url': f"https://www.linkedin.com/in/founder-{index}",
+            'estimated_age': str(rng.randint(21, 55)) if rng.random() < 0.9 else '-1',
+            'confidence_score': rng.choice(['High', 'Medium', 'Low']),
+            'education_stages': {
+                'undergraduate': maybe(schools, 0.9), 'masters': maybe(schools, 0.4), 'phd': maybe(schools, 0.12),
+                'other_education': []
+            },
+            'career_insights': {
+                'avg_tenure_per_role': tenure, 'job_hopper': tenure < 2, 'total_experience_count': rng.randint(1, 12),
+                'has_leadership_experience': rng.random() < 0.6, 'has_previous_c_suite_experience': rng.random() < 0.3,
+                'founder_experience_count': rng.randint(0, 3), 'industry_switches': rng.randint(0, 4),
+                'years_out_of_education': rng.randint(0, 30), 'years_in_industry': rng.randint(0, 25),
+                'career_summary': '-1'
+            },
+            'company_background': {'notable_companies': rng.sample(companies, rng.randint(0, 3)), 'startup_companies': []},
+            'accelerator_and_programs': {
+                'accelerators': rng.sample(accelerators, rng.randint(0, 1)), 'fellowship_programs': [], 'board_positions': []
+            },
+            'education_career_alignment': {'studies_field': rng.choice(fields), 'current_field': rng.choice(fields), 'pivot_description': None},
+            'personal_brand': {'headline_keywords': []},
+            'research_and_academic': {'academic_roles': []},
+            'international_experience': {'countries_worked': rng.sample(countries, rng.randint(1, 3))},
+            'extraction_metadata': {'model_tier': 'primary'}
+        }
+
+
+def time_median_ms(function, repeat: int) -> Tuple[Any, float]:
+    """Call `function` once to warm up, then `repeat` times; its result and the median call time in ms."""
+    result = function()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return result, statistics.median(timings) * 1000
+
+
+def run_benchmark(count: int, seed: int, repeat: int = 5) -> Dict[str, Any]:
+    """Time building the store and a few cohort queries, against walking the records in Python.
+
+    Each query is warmed up once and reported as the median of `repeat` timed runs.
+    """
+    records = list(synthetic_records(count, seed))
+
+    start = time.perf_counter()
+    store = TraitStore.from_records(records)
+    build_seconds = time.perf_counter() - start
+
+    median_age, median_ms = time_median_ms(
+        lambda: store.median('estimated_age', store.eq('cohort', 'S25') & store.known('education_stages.phd')),
+        repeat
+    )
+    (top_companies, job_hopper_share), query_ms = time_median_ms(
+        lambda: (
+            store.value_counts('company_background.notable_companies', store.eq('cohort', 'S25'), top=5),
+            store.mean('career_insights.job_hopper', store.contains('accelerator_and_programs.accelerators', 'Y Combinator'))
+        ),
+        repeat
+    )
+
+    def python_walk_median() -> Optional[float]:
+        ages = sorted(
+            to_number(record['estimated_age']) for record in records
+            if record['cohort'] == 'S25' and not _is_unknown(record['education_stages'].get('phd'))
+            and not math.isnan(to_number(record['estimated_age']))
+        )
+        return (ages[(len(ages) - 1) // 2] + ages[len(ages) // 2]) / 2 if ages else None
+
+    python_median, python_ms = time_median_ms(python_walk_median, repeat)
+
+    return {
+        'records': count,
+        'repeat': repeat,
+        'build_seconds': round(build_seconds, 3),
+        'median_query_ms': round(median_ms, 2),
+        'python_walk_median_ms': round(python_ms, 2),
+        'other_queries_ms': round(query_ms, 2),
+        'median_age_s25_phd': median_age,
+        'python_median_matches': median_age == python_median,
+        'top_s25_companies': top_companies,
+        'yc_job_hopper_share': round(job_hopper_share, 3) if job_hopper_share is not None else None
+    }
+
+
+def print_summary(store: TraitStore):
+    print(f"\n=== TRAIT STORE: {len(store)} records ===")
+    for cohort, count in store.value_counts('cohort', top=50):
+        mask = store.eq('cohort', cohort)
+        median_age = store.median('estimated_age', mask)
+        print(f"{cohort}: {count} founders, median age {median_age}, "
+              f"PhDs {store.count(mask & store.known('education_stages.phd'))}, "
+              f"top companies {store.value_counts('company_background.notable_companies', mask, top=3)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Columnar trait store for cohort analytics')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    export = subparsers.add_parser('export', help='Materialize results files into a store')
+    export.add_argument('--input', action='append', required=True, metavar='COHORT=PATH',
+                        help='Traits JSON for one cohort; repeat for several cohorts')
+    export.add_argument('--output', default='trait-store/traits.npz')
+    summary = subparsers.add_parser('summary', help='Per-cohort overview of a store')
+    summary.add_argument('--store', default='trait-store/traits.npz')
+    benchmark = subparsers.add_parser('benchmark', help='Build a synthetic store and time cohort queries')
+    benchmark.add_argument('--count', type=int, default=100000)
+    benchmark.add_argument('--seed', type=int, default=42)
+    benchmark.add_argument('--repeat', type=int, default=5, help='Timed runs per query, after one warm-up run')
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        inputs = dict(item.split('=', 1) for item in args.input)
+        store = TraitStore.from_files(inputs)
+        store.save(args.output)
+        print(f"Saved {len(store)} records from {len(inputs)} cohorts to {args.output}")
+        print_summary(store)
+    elif args.command == 'summary':
+        print_summary(TraitStore.load(args.store))
+    else:
+        results = run_benchmark(args.count, args.seed, args.repeat)
+        print("\n=== TRAIT STORE BENCHMARK ===")
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import pytest
+
+pytest.importorskip('pyairtable')
+
+from airtable_updater import AirtableTraitUpdater
+
+
+class FakeTable:
+    """Records batch updates in memory instead of sending them to Airtable."""
+
+    def __init__(self):
+        self.fields = {}
+        self.batches = []
+
+    def batch_update(self, records):
+        self.batches.append([record['id'] for record in records])
+        for record in records:
+            self.fields.setdefault(record['id'], {}).update(record['fields'])
+
+    def all(self, formula=None, fields=None):
+        return [{'id': record_id, 'fields': dict(values)} for record_id, values in self.fields.items()]
+
+
+def trait_record(url, summary):
+    return {'linkedin_url': url, 'full_name': url.rsplit('/', 1)[-1], 'career_insights': {'career_summary': summary}}
+
+
+@pytest.fixture
+def updater(monkeypatch):
+    monkeypatch.setenv('AIRTABLE_API_KEY', 'test')
+    updater = AirtableTraitUpdater(base_id='appTest', table_id='tblTest')
+    updater.table = FakeTable()
+    updater.url_mapping = {f"https://linkedin.com/in/person{i}": f"rec{i}" for i in range(3)}
+    return updater
+
+
+def test_success_rate_and_throughput_count_only_records_sent(updater, tmp_path):
+    updater.trait_data = [trait_record(url, 'Founder') for url in updater.url_mapping]
+    checkpoint_file = str(tmp_path / 'traits_progress.json')
+    updater.process_trait_extractions(diff_updates=False, checkpoint_file=checkpoint_file)
+    assert updater.update_results['attempted'] == 3
+    assert updater.update_results['records_per_second'] > 0
+
+    # A rerun finds everything in the checkpoint and writes nothing
+    updater.update_results.update({'attempted': 0, 'successful_updates': 0, 'records_per_second': 0.0})
+    updater.process_trait_extractions(diff_updates=False, checkpoint_file=checkpoint_file)
+    assert updater.update_results['attempted'] == 0
+    assert updater.update_results['already_written'] == 3
+    assert updater.update_results['records_per_second'] == 0.0
+
+
+def test_trait_records_for_the_same_airtable_record_are_merged(updater):
+    url = "https://linkedin.com/in/person0"
+    updater.url_mapping["https://linkedin.com/in/person0-old"] = 'rec0'
+    updater.trait_data = [trait_record(url + '-old', 'Old summary'), trait_record(url, 'New summary')]
+    updater.process_trait_extractions(diff_updates=False, batch_size=1, max_workers=2)
+
+    assert updater.table.batches == [['rec0']]
+    assert updater.table.fields['rec0']['AI_Career_Summary'] == 'New summary'
@@ -0,0 +1,38 @@
+import copy
+
+import pytest
+
+from data_cleaner import CLEANING_SCHEMAS, LinkedInDataProcessor
+from profile_generator import generate_profiles
+
+
+@pytest.mark.parametrize('seed', [7, 42])
+def test_compiled_schema_matches_the_handwritten_walk(seed):
+    profiles = generate_profiles(300, seed)
+    compiled, handwritten = LinkedInDataProcessor(), LinkedInDataProcessor()
+
+    for profile in profiles:
+        expected = handwritten.process_single_profile_handwritten(copy.deepcopy(profile))
+        assert compiled.process_single_profile(copy.deepcopy(profile)) == expected
+
+    # Both paths parse the same captions, so the parse-rate reports agree too
+    assert compiled.get_caption_parse_report() == handwritten.get_caption_parse_report()
+
+
+@pytest.mark.parametrize('schema', sorted(CLEANING_SCHEMAS))
+def test_every_schema_compiles_and_leaves_the_input_untouched(schema):
+    profiles = generate_profiles(50, 7)
+    originals = copy.deepcopy(profiles)
+
+    cleaned = LinkedInDataProcessor(schema=schema).process_profiles(profiles)
+
+    assert len(cleaned) == 50
+    assert all(profile.get('linkedinUrl') for profile in cleaned)
+    assert profiles == originals
+
+
+def test_unknown_transforms_are_rejected():
+    schema = copy.deepcopy(CLEANING_SCHEMAS['standard'])
+    schema['profile'].append(('about', 'shout'))
+    with pytest.raises(ValueError, match="Unknown transform 'shout'"):
+        LinkedInDataProcessor(schema=schema)
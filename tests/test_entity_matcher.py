@@ -0,0 +1,32 @@
+from data_cleaner import LinkedInDataProcessor
+from entity_benchmark import RegexEntityMatcher
+from entity_matcher import EntityMatcher
+from profile_generator import generate_profiles
+
+
+def accelerators(matcher, text, company_scope=False):
+    return [name for name, kind in matcher.find(text, company_scope) if kind == 'accelerators']
+
+
+def test_accelerator_aliases_and_look_alikes():
+    matcher = EntityMatcher()
+    assert accelerators(matcher, 'Backed by Y Combinator (W24).') == ['Y Combinator']
+    assert accelerators(matcher, 'YC S23 alum.') == ['Y Combinator']
+    assert accelerators(matcher, 'Alumni of yc and techstars.') == ['Techstars']
+    assert accelerators(matcher, 'Met my co-founder at EF.') == ['Entrepreneur First']
+    assert accelerators(matcher, 'Joined an antler-led hackathon.') == []
+    assert accelerators(matcher, 'Antler', company_scope=True) == ['Antler']
+
+
+def test_automaton_agrees_with_regex_baseline_per_kind():
+    processor = LinkedInDataProcessor()
+    profiles = [processor.process_single_profile(profile) for profile in generate_profiles(300, 3)]
+    matcher, baseline = EntityMatcher(), RegexEntityMatcher()
+    tagged = {'notable_companies': 0, 'accelerators': 0}
+    for profile in profiles:
+        expected, found = baseline.tag_profile(profile), matcher.tag_profile(profile)
+        for kind in tagged:
+            assert sorted(found[kind]) == sorted(expected[kind]), (kind, profile['linkedinUrl'])
+            tagged[kind] += bool(found[kind])
+    # The corpus has to exercise both kinds for the agreement to mean anything
+    assert tagged['notable_companies'] > 0 and tagged['accelerators'] > 0
@@ -0,0 +1,13 @@
+from extraction_telemetry import ExtractionTelemetry
+
+
+def test_summary_survives_a_reload_from_the_jsonl_file(tmp_path):
+    path = str(tmp_path / 'telemetry' / 'job.jsonl')
+    telemetry = ExtractionTelemetry(path)
+    telemetry.record_call('gpt-4o-mini', 0.4, 1200, 300, cached_tokens=200, tier='primary')
+    telemetry.record_call('gpt-4o-mini', 0.0, 1200, 300, tier='primary', batch=True)
+    telemetry.record_profile('https://linkedin.com/in/person0')
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"event": "call", "mod')
+
+    assert ExtractionTelemetry.load(path).get_summary() == telemetry.get_summary()
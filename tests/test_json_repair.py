@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+from json_repair import REPAIR_CORPUS, JSONRepairError, repair_json
+
+
+@pytest.mark.parametrize('text, expected', [case[1:] for case in REPAIR_CORPUS], ids=[case[0] for case in REPAIR_CORPUS])
+def test_repair_corpus(text, expected):
+    if expected is None:
+        with pytest.raises(JSONRepairError):
+            repair_json(text)
+    else:
+        value, _ = repair_json(text)
+        assert value == expected
+
+
+def test_valid_json_needs_no_repairs():
+    assert repair_json('{"a": 1}') == ({'a': 1}, [])
+
+
+def test_truncation_is_recorded():
+    _, repairs = repair_json('{"a": [1, 2')
+    assert 'closed_truncated' in repairs
+
+
+def test_repair_error_is_a_decode_error():
+    assert issubclass(JSONRepairError, json.JSONDecodeError)
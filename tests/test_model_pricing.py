@@ -0,0 +1,17 @@
+from extraction_telemetry import ExtractionTelemetry
+from model_pricing import estimate_cost, unpriced_models
+
+
+def test_dated_snapshots_use_their_base_model_price():
+    assert estimate_cost('gpt-4o-mini-2024-07-18', 1_000_000, 0) == estimate_cost('gpt-4o-mini', 1_000_000, 0)
+    assert unpriced_models(['gpt-4o-2024-08-06', 'gpt-4o-mini']) == []
+
+
+def test_unknown_models_are_reported_as_unpriced():
+    telemetry = ExtractionTelemetry()
+    telemetry.record_call('gpt-4o-mini', 0.1, 1000, 100)
+    telemetry.record_call('local-llama', 0.1, 1000, 100)
+
+    summary = telemetry.get_summary()
+    assert summary['unpriced_models'] == ['local-llama']
+    assert summary['estimated_cost_usd'] == round(estimate_cost('gpt-4o-mini', 1000, 100), 4)
@@ -0,0 +1,38 @@
+import copy
+
+from profile_dedup import find_duplicate_clusters
+
+BLURB = (
+    "Acme Robotics builds autonomous warehouse robots that pick, pack and sort parcels for "
+    "mid-sized retailers, cutting fulfilment costs in half while working alongside existing staff. "
+    "Our fleet learns new item shapes in minutes, plugs into any warehouse management system and is "
+    "leased per robot per month, so customers start small and scale with seasonal demand. We are "
+    "backed by leading logistics investors and already run in forty sites across Europe and the US, "
+    "handling millions of orders every year for fashion, grocery and electronics brands."
+)
+
+
+def make_founder(name, school, url):
+    return {
+        'fullName': name,
+        'linkedinUrl': url,
+        'headline': 'Co-founder at Acme Robotics',
+        'about': BLURB,
+        'experiences': [{'title': 'Co-founder', 'subtitle': 'Acme Robotics', 'description': BLURB}],
+        'educations': [{'title': school, 'subtitle': 'BSc Computer Science'}],
+    }
+
+
+def test_cofounders_sharing_a_blurb_stay_apart():
+    profiles = [
+        make_founder('Alice Zhang', 'Stanford University', 'https://www.linkedin.com/in/alice'),
+        make_founder('Bob Smith', 'MIT', 'https://www.linkedin.com/in/bob'),
+    ]
+    assert find_duplicate_clusters(profiles) == []
+
+
+def test_same_person_under_two_urls_is_clustered():
+    alice = make_founder('Alice Zhang', 'Stanford University', 'https://www.linkedin.com/in/alice')
+    alias = copy.deepcopy(alice)
+    alias['linkedinUrl'] = 'https://www.linkedin.com/in/alice-zhang-2'
+    assert find_duplicate_clusters([alice, alias]) == [[0, 1]]
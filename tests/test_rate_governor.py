@@ -0,0 +1,46 @@
+import time
+
+from rate_governor import AirtableRateGovernor, TokenBucket, get_shared_governor
+
+
+def test_callers_queued_behind_a_pause_are_spaced_from_its_end():
+    bucket = TokenBucket(1, period=0.1)
+    bucket.pause(0.3)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits[0] >= 0.3
+    gaps = [later - earlier for earlier, later in zip(waits, waits[1:])]
+    assert all(abs(gap - 0.1) < 0.01 for gap in gaps)
+
+
+def test_rate_limited_airtable_governor_resumes_at_the_halved_rate():
+    governor = AirtableRateGovernor(requests_per_second=5.0)
+    governor.record_rate_limited('2')
+    start = time.monotonic()
+    waits = [governor.requests.reserve() for _ in range(6)]
+    elapsed = time.monotonic() - start
+    assert governor.requests.rate == 2.25
+    assert min(waits) >= 2.0 - elapsed
+    gaps = [later - earlier for earlier, later in zip(waits, waits[1:])]
+    assert all(abs(gap - 1 / 2.25) < 0.01 for gap in gaps)
+
+
+def test_mock_servers_do_not_share_the_openai_governor():
+    openai_governor = get_shared_governor()
+    mock_governor = get_shared_governor('http://127.0.0.1:8765/v1')
+    assert mock_governor is not openai_governor
+    assert get_shared_governor('http://127.0.0.1:8765/v1') is mock_governor
+
+    mock_governor.update_from_headers({'x-ratelimit-limit-requests': '10000'})
+    mock_governor.record_rate_limited({'retry-after': '5'})
+    assert openai_governor.get_stats()['rate_limited'] == 0
+    assert openai_governor.requests.capacity != mock_governor.requests.capacity
+
+
+def test_each_model_has_its_own_governor():
+    mini = get_shared_governor(model='gpt-4o-mini')
+    escalation = get_shared_governor(model='gpt-4o')
+    assert mini is not escalation
+
+    escalation.update_from_headers({'x-ratelimit-limit-tokens': '30000'})
+    mini.update_from_headers({'x-ratelimit-limit-tokens': '2000000'})
+    assert escalation.tokens.capacity < mini.tokens.capacity
@@ -0,0 +1,132 @@
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('openai')
+
+from batch_backend import LocalBatchBackend
+from data_cleaner import LinkedInDataProcessor
+from model_pricing import estimate_cost
+from mock_openai_server import MockOpenAIServer, profile_responder
+from profile_generator import generate_profiles
+from response_cache import ResponseCache
+from trait_extractor import LinkedInTraitExtractor
+
+
+@pytest.fixture
+def server():
+    with MockOpenAIServer(latency_mean=0.0, seed=1) as mock:
+        yield mock
+
+
+def make_extractor(server, **kwargs):
+    settings = {'use_response_cache': False, 'use_response_archive': False, **kwargs}
+    return LinkedInTraitExtractor(api_key='test', base_url=server.base_url, **settings)
+
+
+def test_lean_profiles_go_to_the_model(server, tmp_path):
+    profiles = [LinkedInDataProcessor(schema='lean').process_single_profile(p) for p in generate_profiles(3, 7)]
+    extractor = make_extractor(server)
+
+    results = extractor.extract_traits_from_profiles(profiles, output_file=str(tmp_path / 'traits.json'))
+
+    assert len(results) == 3
+    assert extractor.response_stats['rule_only'] == 0
+    assert server.get_stats()['completions'] == 3
+    assert all(traits.extraction_metadata.get('source') != 'rules' for traits in results)
+
+
+def test_profiles_without_text_skip_the_model_when_others_have_text(server, tmp_path):
+    profiles = [LinkedInDataProcessor().process_single_profile(p) for p in generate_profiles(3, 7)]
+    empty = json.loads(json.dumps(profiles[0]))
+    empty['linkedinUrl'] += '-empty'
+    empty.pop('about', None)
+    for experience in empty['experiences']:
+        experience.pop('description', None)
+        for role in experience.get('roles', []):
+            role.pop('description', None)
+    extractor = make_extractor(server)
+
+    results = extractor.extract_traits_from_profiles(profiles + [empty], output_file=str(tmp_path / 'traits.json'))
+
+    assert len(results) == 4
+    assert extractor.response_stats['rule_only'] == 1
+    assert server.get_stats()['completions'] == 3
+
+
+def test_truncated_responses_are_retried_and_not_cached(tmp_path):
+    profiles = [LinkedInDataProcessor().process_single_profile(p) for p in generate_profiles(1, 7)]
+    calls = []
+
+    def responder(body):
+        calls.append(body)
+        content = profile_responder(body)
+        # The first answer is cut off halfway, so repair has to close it
+        return content[:len(content) // 2] if len(calls) == 1 else content
+
+    cache = ResponseCache(str(tmp_path / 'cache'))
+    with MockOpenAIServer(latency_mean=0.0, responder=responder, seed=1) as server:
+        extractor = make_extractor(server, response_cache=cache, use_response_cache=True)
+        traits = extractor.extract_traits_from_profile(profiles[0])
+
+    assert len(calls) == 2
+    assert extractor.response_stats['retries'] == 1
+    assert 'closed_truncated' not in traits.extraction_metadata.get('json_repairs', [])
+    assert cache.stats['writes'] == 1
+
+
+def test_max_concurrency_limits_requests_not_profiles(tmp_path):
+    profiles = [LinkedInDataProcessor().process_single_profile(p) for p in generate_profiles(3, 7)]
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def responder(body):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        return profile_responder(body)
+
+    with MockOpenAIServer(latency_mean=0.0, responder=responder, seed=1) as server:
+        extractor = make_extractor(server, split_sections=True)
+        results = extractor.extract_traits_from_profiles_concurrent(
+            profiles, max_concurrency=2, output_file=str(tmp_path / 'traits.json')
+        )
+
+    assert len(results) == 3
+    assert server.get_stats()['completions'] == 3 * len(extractor.SPLIT_SECTION_GROUPS)
+    assert in_flight[1] <= 2
+
+
+def test_section_requests_cut_off_at_max_tokens_are_not_retried(tmp_path):
+    profiles = [LinkedInDataProcessor().process_single_profile(p) for p in generate_profiles(1, 7)]
+    with MockOpenAIServer(latency_mean=0.0, seed=1) as server:
+        # Every answer is cut off with finish_reason 'length', which a retry would repeat
+        server.draw_outcome = lambda: 'malformed:truncated'
+        extractor = make_extractor(server, split_sections=True)
+        extractor.extract_traits_from_profile(profiles[0])
+
+    assert server.get_stats()['requests'] == len(extractor.SPLIT_SECTION_GROUPS)
+    assert extractor.response_stats['retries'] == 0
+
+
+def test_batch_results_are_costed_at_the_batch_discount(server, tmp_path):
+    profiles = [LinkedInDataProcessor().process_single_profile(p) for p in generate_profiles(3, 7)]
+    extractor = make_extractor(server)
+    backend = LocalBatchBackend(batch_dir=str(tmp_path / 'batches'), responder=profile_responder)
+
+    results = extractor.extract_traits_from_profiles_batch(
+        profiles, output_file=str(tmp_path / 'traits.json'), batch_backend=backend, poll_interval=0
+    )
+
+    primary = extractor.get_tier_report()['primary']
+    full_price = estimate_cost(primary['model'], primary['prompt_tokens'], primary['completion_tokens'])
+    assert len(results) == 3
+    assert primary['batch_requests'] == 3
+    assert primary['estimated_cost_usd'] > 0
+    assert primary['estimated_cost_usd'] == pytest.approx(full_price / 2, abs=1e-4)
+    assert extractor.telemetry.get_summary()['estimated_cost_usd'] == pytest.approx(full_price / 2, abs=1e-4)
@@ -0,0 +1,20 @@
+from trait_rules import compute_rule_traits
+
+# Cleaned the way the data cleaner did before it added structured 'dates'
+PROFILE_WITHOUT_DATES = {
+    'fullName': 'Dana Lee',
+    'experiences': [
+        {'title': 'Co-founder', 'subtitle': 'Acme · Full-time', 'caption': 'Jan 2021 - Present · 4 yrs 6 mos'},
+        {'title': 'Engineer', 'subtitle': 'Globex · Full-time', 'caption': 'Jul 2017 - Dec 2020 · 3 yrs 6 mos'},
+    ],
+    'educations': [{'title': 'MIT', 'subtitle': 'BSc, Computer Science', 'caption': '2013 - 2017'}],
+}
+
+
+def test_rule_traits_fall_back_to_captions_without_dates():
+    traits = compute_rule_traits(PROFILE_WITHOUT_DATES)
+    assert traits['estimated_age'] == '30'
+    assert traits['career_insights']['avg_tenure_per_role'] == 4.0
+    assert traits['career_insights']['job_hopper'] is False
+    assert traits['career_insights']['years_out_of_education'] == 8
+    assert traits['career_insights']['founder_experience_count'] == 1